@@ -4,9 +4,42 @@
 # Description: Library simulator with check out, return, and request capabilities that can
 #               charge members fees for overdue items
 
+from array import array
+from bisect import bisect_left
+from heapq import heappush, heappop
+
+# fields the library indexes for search, and the item method that reads each one
+# [items without the method, such as an Album for 'author', are left out of that index]
+SEARCH_FIELDS = {"title": "get_title", "author": "get_author", "artist": "get_artist", "director": "get_director"}
+
+# fine charged for each day an item is overdue
+DAILY_FINE = .10
+
+# places an item can be. set_location swaps any equal string for one of these, so every item shares the same
+# three string objects however its location was built [ItemStore keeps the position in this tuple instead]
+LOCATIONS = ("ON_SHELF", "ON_HOLD_SHELF", "CHECKED_OUT")
+_LOCATION_NAMES = {location: location for location in LOCATIONS}
+
+# check out day ItemStore keeps for an item that has not been checked out
+NO_DATE = -1
+
+# status codes returned by Library.apply_operations and the _status methods, and the message each stands for
+# [the message the matching method, such as check_out_library_item, returns]
+STATUS_MESSAGES = ("check out successful", "return successful", "request successful", "cancel successful",
+                   "payment successful", "patron not found", "item not found", "item on hold by other patron",
+                   "item already checked out", "item already in library", "item already on hold",
+                   "no request to cancel", "unknown operation")
+(CHECK_OUT_SUCCESSFUL, RETURN_SUCCESSFUL, REQUEST_SUCCESSFUL, CANCEL_SUCCESSFUL, PAYMENT_SUCCESSFUL, PATRON_NOT_FOUND,
+ ITEM_NOT_FOUND, ITEM_ON_HOLD_BY_OTHER_PATRON, ITEM_ALREADY_CHECKED_OUT, ITEM_ALREADY_IN_LIBRARY, ITEM_ALREADY_ON_HOLD,
+ NO_REQUEST_TO_CANCEL, UNKNOWN_OPERATION) = range(len(STATUS_MESSAGES))
+
+
 class LibraryItem:
     """Represents an item that can be found in a library"""
 
+    __slots__ = ("_library_item_id", "_title", "_checked_out_by", "_requested_by", "_date_checked_out",
+                 "_location", "_hold_queue")
+
     def __init__(self, item_id, title):
         """Initializes LibraryItem fields"""
         self._library_item_id = item_id
@@ -15,6 +48,7 @@ class LibraryItem:
         self._requested_by = None
         self._date_checked_out = None
         self._location = "ON_SHELF"
+        self._hold_queue = None         # HoldQueue of patrons waiting behind requested_by, made on first use
 
     def get_location(self):
         """Returns the location of a library item"""
@@ -22,7 +56,7 @@ class LibraryItem:
 
     def set_location(self, new_location):
         """Updates the location of a library item"""
-        self._location = new_location
+        self._location = _LOCATION_NAMES.get(new_location, new_location)
 
     def get_checked_out_by(self):
         """Returns the date of a checked out library item"""
@@ -40,6 +74,36 @@ class LibraryItem:
         """Updates who requested item"""
         self._requested_by = patron_id
 
+    def add_waiting_patron(self, patron_id):
+        """Adds a patron to the end of the line waiting behind requested_by"""
+        if self._hold_queue is None:
+            self._hold_queue = HoldQueue()
+        self._hold_queue.add_patron(patron_id)
+
+    def remove_waiting_patron(self, patron_id):
+        """Takes a patron out of the waiting line. Returns True if they were in it"""
+        if self._hold_queue is None:
+            return False
+        return self._hold_queue.remove_patron(patron_id)
+
+    def is_waiting(self, patron_id):
+        """Returns True if the patron is in the waiting line"""
+        return self._hold_queue is not None and self._hold_queue.has_patron(patron_id)
+
+    def get_waiting_patrons(self):
+        """Returns a list of the ids of patrons waiting behind requested_by, first in line first"""
+        if self._hold_queue is None:
+            return []
+        return self._hold_queue.get_patrons()
+
+    def promote_next_patron(self):
+        """Makes the first waiting patron [or None if nobody is waiting] the one who requested item. Returns
+           their id"""
+        self._requested_by = None
+        if self._hold_queue is not None:
+            self._requested_by = self._hold_queue.pop_first()
+        return self._requested_by
+
     def get_date_checked_out(self):
         """Returns the day a library item was checked out"""
         return self._date_checked_out
@@ -60,11 +124,13 @@ class LibraryItem:
 class Book(LibraryItem):
     """Represents a Book item with inheritance from LibraryItem class"""
 
+    __slots__ = ("_author",)
+    _check_out_length = 21             # the same for every book, so kept on the class
+
     def __init__(self, item_id, title, author):
         """Initializes Book fields"""
         super().__init__(item_id, title)
         self._author = author
-        self._check_out_length = 21
 
     def get_check_out_length(self):
         """Returns the number of days a book can be checked out"""
@@ -78,11 +144,13 @@ class Book(LibraryItem):
 class Album(LibraryItem):
     """Represents an Album item with inheritance from LibraryItem class"""
 
+    __slots__ = ("_artist",)
+    _check_out_length = 14             # the same for every album, so kept on the class
+
     def __init__(self, item_id, title, artist):
         """Initializes Album fields"""
         super().__init__(item_id, title)
         self._artist = artist
-        self._check_out_length = 14
 
     def get_check_out_length(self):
         """Returns the number of days an album can be checked out"""
@@ -96,11 +164,13 @@ class Album(LibraryItem):
 class Movie(LibraryItem):
     """Represents a Movie item with inheritance from LibraryItem class"""
 
+    __slots__ = ("_director",)
+    _check_out_length = 7              # the same for every movie, so kept on the class
+
     def __init__(self, item_id, title, director):
         """Initializes Movie fields"""
         super().__init__(item_id, title)
         self._director = director
-        self._check_out_length = 7
 
     def get_check_out_length(self):
         """Returns the number of days a movie can be checked out"""
@@ -114,28 +184,89 @@ class Movie(LibraryItem):
 class Patron:
     """Represents a Patron who can check out library item"""
 
+    __slots__ = ("_patron_id", "_name", "_checked_out_items", "_requested_items", "_fine_amount",
+                 "_overdue_items", "_fines_charged_to", "_calendar")
+
     def __init__(self, patron_id, name):
         """Initializes Patron fields"""
         self._patron_id = patron_id
         self._name = name
-        self._checked_out_items = []
+        self._checked_out_items = {}    # item id -> item for every item the patron has out, oldest first
+        self._requested_items = {}      # item id -> item for every item the patron has requested, oldest first
         self._fine_amount = 0
+        self._overdue_items = 0         # checked out items currently running up a fine
+        self._fines_charged_to = 0      # day up to which fines for overdue items are in fine_amount
+        self._calendar = None           # returns the library's current day [see set_calendar]
+
+    def set_calendar(self, calendar):
+        """Gives the patron a function returning the current day, so fines can be brought up to date when
+           they are read. Called by add_patron method of Library class"""
+        self._calendar = calendar
+
+    def charge_fines(self, day):
+        """Adds the fines for overdue items from the last day charged up to and including day"""
+        if self._overdue_items:
+            self._fine_amount += DAILY_FINE * self._overdue_items * (day - self._fines_charged_to)
+        self._fines_charged_to = day
+
+    def add_overdue_item(self, day):
+        """Starts a fine for one more item, first charged the day after day"""
+        self.charge_fines(day)
+        self._overdue_items += 1
+
+    def remove_overdue_item(self, day):
+        """Stops the fine for one item after charging it up to and including day"""
+        self.charge_fines(day)
+        self._overdue_items -= 1
+
+    def get_fine_record(self):
+        """Returns (fine amount, overdue items, day fines were charged to) as they stand, without charging the
+           days since. Used to save the patron [see restore_fine_record]"""
+        return self._fine_amount, self._overdue_items, self._fines_charged_to
+
+    def restore_fine_record(self, fine_amount, overdue_items, fines_charged_to):
+        """Puts back fine fields saved with get_fine_record"""
+        self._fine_amount = fine_amount
+        self._overdue_items = overdue_items
+        self._fines_charged_to = fines_charged_to
 
     def get_fine_amount(self):
         """Returns the amount due for overdue items"""
+        if self._calendar is not None:
+            self.charge_fines(self._calendar())
         return self._fine_amount
 
     def add_library_item(self, library_item):
         """Adds library item to checked_out_items"""
-        self._checked_out_items.append(library_item)
+        self._checked_out_items[library_item.get_item_id()] = library_item
 
     def remove_library_item(self, library_item):
         """Removes library item from checked_out_items"""
-        self._checked_out_items.remove(library_item)
+        del self._checked_out_items[library_item.get_item_id()]
 
     def get_checked_out_items(self):
-        """Returns list of checked out items for a patron"""
-        return self._checked_out_items
+        """Returns list of checked out items for a patron, in the order they were checked out"""
+        return list(self._checked_out_items.values())
+
+    def get_checked_out_item(self, item_id):
+        """Returns the checked out item with item id, or None if the patron does not have it"""
+        return self._checked_out_items.get(item_id)
+
+    def get_num_checked_out_items(self):
+        """Returns the number of items a patron has checked out"""
+        return len(self._checked_out_items)
+
+    def add_requested_item(self, library_item):
+        """Adds library item to requested_items"""
+        self._requested_items[library_item.get_item_id()] = library_item
+
+    def remove_requested_item(self, library_item):
+        """Removes library item from requested_items"""
+        self._requested_items.pop(library_item.get_item_id(), None)
+
+    def get_requested_items(self):
+        """Returns list of items a patron has requested, whether they are first in line or still waiting"""
+        return list(self._requested_items.values())
 
     def amend_fine(self, amount):
         """Updates amount due for fines"""
@@ -152,19 +283,654 @@ class Patron:
         return self._patron_id
 
 
+class HoldQueue:
+    """Represents the patrons waiting for an item, first come first served. Patrons are linked to the ones
+       before and after them, so adding, taking the first, and removing any patron take the same time however
+       long the line gets"""
+
+    __slots__ = ("_links", "_first", "_last")
+
+    def __init__(self):
+        """Initializes HoldQueue fields"""
+        self._links = {}                # patron id -> [id of patron before, id of patron after]
+        self._first = None
+        self._last = None
+
+    def add_patron(self, patron_id):
+        """Adds patron to the end of the line. Returns False if they are already in it"""
+        if patron_id in self._links:
+            return False
+        self._links[patron_id] = [self._last, None]
+        if self._last is None:
+            self._first = patron_id
+        else:
+            self._links[self._last][1] = patron_id
+        self._last = patron_id
+        return True
+
+    def remove_patron(self, patron_id):
+        """Takes patron out of the line. Returns False if they are not in it"""
+        if patron_id not in self._links:
+            return False
+        before, after = self._links.pop(patron_id)
+        if before is None:
+            self._first = after
+        else:
+            self._links[before][1] = after
+        if after is None:
+            self._last = before
+        else:
+            self._links[after][0] = before
+        return True
+
+    def pop_first(self):
+        """Takes the first patron out of the line and returns their id, or None if the line is empty"""
+        patron_id = self._first
+        if patron_id is not None:
+            self.remove_patron(patron_id)
+        return patron_id
+
+    def get_first(self):
+        """Returns the id of the first patron in line, or None"""
+        return self._first
+
+    def has_patron(self, patron_id):
+        """Returns True if patron is in the line"""
+        return patron_id in self._links
+
+    def get_length(self):
+        """Returns the number of patrons in line"""
+        return len(self._links)
+
+    def get_patrons(self):
+        """Returns a list of the patrons in line, first to last"""
+        patrons = []
+        patron_id = self._first
+        while patron_id is not None:
+            patrons.append(patron_id)
+            patron_id = self._links[patron_id][1]
+        return patrons
+
+
+class ItemStore:
+    """Keeps the fields of many books, albums, and movies in parallel columns [lists and byte arrays] indexed
+       by a dense item number, instead of one object per item. Locations take one byte, check out days eight,
+       titles are packed into one byte array, only items checked out or on hold take room for a patron id, and
+       equal authors, artists, and directors are stored once. Pass one to Library to use it as the
+       holdings; items added are copied in, and looking an item id up returns a StoredItem view with the
+       same methods as LibraryItem"""
+
+    __slots__ = ("_item_ids", "_positions", "_kinds", "_title_bytes", "_title_starts", "_title_lengths",
+                 "_makers", "_shared", "_locations", "_checked_out_by", "_requested_by", "_dates", "_hold_queues")
+
+    def __init__(self):
+        """Initializes ItemStore fields"""
+        self._item_ids = []             # item number -> item id
+        self._positions = {}            # item id -> item number
+        self._kinds = bytearray()       # item number -> position in STORED_KINDS
+        self._title_bytes = bytearray()     # every title in UTF-8, one after another
+        self._title_starts = array("Q")     # item number -> where its title starts in title_bytes
+        self._title_lengths = array("I")
+        self._makers = []               # author, artist, or director
+        self._shared = {}               # one copy of each maker: maker -> the stored copy
+        self._locations = bytearray()   # item number -> position in LOCATIONS
+        self._checked_out_by = {}       # item number -> patron id, for the items checked out
+        self._requested_by = {}         # item number -> patron id, for the items on hold
+        self._dates = array("q")        # check out day, or NO_DATE
+        self._hold_queues = {}          # item number -> HoldQueue, for the items with patrons waiting
+
+    def add_library_item(self, library_item):
+        """Copies a Book, Album, or Movie [or a StoredItem] into the store, replacing any item with the same
+           id. Returns the item number"""
+        for kind, (item_class, stored_class, maker_getter) in enumerate(STORED_KINDS):
+            if isinstance(library_item, (item_class, stored_class)):
+                break
+        else:
+            raise ValueError("only books, albums, and movies can be stored")
+
+        item_id = library_item.get_item_id()
+        maker = getattr(library_item, maker_getter)()
+        maker = self._shared.setdefault(maker, maker)
+        location = LOCATIONS.index(library_item.get_location())
+        date = library_item.get_date_checked_out()
+        if date is None:
+            date = NO_DATE
+        waiting = library_item.get_waiting_patrons()
+
+        # a replaced item's old title stays in title_bytes, unused
+        title = library_item.get_title().encode()
+        title_start = len(self._title_bytes)
+        self._title_bytes += title
+
+        index = self._positions.get(item_id)
+        if index is None:
+            index = len(self._item_ids)
+            self._positions[item_id] = index
+            self._item_ids.append(item_id)
+            self._kinds.append(kind)
+            self._title_starts.append(title_start)
+            self._title_lengths.append(len(title))
+            self._makers.append(maker)
+            self._locations.append(location)
+            self._dates.append(date)
+        else:
+            self._kinds[index] = kind
+            self._title_starts[index] = title_start
+            self._title_lengths[index] = len(title)
+            self._makers[index] = maker
+            self._locations[index] = location
+            self._dates[index] = date
+            self._hold_queues.pop(index, None)
+
+        self.set_checked_out_by(index, library_item.get_checked_out_by())
+        self.set_requested_by(index, library_item.get_requested_by())
+        for patron_id in waiting:
+            self.add_waiting_patron(index, patron_id)
+        return index
+
+    def can_store(self, library_item):
+        """Returns True if library_item is a kind the store can hold [a Book, Album, or Movie, or a StoredItem]"""
+        return any(isinstance(library_item, (item_class, stored_class))
+                   for item_class, stored_class, maker_getter in STORED_KINDS)
+
+    def get_item(self, index):
+        """Returns a StoredItem view of item number index"""
+        return STORED_KINDS[self._kinds[index]][1](self, index)
+
+    def lookup_library_item_from_id(self, item_id):
+        """Returns a StoredItem view of the item with item id, or None"""
+        index = self._positions.get(item_id)
+        if index is None:
+            return None
+        return self.get_item(index)
+
+    def get_num_items(self):
+        """Returns the number of items in the store"""
+        return len(self._item_ids)
+
+    # Library uses the store as its holdings dictionary: item id -> item
+
+    def __contains__(self, item_id):
+        return item_id in self._positions
+
+    def __getitem__(self, item_id):
+        return self.get_item(self._positions[item_id])
+
+    def get(self, item_id, default=None):
+        index = self._positions.get(item_id)
+        if index is None:
+            return default
+        return self.get_item(index)
+
+    def __setitem__(self, item_id, library_item):
+        if library_item.get_item_id() != item_id:
+            raise ValueError("item stored under an id that is not its own")
+        self.add_library_item(library_item)
+
+    def update(self, pairs):
+        """Stores each item of a list of (item id, item) pairs, as dict.update does. Stores none of them if
+           any cannot be stored"""
+        pairs = list(pairs)
+        for item_id, library_item in pairs:
+            if not self.can_store(library_item):
+                raise ValueError("only books, albums, and movies can be stored")
+            if library_item.get_item_id() != item_id:
+                raise ValueError("item stored under an id that is not its own")
+        for item_id, library_item in pairs:
+            self[item_id] = library_item
+
+    def __len__(self):
+        return len(self._item_ids)
+
+    def __iter__(self):
+        return iter(self._item_ids)
+
+    def values(self):
+        """Returns a StoredItem view of every item, in the order they were added"""
+        return [self.get_item(index) for index in range(len(self._item_ids))]
+
+    # fields of one item, read and written by StoredItem
+
+    def get_item_id(self, index):
+        """Returns the id of item number index"""
+        return self._item_ids[index]
+
+    def get_title(self, index):
+        """Returns the title of item number index"""
+        start = self._title_starts[index]
+        return self._title_bytes[start:start + self._title_lengths[index]].decode()
+
+    def get_maker(self, index):
+        """Returns the author, artist, or director of item number index"""
+        return self._makers[index]
+
+    def get_location(self, index):
+        """Returns the location of item number index"""
+        return LOCATIONS[self._locations[index]]
+
+    def set_location(self, index, new_location):
+        """Updates the location of item number index. Raises ValueError for a location not in LOCATIONS"""
+        self._locations[index] = LOCATIONS.index(new_location)
+
+    def get_checked_out_by(self, index):
+        """Returns the id of the patron who checked out item number index"""
+        return self._checked_out_by.get(index)
+
+    def set_checked_out_by(self, index, patron_id):
+        """Updates who checked out item number index"""
+        if patron_id is None:
+            self._checked_out_by.pop(index, None)
+        else:
+            self._checked_out_by[index] = patron_id
+
+    def get_requested_by(self, index):
+        """Returns the id of the patron first in line for item number index"""
+        return self._requested_by.get(index)
+
+    def set_requested_by(self, index, patron_id):
+        """Updates who requested item number index"""
+        if patron_id is None:
+            self._requested_by.pop(index, None)
+        else:
+            self._requested_by[index] = patron_id
+
+    def get_date_checked_out(self, index):
+        """Returns the day item number index was checked out, or None"""
+        date = self._dates[index]
+        if date == NO_DATE:
+            return None
+        return date
+
+    def set_date_checked_out(self, index, new_day):
+        """Updates the check out day of item number index"""
+        if new_day is None:
+            new_day = NO_DATE
+        self._dates[index] = new_day
+
+    def add_waiting_patron(self, index, patron_id):
+        """Adds a patron to the end of the line waiting for item number index"""
+        if index not in self._hold_queues:
+            self._hold_queues[index] = HoldQueue()
+        self._hold_queues[index].add_patron(patron_id)
+
+    def get_hold_queue(self, index):
+        """Returns the HoldQueue of item number index, or None if nobody has waited for it"""
+        return self._hold_queues.get(index)
+
+
+class StoredItem:
+    """Represents one item in an ItemStore, with the same methods as LibraryItem. Holds only the store and the
+       item number, and is made whenever the store is asked for the item, so two views of the same item are
+       equal [==] but not the same object"""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index):
+        """Initializes StoredItem fields"""
+        self._store = store
+        self._index = index
+
+    def __eq__(self, other):
+        return isinstance(other, StoredItem) and other._store is self._store and other._index == self._index
+
+    def __hash__(self):
+        return hash((id(self._store), self._index))
+
+    def get_location(self):
+        """Returns the location of a library item"""
+        return self._store.get_location(self._index)
+
+    def set_location(self, new_location):
+        """Updates the location of a library item"""
+        self._store.set_location(self._index, new_location)
+
+    def get_checked_out_by(self):
+        """Returns the id of the patron who checked out item"""
+        return self._store.get_checked_out_by(self._index)
+
+    def set_checked_out_by(self, patron_id):
+        """Updates who checked out item"""
+        self._store.set_checked_out_by(self._index, patron_id)
+
+    def get_requested_by(self):
+        """Returns the id of patron requesting library item"""
+        return self._store.get_requested_by(self._index)
+
+    def set_requested_by(self, patron_id):
+        """Updates who requested item"""
+        self._store.set_requested_by(self._index, patron_id)
+
+    def add_waiting_patron(self, patron_id):
+        """Adds a patron to the end of the line waiting behind requested_by"""
+        self._store.add_waiting_patron(self._index, patron_id)
+
+    def remove_waiting_patron(self, patron_id):
+        """Takes a patron out of the waiting line. Returns True if they were in it"""
+        hold_queue = self._store.get_hold_queue(self._index)
+        return hold_queue is not None and hold_queue.remove_patron(patron_id)
+
+    def is_waiting(self, patron_id):
+        """Returns True if the patron is in the waiting line"""
+        hold_queue = self._store.get_hold_queue(self._index)
+        return hold_queue is not None and hold_queue.has_patron(patron_id)
+
+    def get_waiting_patrons(self):
+        """Returns a list of the ids of patrons waiting behind requested_by, first in line first"""
+        hold_queue = self._store.get_hold_queue(self._index)
+        if hold_queue is None:
+            return []
+        return hold_queue.get_patrons()
+
+    def promote_next_patron(self):
+        """Makes the first waiting patron [or None if nobody is waiting] the one who requested item. Returns
+           their id"""
+        hold_queue = self._store.get_hold_queue(self._index)
+        patron_id = None
+        if hold_queue is not None:
+            patron_id = hold_queue.pop_first()
+        self._store.set_requested_by(self._index, patron_id)
+        return patron_id
+
+    def get_date_checked_out(self):
+        """Returns the day a library item was checked out"""
+        return self._store.get_date_checked_out(self._index)
+
+    def set_date_checked_out(self, new_day):
+        """Update check out date of item"""
+        self._store.set_date_checked_out(self._index, new_day)
+
+    def get_item_id(self):
+        """Returns the id of a library item"""
+        return self._store.get_item_id(self._index)
+
+    def get_title(self):
+        """Returns the title of a library item"""
+        return self._store.get_title(self._index)
+
+
+class StoredBook(StoredItem):
+    """Represents a Book kept in an ItemStore"""
+
+    __slots__ = ()
+
+    def get_check_out_length(self):
+        """Returns the number of days a book can be checked out"""
+        return Book._check_out_length
+
+    def get_author(self):
+        """Returns the author of book"""
+        return self._store.get_maker(self._index)
+
+
+class StoredAlbum(StoredItem):
+    """Represents an Album kept in an ItemStore"""
+
+    __slots__ = ()
+
+    def get_check_out_length(self):
+        """Returns the number of days an album can be checked out"""
+        return Album._check_out_length
+
+    def get_artist(self):
+        """Returns the artist of an album"""
+        return self._store.get_maker(self._index)
+
+
+class StoredMovie(StoredItem):
+    """Represents a Movie kept in an ItemStore"""
+
+    __slots__ = ()
+
+    def get_check_out_length(self):
+        """Returns the number of days a movie can be checked out"""
+        return Movie._check_out_length
+
+    def get_director(self):
+        """Returns the director for a movie"""
+        return self._store.get_maker(self._index)
+
+
+# kinds of item an ItemStore holds: (item class, its StoredItem class, method that reads its maker)
+STORED_KINDS = ((Book, StoredBook, "get_author"), (Album, StoredAlbum, "get_artist"),
+                (Movie, StoredMovie, "get_director"))
+
+
+class SearchIndex:
+    """Finds library items [or their ids, as Library keeps] by the value of one field [title, author,...]
+       without looking at every item. Values are matched ignoring case. Exact matches come from a dictionary;
+       prefix and range matches come from a binary search over the sorted values"""
+
+    __slots__ = ("_items", "_sorted_keys", "_new_keys", "_removed_keys")
+
+    def __init__(self):
+        """Initializes SearchIndex fields"""
+        self._items = {}            # casefolded value -> the item with that value, or a list of the items if
+                                    # there are several, in the order they were added
+        self._sorted_keys = []      # casefolded values in sorted order [may still hold removed values]
+        self._new_keys = []         # values added since _sorted_keys was last sorted
+        self._removed_keys = 0      # removed values still in _sorted_keys
+
+    def add_library_item(self, value, library_item):
+        """Adds library item under value"""
+        key = value.casefold()
+        items = self._items.get(key)
+        if items is None:
+            self._items[key] = library_item
+            self._new_keys.append(key)
+        elif type(items) is list:
+            items.append(library_item)
+        else:
+            self._items[key] = [items, library_item]
+
+    def add_library_items(self, pairs):
+        """Adds each item of a list of (value, item) pairs under its value, skipping a value of None"""
+        items = self._items
+        new_keys = self._new_keys
+        for value, library_item in pairs:
+            if value is None:
+                continue
+            key = value.casefold()
+            found = items.setdefault(key, library_item)
+            if found is library_item:
+                new_keys.append(key)
+            elif type(found) is list:
+                found.append(library_item)
+            else:
+                items[key] = [found, library_item]
+
+    def remove_library_item(self, value, library_item):
+        """Removes library item from under value, if it is there"""
+        key = value.casefold()
+        items = self.get_items(key)
+        if library_item not in items:
+            return
+        if len(items) == 1:
+            del self._items[key]
+            self._removed_keys += 1
+        elif len(items) == 2:
+            items.remove(library_item)
+            self._items[key] = items[0]
+        else:
+            items.remove(library_item)
+
+    def get_items(self, key):
+        """Returns a list of the items under an already casefolded value"""
+        items = self._items.get(key)
+        if items is None:
+            return []
+        if type(items) is list:
+            return items
+        return [items]
+
+    def get_sorted_keys(self):
+        """Returns the indexed values in sorted order. Values added since the last call are merged in here
+           rather than on every add, so loading many items stays linear"""
+        if self._new_keys or self._removed_keys > len(self._sorted_keys) // 2:
+            keys = self._sorted_keys + self._new_keys
+            keys.sort()
+            if self._removed_keys:
+                # drop removed values, and the old copy of any value removed then added again
+                keys = [key for index, key in enumerate(keys)
+                        if key in self._items and (index == 0 or keys[index - 1] != key)]
+            self._sorted_keys = keys
+            self._new_keys = []
+            self._removed_keys = 0
+        return self._sorted_keys
+
+    def find(self, value):
+        """Returns a list of the items whose value matches"""
+        return list(self.get_items(value.casefold()))
+
+    def find_prefix(self, prefix):
+        """Returns a list of the items whose value starts with prefix, in order of value"""
+        keys = self.get_sorted_keys()
+        prefix = prefix.casefold()
+        found = []
+        index = bisect_left(keys, prefix)
+        while index < len(keys) and keys[index].startswith(prefix):
+            found.extend(self.get_items(keys[index]))
+            index += 1
+        return found
+
+    def find_range(self, low, high):
+        """Returns a list of the items with low <= value < high, in order of value"""
+        keys = self.get_sorted_keys()
+        high = high.casefold()
+        found = []
+        index = bisect_left(keys, low.casefold())
+        while index < len(keys) and keys[index] < high:
+            found.extend(self.get_items(keys[index]))
+            index += 1
+        return found
+
+
 class Library:
     """Represents a library with check out, return, request, and fine methods"""
 
-    def __init__(self):
-        """Initializes library fields"""
+    def __init__(self, item_store=None, search_fields=SEARCH_FIELDS, database=None):
+        """Initializes library fields. Items are kept in item_store [an ItemStore] if one is given, which
+           takes less memory for large catalogs; lookups then return StoredItem views of the items. Only the
+           fields in search_fields [all of SEARCH_FIELDS by default] can be searched.
+           With a database [see LibraryDatabase.LibraryDatabase] the library picks up where the database left
+           off, loading items and patrons only when they are first looked up, and writes every change through
+           to it"""
         self._holdings = {}
+        if item_store is not None:
+            self._holdings = item_store
         self._members = {}
         self._current_day = 0
+        self._due_dates = []            # heap of (due day, loan number, item id); returned loans are skipped
+        self._loans = {}                # item id -> (loan number, patron id) for every checked out item
+        self._overdue = {}              # item id -> patron id for every checked out item past its due day
+        self._loan_count = 0            # loans made so far; numbers each loan
+        self._indexes = {field: SearchIndex() for field in search_fields}    # field -> SearchIndex
+        self._database = database       # records every change [see LibraryDatabase.LibraryDatabase]
+
+        if database is not None:
+            if item_store is not None:
+                raise ValueError("a library keeps its items in an item store or a database, not both")
+            self._holdings = database.get_holdings()
+            self._members = database.get_members(self.get_current_day)
+            self._indexes = {field: database.get_search_index(field) for field in search_fields}
+            self.restore_loans(*database.load_loans())
+
+    def restore_loans(self, current_day, loan_count, loans):
+        """Puts back the date and the loans, given as (item id, loan number, patron id, due day or None,
+           overdue) for every item checked out. Called when a library is opened from a database"""
+        self._current_day = current_day
+        self._loan_count = loan_count
+        for item_id, loan_number, patron_id, due_day, overdue in loans:
+            self._loans[item_id] = (loan_number, patron_id)
+            if overdue:
+                self._overdue[item_id] = patron_id
+            elif due_day is not None:
+                heappush(self._due_dates, (due_day, loan_number, item_id))
 
     def add_library_item(self, library_item):
         """Adds items to library collection"""
         item_id = library_item.get_item_id()
+
+        # an item added under an id already in use replaces the old one in the search indexes too
+        if item_id in self._holdings:
+            self.update_indexes(self._holdings[item_id], "remove_library_item")
         self._holdings[item_id] = library_item
+        self.update_indexes(self._holdings[item_id], "add_library_item")
+
+    def add_library_items(self, library_items, keep=True):
+        """Adds a batch of items, as add_library_item does for each. The holdings take the whole batch at once
+           and each search index is then filled in one pass, which is much faster for large loads. With keep
+           False, a library kept in a database writes the new items without holding on to them [they are read
+           back on first use], so a large load does not fill memory; the objects passed in are then not the
+           ones the library uses"""
+        library_items = list(library_items)
+        batch = {library_item.get_item_id(): library_item for library_item in library_items}
+        if len(batch) == len(library_items) and not any(map(self._holdings.__contains__, batch)):
+            self.add_new_items(batch, keep)     # the usual case: every id is new
+            return
+
+        batch = {}                      # item id -> item, for the new ids in the batch so far
+        for library_item in library_items:
+            item_id = library_item.get_item_id()
+            if item_id in batch or item_id in self._holdings:
+                # replacing an item: put in the ones before it so the replaced one leaves the indexes
+                self.add_new_items(batch, keep)
+                batch = {}
+                self.add_library_item(library_item)
+            else:
+                batch[item_id] = library_item
+        self.add_new_items(batch, keep)
+
+    def add_new_items(self, batch, keep=True):
+        """Helper method for add_library_items: Adds a dict of item id -> item for ids not yet in the holdings.
+           The index entries are worked out before the holdings take the batch and added after, so a batch the
+           holdings turn down leaves the library as it was"""
+        if not batch:
+            return
+
+        # look each field's method up once per class of item rather than once per item
+        classes = set(map(type, batch.values()))
+        entries = {}
+        for field in self._indexes:
+            methods = {item_class: getattr(item_class, SEARCH_FIELDS[field], None) for item_class in classes}
+            entries[field] = [(methods[type(library_item)](library_item), item_id)
+                              for item_id, library_item in batch.items() if methods[type(library_item)] is not None]
+
+        if keep or self._database is None:
+            self._holdings.update(batch.items())
+        else:
+            self._holdings.write(batch.items())
+        for field, index in self._indexes.items():
+            index.add_library_items(entries[field])
+
+    def update_indexes(self, library_item, method):
+        """Helper method for add_library_item: Adds the item's id to or removes it from each search index"""
+        for field, index in self._indexes.items():
+            get_value = getattr(library_item, SEARCH_FIELDS[field], None)
+            if get_value is not None:
+                value = get_value()
+                if value is not None:
+                    getattr(index, method)(value, library_item.get_item_id())
+
+    def search_library_items(self, field, value):
+        """Returns a list of the items whose field ["title", "author", "artist", or "director"] matches value,
+           ignoring case. Returns None if field is not searchable"""
+        if field not in self._indexes:
+            return None
+        return [self._holdings[item_id] for item_id in self._indexes[field].find(value)]
+
+    def search_library_items_by_prefix(self, field, prefix):
+        """Returns a list of the items whose field starts with prefix, ignoring case, in order of that field.
+           Returns None if field is not searchable"""
+        if field not in self._indexes:
+            return None
+        return [self._holdings[item_id] for item_id in self._indexes[field].find_prefix(prefix)]
+
+    def search_library_items_in_range(self, field, low, high):
+        """Returns a list of the items whose field is from low up to but not including high, ignoring case,
+           in order of that field. Returns None if field is not searchable"""
+        if field not in self._indexes:
+            return None
+        return [self._holdings[item_id] for item_id in self._indexes[field].find_range(low, high)]
 
     def lookup_library_item_from_id(self, item_id):
         """Returns a LibraryItem object corresponding to the item id"""
@@ -176,8 +942,22 @@ class Library:
     def add_patron(self, patron):
         """Adds patron to members"""
         patron_id = patron.get_patron_id()
+        patron.set_calendar(self.get_current_day)
+        patron.charge_fines(self._current_day)
         self._members[patron_id] = patron
 
+    def add_patrons(self, patrons, keep=True):
+        """Adds a batch of patrons, as add_patron does for each, storing them all at once. keep is as for
+           add_library_items"""
+        for patron in patrons:
+            patron.set_calendar(self.get_current_day)
+            patron.charge_fines(self._current_day)
+        pairs = [(patron.get_patron_id(), patron) for patron in patrons]
+        if keep or self._database is None:
+            self._members.update(pairs)
+        else:
+            self._members.write(pairs)
+
     def lookup_patron_from_id(self, patron_id):
         """Returns a Patron object corresponding to patron id"""
         if patron_id in self._members:
@@ -187,99 +967,240 @@ class Library:
 
     def check_out_library_item(self, patron_id, item_id):
         """Checks out valid items to valid patrons"""
-
-        if patron_id not in self._members:
-            return "patron not found"
-        if item_id not in self._holdings:
-            return "item not found"
-
-        requested_by = self._holdings[item_id].get_requested_by()
+        return STATUS_MESSAGES[self.check_out_status(patron_id, item_id)]
+
+    def check_out_status(self, patron_id, item_id, today=None):
+        """Does the work of check_out_library_item, returning a status code instead of a message. today is the
+           day of the check out, read once for both the item's date and the due day [the current day unless
+           given]"""
+        if today is None:
+            today = self._current_day
+        patron = self._members.get(patron_id)
+        if patron is None:
+            return PATRON_NOT_FOUND
+        item = self._holdings.get(item_id)
+        if item is None:
+            return ITEM_NOT_FOUND
+
+        requested_by = item.get_requested_by()
         if requested_by is not None and requested_by != patron_id:
-            return "item on hold by other patron"
-        if self._holdings[item_id].get_location() == "CHECKED_OUT":
-            return "item already checked out"
-        else:
-            # update item fields
-            self._holdings[item_id].set_checked_out_by(patron_id)
-            self._holdings[item_id].set_date_checked_out(self._current_day)
-            self._holdings[item_id].set_location("CHECKED_OUT")
-
-            # update item requested by status
-            if patron_id == self._holdings[item_id].get_requested_by():
-                self._holdings[item_id].set_requested_by(None)
-
-            # add item to patron's checked_out_items
-            item = self._holdings[item_id]
-            self._members[patron_id].add_library_item(item)
-
-            return "check out successful"
+            return ITEM_ON_HOLD_BY_OTHER_PATRON
+        if item.get_location() == "CHECKED_OUT":
+            return ITEM_ALREADY_CHECKED_OUT
+
+        # update item fields
+        item.set_checked_out_by(patron_id)
+        item.set_date_checked_out(today)
+        item.set_location("CHECKED_OUT")
+
+        # update item requested by status: the next patron waiting is now first in line
+        was_requested = requested_by is not None
+        if was_requested:
+            item.promote_next_patron()
+            patron.remove_requested_item(item)
+
+        # add item to patron's checked_out_items
+        patron.add_library_item(item)
+        due_day = self.add_loan(patron_id, item, today)
+
+        if self._database is not None:
+            self._database.record_check_out(item, patron_id, self._loan_count, due_day, was_requested)
+        return CHECK_OUT_SUCCESSFUL
+
+    def add_loan(self, patron_id, library_item, today):
+        """Helper method for check_out_library_item: Files the loan made on day today under its due day.
+           Returns the due day"""
+        self._loan_count += 1
+        self._loans[library_item.get_item_id()] = (self._loan_count, patron_id)
+
+        # a plain LibraryItem has no check out length, so it is never overdue
+        if not hasattr(library_item, "get_check_out_length"):
+            return None
+        due_day = today + library_item.get_check_out_length()
+        heappush(self._due_dates, (due_day, self._loan_count, library_item.get_item_id()))
+        return due_day
 
     def return_library_item(self, item_id):
         """Updates library item's status and location after being returned"""
-
-        if item_id not in self._holdings:
-            return "item not found"
-        if self._holdings[item_id].get_location() != "CHECKED_OUT":
-            return "item already in library"
+        return STATUS_MESSAGES[self.return_status(item_id)]
+
+    def return_status(self, item_id):
+        """Does the work of return_library_item, returning a status code instead of a message"""
+        item = self._holdings.get(item_id)
+        if item is None:
+            return ITEM_NOT_FOUND
+        if item.get_location() != "CHECKED_OUT":
+            return ITEM_ALREADY_IN_LIBRARY
+
+        # remove returned item from patron's checked out items
+        patron_id = item.get_checked_out_by()
+        patron = self._members[patron_id]
+        patron.remove_library_item(item)
+
+        # stop the loan's fine, charged through today
+        self._loans.pop(item_id, None)
+        if self._overdue.pop(item_id, None) is not None:
+            patron.remove_overdue_item(self._current_day)
+
+        # update location of returned item
+        if item.get_requested_by() is not None:
+            item.set_location("ON_HOLD_SHELF")
         else:
-            # remove returned item from patron's checked out items
-            patron_id = self._holdings[item_id].get_checked_out_by()
-            item = self._holdings[item_id]
-            self._members[patron_id].remove_library_item(item)
-
-            # update location of returned item
-            if self._holdings[item_id].get_requested_by() is not None:
-                self._holdings[item_id].set_location("ON_HOLD_SHELF")
-            else:
-                self._holdings[item_id].set_location("ON_SHELF")
-
-            self._holdings[item_id].set_checked_out_by(None)
+            item.set_location("ON_SHELF")
+        item.set_checked_out_by(None)
 
-            return "return successful"
+        if self._database is not None:
+            self._database.record_return(item, patron)
+        return RETURN_SUCCESSFUL
 
     def request_library_item(self, patron_id, item_id):
-        """Places an item on hold for a patron"""
-
-        if patron_id not in self._members:
-            return "patron not found"
-        if item_id not in self._holdings:
-            return "item not found"
-        if self._holdings[item_id].get_requested_by() is not None:
-            return "item already on hold"
+        """Places an item on hold for a patron. If another patron already has it on hold, the patron joins the
+           line of patrons waiting for it"""
+        return STATUS_MESSAGES[self.request_status(patron_id, item_id)]
+
+    def request_status(self, patron_id, item_id):
+        """Does the work of request_library_item, returning a status code instead of a message"""
+        patron = self._members.get(patron_id)
+        if patron is None:
+            return PATRON_NOT_FOUND
+        item = self._holdings.get(item_id)
+        if item is None:
+            return ITEM_NOT_FOUND
+
+        requested_by = item.get_requested_by()
+        if requested_by == patron_id or item.is_waiting(patron_id):
+            return ITEM_ALREADY_ON_HOLD
+        if requested_by is not None:
+            item.add_waiting_patron(patron_id)
         else:
-            self._holdings[item_id].set_requested_by(patron_id)
+            item.set_requested_by(patron_id)
 
             # update location of requested item if ON_SHELF only
-            if self._holdings[item_id].get_location() == "ON_SHELF":
-                self._holdings[item_id].set_location("ON_HOLD_SHELF")
-
-            return "request successful"
+            if item.get_location() == "ON_SHELF":
+                item.set_location("ON_HOLD_SHELF")
+
+        patron.add_requested_item(item)
+        if self._database is not None:
+            self._database.record_request(item, patron_id)
+        return REQUEST_SUCCESSFUL
+
+    def cancel_request(self, patron_id, item_id):
+        """Takes a patron off an item's holds. If they were first in line the next patron waiting takes their
+           place, and an item on the hold shelf with nobody left waiting goes back on the shelf"""
+        return STATUS_MESSAGES[self.cancel_status(patron_id, item_id)]
+
+    def cancel_status(self, patron_id, item_id):
+        """Does the work of cancel_request, returning a status code instead of a message"""
+        patron = self._members.get(patron_id)
+        if patron is None:
+            return PATRON_NOT_FOUND
+        item = self._holdings.get(item_id)
+        if item is None:
+            return ITEM_NOT_FOUND
+
+        patron.remove_requested_item(item)
+        if item.get_requested_by() == patron_id:
+            if item.promote_next_patron() is None and item.get_location() == "ON_HOLD_SHELF":
+                item.set_location("ON_SHELF")
+        elif not item.remove_waiting_patron(patron_id):
+            return NO_REQUEST_TO_CANCEL
+
+        if self._database is not None:
+            self._database.record_cancel(item, patron_id)
+        return CANCEL_SUCCESSFUL
+
+    def cancel_all_requests(self, patron_id):
+        """Cancels every hold a patron has, looking only at the items they requested"""
+        if patron_id not in self._members:
+            return "patron not found"
+        for item in self._members[patron_id].get_requested_items():
+            self.cancel_request(patron_id, item.get_item_id())
+        return "cancel successful"
 
     def pay_fine(self, patron_id, amount_paid):
         """Updates patron's fines due"""
-        if patron_id not in self._members:
-            return "patron not found"
-        else:
-            self._members[patron_id].amend_fine(-1 * amount_paid)
-            return "payment successful"
+        return STATUS_MESSAGES[self.pay_fine_status(patron_id, amount_paid)]
+
+    def pay_fine_status(self, patron_id, amount_paid):
+        """Does the work of pay_fine, returning a status code instead of a message"""
+        patron = self._members.get(patron_id)
+        if patron is None:
+            return PATRON_NOT_FOUND
+        patron.amend_fine(-1 * amount_paid)
+        if self._database is not None:
+            self._database.record_fines(patron)
+        return PAYMENT_SUCCESSFUL
+
+    def apply_operations(self, operations):
+        """Applies a sequence of circulation operations in order, exactly as the matching methods would, and
+           returns a bytes object with one status code per operation [see STATUS_MESSAGES]. Each operation is a
+           tuple: ("check out", patron id, item id), ("return", item id), ("request", patron id, item id),
+           ("cancel", patron id, item id), or ("pay", patron id, amount). An operation that is none of these
+           [an unknown name, the wrong number of values, or empty] gets UNKNOWN_OPERATION and the batch goes on.
+           A library with a database commits the whole batch at once"""
+        # operation name -> (method, length of the operation's tuple)
+        methods = {"check out": (self.check_out_status, 3), "return": (self.return_status, 2),
+                   "request": (self.request_status, 3), "cancel": (self.cancel_status, 3),
+                   "pay": (self.pay_fine_status, 3)}
+        unknown = (None, 0)
+        codes = bytearray()
+        append = codes.append
+        if self._database is not None:
+            self._database.begin_batch()
+        try:
+            for operation in operations:
+                try:
+                    method, length = methods.get(operation[0], unknown)
+                except (IndexError, TypeError):
+                    method = None                       # empty, or not a tuple starting with a name
+                if method is None or len(operation) != length:
+                    append(UNKNOWN_OPERATION)
+                else:
+                    append(method(*operation[1:]))
+        finally:
+            if self._database is not None:
+                self._database.end_batch()
+        return bytes(codes)
 
     def increment_current_date(self):
-        """Increases days open and calculates fine due"""
+        """Increases days open and calculates fine due. Only loans that become overdue today are looked at;
+           each patron's fines are charged when their fine amount is next read"""
         self._current_day += 1
-        fines_due = 0
-
-        # get patron's checked out items
-        for patron_id in self._members:
-            patron_items = self._members[patron_id].get_checked_out_items()
-            # get individual library item in checked out items
-            for library_item in patron_items:
-                days_checked_out = self._current_day - library_item.get_date_checked_out()
-                check_out_length = library_item.get_check_out_length()
-                if days_checked_out > check_out_length:
-                    fines_due += .10
-
-            self._members[patron_id].amend_fine(fines_due)
-            fines_due = 0
+        self.start_overdue_fines()
+
+    def advance_days(self, days):
+        """Moves the current date forward days days at once, leaving the library and its patrons' fines exactly
+           as that many calls to increment_current_date would. Costs the same whatever days is: only the loans
+           that become overdue along the way are looked at. A days of less than 1 leaves the date alone"""
+        if days < 1:
+            return
+        self._current_day += days
+        self.start_overdue_fines()
+
+    def start_overdue_fines(self):
+        """Helper method for increment_current_date and advance_days: Moves every loan due before today into
+           the overdue loans. Each starts its fine the day after its due day"""
+        newly_overdue = []
+        while self._due_dates and self._due_dates[0][0] < self._current_day:
+            due_day, loan_number, item_id = heappop(self._due_dates)
+            loan = self._loans.get(item_id)
+            if loan is None or loan[0] != loan_number:
+                continue                            # returned before it was overdue
+            self._overdue[item_id] = loan[1]
+            self._members[loan[1]].add_overdue_item(due_day)
+            newly_overdue.append(item_id)
+
+        if self._database is not None:
+            self._database.record_day(self._current_day,
+                                      [(item_id, self._members[self._overdue[item_id]]) for item_id in newly_overdue])
+
+    def get_current_day(self):
+        """Returns the number of days the library has been open"""
+        return self._current_day
+
+    def get_overdue_items(self):
+        """Returns the checked out items past their due day, as item id -> id of the patron who has it"""
+        return self._overdue
 
     def get_holdings(self):
         """Returns all items that belong to library"""
@@ -0,0 +1,39 @@
+# Author: Angela Montez
+# Github Username: almontez
+# Date: 10/18/2026
+# Description: Measures the memory each library item takes, with items kept as objects or in an ItemStore and
+#               with or without the search indexes. Run 'python LibraryBenchmark.py' for a table
+#               [see LibraryConcurrent.py for the throughput of many threads]
+
+import tracemalloc
+from Library import Library, Book, ItemStore, SEARCH_FIELDS
+
+
+def measure_item_memory(count=100000, item_store=False, search_indexes=True):
+    """Returns the bytes each item takes, measured with tracemalloc, when count books with their own titles
+       and one of 1000 authors are added to a Library [kept in an ItemStore if item_store is True]. Counts
+       the items, their fields, the holdings, and the search indexes unless search_indexes is False.
+       If tracemalloc is already tracing, it is left running for the caller"""
+    authors = ["Author %d" % number for number in range(1000)]
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        start_size = tracemalloc.get_traced_memory()[0]
+        library = Library(ItemStore() if item_store else None, SEARCH_FIELDS if search_indexes else ())
+        for number in range(count):
+            library.add_library_item(Book("b%d" % number, "Title %d" % number, authors[number % 1000]))
+        size = tracemalloc.get_traced_memory()[0] - start_size
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    del library
+    return size / count
+
+
+if __name__ == '__main__':
+    print("%-12s %-16s %14s" % ("items", "search indexes", "bytes/item"))
+    for item_store in (False, True):
+        for search_indexes in (True, False):
+            print("%-12s %-16s %14.0f" % ("ItemStore" if item_store else "objects", "yes" if search_indexes else "no",
+                                           measure_item_memory(item_store=item_store, search_indexes=search_indexes)))
@@ -0,0 +1,23 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for measuring the memory library items take
+
+import tracemalloc
+import unittest
+from LibraryBenchmark import measure_item_memory
+
+
+class TestMeasureItemMemory(unittest.TestCase):
+
+    def test_item_store_is_smaller(self):
+        self.assertLess(measure_item_memory(2000, item_store=True), measure_item_memory(2000))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_leaves_tracing_running(self):
+        tracemalloc.start()
+        try:
+            self.assertGreater(measure_item_memory(2000), 0)
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
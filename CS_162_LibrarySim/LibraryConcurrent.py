@@ -0,0 +1,257 @@
+# Author: Angela Montez
+# Github Username: almontez
+# Date: 10/18/2026
+# Description: A Library that many threads can use at once [Ex: behind a multi-threaded web server]. Each
+#               check out, return, request, cancel, and payment locks only the item and the patron it changes,
+#               picked from fixed sets of locks by id, so operations on unrelated items and patrons do not wait
+#               for each other. The date can move forward while circulation goes on
+
+import random
+import threading
+import time
+from heapq import heappop
+from Library import Library, Book, Album, Movie, Patron, SEARCH_FIELDS, STATUS_MESSAGES
+
+# locks in each set. Ids are spread over them by hash, so two ids share a lock only by chance
+DEFAULT_STRIPES = 64
+
+
+class ConcurrentLibrary(Library):
+    """Library whose methods are safe to call from several threads. Locks are always taken in the same order
+       [date, item, patron, loans] so threads cannot deadlock. Read a patron's fines with get_fine_amount here
+       rather than on the Patron while other threads are running, since reading them charges the days since
+       they were last read. Cannot be kept in a database [see LibraryDatabase], whose connection and lazily
+       loaded items belong to one thread"""
+
+    def __init__(self, item_store=None, search_fields=SEARCH_FIELDS, stripes=DEFAULT_STRIPES):
+        """Initializes ConcurrentLibrary fields"""
+        super().__init__(item_store, search_fields)
+        self._item_locks = [threading.Lock() for stripe in range(stripes)]
+        self._patron_locks = [threading.Lock() for stripe in range(stripes)]
+        self._loans_lock = threading.Lock()         # the loan count and the due-date heap
+        self._catalog_lock = threading.RLock()      # items and patrons being added, and the search indexes
+        self._date_lock = threading.Lock()          # one change of date at a time
+
+    def item_lock(self, item_id):
+        """Returns the lock that guards item id"""
+        return self._item_locks[hash(item_id) % len(self._item_locks)]
+
+    def patron_lock(self, patron_id):
+        """Returns the lock that guards patron id"""
+        return self._patron_locks[hash(patron_id) % len(self._patron_locks)]
+
+    # circulation: lock the item, then the patron. Locks are taken with acquire and release rather than with
+    # statements, which cost twice as much and would double the price of each operation
+
+    def check_out_status(self, patron_id, item_id, today=None):
+        # the day is read under the date lock, which comes before the item lock, and used for the item's date
+        # and the due day both. A loan made as the date moves on is found overdue at the next change of date,
+        # with its fine counted from its due day
+        if today is None:
+            self._date_lock.acquire()
+            today = self._current_day
+            self._date_lock.release()
+        item_lock = self.item_lock(item_id)
+        patron_lock = self.patron_lock(patron_id)
+        item_lock.acquire()
+        patron_lock.acquire()
+        try:
+            return super().check_out_status(patron_id, item_id, today)
+        finally:
+            patron_lock.release()
+            item_lock.release()
+
+    def add_loan(self, patron_id, library_item, today):
+        self._loans_lock.acquire()
+        try:
+            return super().add_loan(patron_id, library_item, today)
+        finally:
+            self._loans_lock.release()
+
+    def return_status(self, item_id):
+        item_lock = self.item_lock(item_id)
+        item_lock.acquire()
+        try:
+            # the item is locked, so the patron who has it cannot change before their lock is taken
+            item = self._holdings.get(item_id)
+            patron_lock = self.patron_lock(None if item is None else item.get_checked_out_by())
+            patron_lock.acquire()
+            try:
+                return super().return_status(item_id)
+            finally:
+                patron_lock.release()
+        finally:
+            item_lock.release()
+
+    def request_status(self, patron_id, item_id):
+        item_lock = self.item_lock(item_id)
+        patron_lock = self.patron_lock(patron_id)
+        item_lock.acquire()
+        patron_lock.acquire()
+        try:
+            return super().request_status(patron_id, item_id)
+        finally:
+            patron_lock.release()
+            item_lock.release()
+
+    def cancel_status(self, patron_id, item_id):
+        item_lock = self.item_lock(item_id)
+        patron_lock = self.patron_lock(patron_id)
+        item_lock.acquire()
+        patron_lock.acquire()
+        try:
+            return super().cancel_status(patron_id, item_id)
+        finally:
+            patron_lock.release()
+            item_lock.release()
+
+    def cancel_all_requests(self, patron_id):
+        patron = self._members.get(patron_id)
+        if patron is None:
+            return "patron not found"
+        with self.patron_lock(patron_id):
+            requested_items = patron.get_requested_items()
+        for item in requested_items:
+            self.cancel_request(patron_id, item.get_item_id())
+        return "cancel successful"
+
+    def pay_fine_status(self, patron_id, amount_paid):
+        patron_lock = self.patron_lock(patron_id)
+        patron_lock.acquire()
+        try:
+            return super().pay_fine_status(patron_id, amount_paid)
+        finally:
+            patron_lock.release()
+
+    def get_fine_amount(self, patron_id):
+        """Returns the fines a patron owes, or None if there is no such patron"""
+        patron = self._members.get(patron_id)
+        if patron is None:
+            return None
+        with self.patron_lock(patron_id):
+            return patron.get_fine_amount()
+
+    # the date
+
+    def increment_current_date(self):
+        with self._date_lock:
+            super().increment_current_date()
+
+    def advance_days(self, days):
+        with self._date_lock:
+            super().advance_days(days)
+
+    def start_overdue_fines(self):
+        """Moves every loan due before today into the overdue loans, as Library does, locking each loan's item
+           and patron while it is moved so a return at the same time either ends the loan first or sees it
+           overdue"""
+        while True:
+            with self._loans_lock:
+                if not self._due_dates or self._due_dates[0][0] >= self._current_day:
+                    return
+                due_day, loan_number, item_id = heappop(self._due_dates)
+
+            with self.item_lock(item_id):
+                loan = self._loans.get(item_id)
+                if loan is None or loan[0] != loan_number:
+                    continue                            # returned before it was overdue
+                with self.patron_lock(loan[1]):
+                    self._overdue[item_id] = loan[1]
+                    self._members[loan[1]].add_overdue_item(due_day)
+
+    # the catalog: adding items and patrons, and searching
+
+    def add_library_item(self, library_item):
+        with self._catalog_lock:
+            super().add_library_item(library_item)
+
+    def add_library_items(self, library_items, keep=True):
+        with self._catalog_lock:
+            super().add_library_items(library_items, keep)
+
+    def add_patron(self, patron):
+        with self._catalog_lock:
+            super().add_patron(patron)
+
+    def add_patrons(self, patrons, keep=True):
+        with self._catalog_lock:
+            super().add_patrons(patrons, keep)
+
+    def search_library_items(self, field, value):
+        with self._catalog_lock:
+            return super().search_library_items(field, value)
+
+    def search_library_items_by_prefix(self, field, prefix):
+        with self._catalog_lock:
+            return super().search_library_items_by_prefix(field, prefix)
+
+    def search_library_items_in_range(self, field, low, high):
+        with self._catalog_lock:
+            return super().search_library_items_in_range(field, low, high)
+
+
+def run_stress(library, threads, operations_per_thread, days=0, seed=0):
+    """Has threads threads each apply operations_per_thread random check outs, returns, requests, cancels, and
+       payments to the library's items and patrons, all at once, while one more thread moves the date forward
+       one day at a time, days times. Returns {"seconds": time taken, "operations_per_second": ...,
+       "counts": list of how many operations ended with each status code [see STATUS_MESSAGES]}"""
+    item_ids = list(library.get_holdings())
+    patron_ids = list(library.get_members())
+    rng = random.Random(seed)
+    batches = []
+    for thread in range(threads):
+        operations = []
+        for operation in range(operations_per_thread):
+            patron_id = rng.choice(patron_ids)
+            item_id = rng.choice(item_ids)
+            operations.append(rng.choice([("check out", patron_id, item_id), ("return", item_id),
+                                          ("request", patron_id, item_id), ("cancel", patron_id, item_id),
+                                          ("pay", patron_id, 1)]))
+        batches.append(operations)
+
+    results = [None] * threads
+    start = threading.Barrier(threads + 1)
+
+    def circulate(thread):
+        start.wait()
+        results[thread] = b"".join(library.apply_operations(batches[thread][first:first + 100])
+                                   for first in range(0, operations_per_thread, 100))
+
+    def move_date():
+        start.wait()
+        for day in range(days):
+            library.increment_current_date()
+
+    workers = [threading.Thread(target=circulate, args=(thread,)) for thread in range(threads)]
+    workers.append(threading.Thread(target=move_date))
+    began = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    seconds = time.perf_counter() - began
+
+    counts = [0] * len(STATUS_MESSAGES)
+    for codes in results:
+        for code in codes:
+            counts[code] += 1
+    return {"seconds": seconds, "operations_per_second": threads * operations_per_thread / seconds,
+            "counts": counts}
+
+
+def make_stress_library(items=10000, patrons=1000, stripes=DEFAULT_STRIPES):
+    """Returns a ConcurrentLibrary of books, albums, and movies and patrons for run_stress"""
+    library = ConcurrentLibrary(stripes=stripes)
+    library.add_library_items([(Book, Album, Movie)[number % 3]("i%d" % number, "Title %d" % number, "Maker")
+                               for number in range(items)])
+    library.add_patrons([Patron("p%d" % number, "Patron %d" % number) for number in range(patrons)])
+    return library
+
+
+if __name__ == '__main__':
+    # throughput at each thread count. Threads only run Python code side by side on a build without the
+    # global interpreter lock; with it, this shows what the locks cost rather than how they scale
+    print("%-8s %16s" % ("threads", "operations/sec"))
+    for thread_count in (1, 2, 4, 8, 16):
+        report = run_stress(make_stress_library(), thread_count, 200000 // thread_count, days=50)
+        print("%-8d %16.0f" % (thread_count, report["operations_per_second"]))
@@ -0,0 +1,112 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests and a stress test for the thread-safe Library
+
+import sys
+import threading
+import unittest
+from Library import Book, Patron, ItemStore, STATUS_MESSAGES, CHECK_OUT_SUCCESSFUL, RETURN_SUCCESSFUL
+from LibraryConcurrent import ConcurrentLibrary, run_stress, make_stress_library
+
+
+class TestConcurrentLibrary(unittest.TestCase):
+
+    def setUp(self):
+        # switch threads every few bytecodes rather than every 5 ms, so they interleave inside operations
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self._switch_interval)
+
+    def assert_consistent(self, lib):
+        """Every item and patron agree about who has what, and who is waiting for what"""
+        checked_out = {}
+        requested = {}
+        for item_id, item in lib.get_holdings().items():
+            if item.get_location() == "CHECKED_OUT":
+                checked_out[item_id] = item.get_checked_out_by()
+            else:
+                self.assertIsNone(item.get_checked_out_by())
+            holds = [item.get_requested_by()] + item.get_waiting_patrons()
+            if holds[0] is None:
+                self.assertEqual(holds, [None])
+                self.assertNotEqual(item.get_location(), "ON_HOLD_SHELF")
+            for patron_id in holds[holds[0] is None:]:
+                requested.setdefault(patron_id, set()).add(item_id)
+
+        for patron_id, patron in lib.get_members().items():
+            self.assertEqual({item.get_item_id() for item in patron.get_checked_out_items()},
+                             {item_id for item_id, holder in checked_out.items() if holder == patron_id})
+            self.assertEqual({item.get_item_id() for item in patron.get_requested_items()},
+                             requested.get(patron_id, set()))
+
+        for item_id, patron_id in lib.get_overdue_items().items():
+            item = lib.lookup_library_item_from_id(item_id)
+            self.assertEqual(checked_out.get(item_id), patron_id)
+            self.assertLess(item.get_date_checked_out() + item.get_check_out_length(), lib.get_current_day())
+
+        # and every item past its due day, counted from the day it went out, is overdue
+        for item_id in checked_out:
+            item = lib.lookup_library_item_from_id(item_id)
+            if item.get_date_checked_out() + item.get_check_out_length() < lib.get_current_day():
+                self.assertIn(item_id, lib.get_overdue_items())
+        return checked_out
+
+    def test_stress(self):
+        # few items and patrons, so threads keep landing on the same ones
+        for threads in (1, 2, 4, 8):
+            lib = make_stress_library(items=40, patrons=10, stripes=8)
+            report = run_stress(lib, threads, 3000, days=40, seed=threads)
+            counts = report["counts"]
+            self.assertEqual(sum(counts), threads * 3000)
+            self.assertEqual(lib.get_current_day(), 40)
+
+            # no check out or return was lost: what is out now is what went out less what came back
+            checked_out = self.assert_consistent(lib)
+            self.assertGreater(counts[CHECK_OUT_SUCCESSFUL], 0)
+            self.assertEqual(len(checked_out), counts[CHECK_OUT_SUCCESSFUL] - counts[RETURN_SUCCESSFUL])
+            self.assertGreater(report["operations_per_second"], 0)
+
+    def test_no_lost_payments(self):
+        lib = ConcurrentLibrary(ItemStore())
+        lib.add_patrons([Patron("p1", "Felicity"), Patron("p2", "Waldo")])
+        lib.add_library_item(Book("b1", "Dub", "A.P. Gumbs"))
+        lib.check_out_library_item("p1", "b1")
+
+        def pay():
+            for payment in range(2000):
+                lib.pay_fine("p1", 1)
+                lib.pay_fine("p2", 2)
+
+        def move_date():
+            for day in range(60):
+                lib.increment_current_date()
+                lib.get_fine_amount("p1")
+
+        threads = [threading.Thread(target=pay) for thread in range(6)] + [threading.Thread(target=move_date)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 39 days overdue at 10 cents a day, less every payment
+        self.assertAlmostEqual(lib.get_fine_amount("p1"), 3.90 - 12000)
+        self.assertEqual(lib.get_fine_amount("p2"), -24000)
+        self.assertIsNone(lib.get_fine_amount("nobody"))
+
+    def test_same_as_library(self):
+        lib = ConcurrentLibrary()
+        lib.add_library_item(Book("b1", "Dub", "A.P. Gumbs"))
+        lib.add_patron(Patron("p1", "Felicity"))
+        lib.add_patron(Patron("p2", "Waldo"))
+        self.assertEqual(lib.check_out_library_item("p1", "b1"), "check out successful")
+        self.assertEqual(lib.request_library_item("p2", "b1"), "request successful")
+        self.assertEqual(lib.return_library_item("b1"), "return successful")
+        self.assertEqual(lib.check_out_library_item("p1", "b1"), "item on hold by other patron")
+        self.assertEqual(lib.cancel_all_requests("p2"), "cancel successful")
+        self.assertEqual(lib.lookup_library_item_from_id("b1").get_location(), "ON_SHELF")
+        self.assertEqual([STATUS_MESSAGES[code] for code in lib.apply_operations([("return", "b9")])],
+                         ["item not found"])
+        self.assertEqual(lib.search_library_items("author", "a.p. gumbs"), [lib.lookup_library_item_from_id("b1")])
@@ -0,0 +1,436 @@
+# Author: Angela Montez
+# Github Username: almontez
+# Date: 10/18/2026
+# Description: Keeps a Library on disk in a SQLite database. Open the library with Library(database=...) and
+#               every check out, return, request, payment, and new day is written through as a few small rows
+#               the moment it happens, so nothing is lost if the program stops. Opening a large library is quick:
+#               only the loans are read up front, and each item or patron is read the first time it is looked up
+
+import sqlite3
+from Library import LibraryItem, Patron, SEARCH_FIELDS, STORED_KINDS
+
+# kinds of item the database holds, by their number in the items table. Books, albums, and movies keep the
+# numbers they have in an ItemStore [see STORED_KINDS]; a plain LibraryItem has no maker
+ITEM_KINDS = tuple(item_class for item_class, stored_class, maker_getter in STORED_KINDS) + (LibraryItem,)
+MAKER_GETTERS = tuple(maker_getter for item_class, stored_class, maker_getter in STORED_KINDS) + (None,)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (item_id TEXT PRIMARY KEY, kind INTEGER, title TEXT, maker TEXT,
+                                  title_key TEXT, maker_key TEXT, location TEXT, date_checked_out INTEGER);
+CREATE INDEX IF NOT EXISTS items_by_title ON items (title_key);
+CREATE INDEX IF NOT EXISTS items_by_maker ON items (kind, maker_key);
+CREATE TABLE IF NOT EXISTS patrons (patron_id TEXT PRIMARY KEY, name TEXT, fine_amount REAL,
+                                    overdue_items INTEGER, fines_charged_to INTEGER);
+CREATE TABLE IF NOT EXISTS loans (item_id TEXT PRIMARY KEY, patron_id TEXT, loan_number INTEGER,
+                                  due_day INTEGER, overdue INTEGER);
+CREATE INDEX IF NOT EXISTS loans_by_patron ON loans (patron_id, loan_number);
+CREATE TABLE IF NOT EXISTS holds (hold_number INTEGER PRIMARY KEY, item_id TEXT, patron_id TEXT);
+CREATE INDEX IF NOT EXISTS holds_by_item ON holds (item_id, hold_number);
+CREATE INDEX IF NOT EXISTS holds_by_patron ON holds (patron_id, hold_number);
+CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value INTEGER);
+"""
+
+
+class LibraryDatabase:
+    """A SQLite file holding a library's items, patrons, loans, holds, and date. Library calls the record_
+       methods after each change; the get_ methods hand a Library its lazily loaded holdings, members, and
+       search indexes when it is opened"""
+
+    def __init__(self, path, autocommit=True):
+        """Opens [or creates] the database at path [":memory:" for one that is not saved]. Each change is
+           committed as it is recorded unless autocommit is False, in which case call commit to save"""
+        self._connection = sqlite3.connect(path)
+        self._autocommit = autocommit
+        self._batch_autocommit = autocommit     # autocommit to go back to after a batch [see begin_batch]
+        self._connection.execute("PRAGMA journal_mode=WAL")         # a commit appends to the log file
+        self._connection.execute("PRAGMA synchronous=NORMAL")       # and only syncs it at checkpoints
+        self._connection.execute("PRAGMA cache_size=-65536")        # 64 MB of pages, for the search indexes
+        self._connection.executescript(SCHEMA)
+        self._connection.commit()
+        self._holdings = DatabaseHoldings(self)
+        self._members = None                    # made by get_members, which is handed the library's calendar
+
+    def get_connection(self):
+        """Returns the sqlite3 connection"""
+        return self._connection
+
+    def get_holdings(self):
+        """Returns the items as a mapping of item id -> item that reads each item on first use"""
+        return self._holdings
+
+    def get_members(self, calendar):
+        """Returns the patrons as a mapping of patron id -> patron that reads each patron on first use. calendar
+           is given to each patron read [see Patron.set_calendar]"""
+        self._members = DatabaseMembers(self, calendar)
+        return self._members
+
+    def get_search_index(self, field):
+        """Returns an index that searches the items table by field [see SEARCH_FIELDS]"""
+        return DatabaseIndex(self, field)
+
+    def load_loans(self):
+        """Returns (current day, loans made so far, loans) for Library.restore_loans"""
+        loans = self._connection.execute(
+            "SELECT item_id, loan_number, patron_id, due_day, overdue FROM loans ORDER BY loan_number").fetchall()
+        return self.get_state("current_day"), self.get_state("loan_count"), loans
+
+    def get_state(self, name):
+        """Returns the saved counter called name, or 0 if it has not been saved"""
+        row = self._connection.execute("SELECT value FROM state WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return 0
+        return row[0]
+
+    def set_state(self, name, value):
+        """Saves the counter called name"""
+        self._connection.execute("INSERT OR REPLACE INTO state (name, value) VALUES (?, ?)", (name, value))
+
+    def save_items(self, library_items):
+        """Writes the whole row for each item, adding the ones that are new"""
+        self._connection.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                     [item_row(library_item) for library_item in library_items])
+
+    def save_item_status(self, library_item):
+        """Writes an item's location and check out date"""
+        self._connection.execute("UPDATE items SET location = ?, date_checked_out = ? WHERE item_id = ?",
+                                 (library_item.get_location(), library_item.get_date_checked_out(),
+                                  library_item.get_item_id()))
+
+    def save_patrons(self, patrons):
+        """Writes the whole row for each patron, adding the ones who are new"""
+        self._connection.executemany("INSERT OR REPLACE INTO patrons VALUES (?, ?, ?, ?, ?)",
+                                     [(patron.get_patron_id(), patron.get_patron_name()) + patron.get_fine_record()
+                                      for patron in patrons])
+
+    def save_fines(self, patron):
+        """Writes a patron's fine fields"""
+        self._connection.execute(
+            "UPDATE patrons SET fine_amount = ?, overdue_items = ?, fines_charged_to = ? WHERE patron_id = ?",
+            patron.get_fine_record() + (patron.get_patron_id(),))
+
+    def remove_hold(self, item_id, patron_id):
+        """Deletes a patron's hold on an item"""
+        self._connection.execute("DELETE FROM holds WHERE item_id = ? AND patron_id = ?", (item_id, patron_id))
+
+    def record_check_out(self, library_item, patron_id, loan_number, due_day, was_requested):
+        """Records a check out: the loan [due_day is None for an item that is never overdue], the item's status,
+           and the patron's hold if they had one"""
+        item_id = library_item.get_item_id()
+        self._connection.execute("INSERT OR REPLACE INTO loans VALUES (?, ?, ?, ?, 0)",
+                                 (item_id, patron_id, loan_number, due_day))
+        if was_requested:
+            self.remove_hold(item_id, patron_id)
+        self.save_item_status(library_item)
+        self.set_state("loan_count", loan_number)
+        self.commit_if_auto()
+
+    def record_return(self, library_item, patron):
+        """Records a return: the loan ends, and the patron's fines stop growing"""
+        self._connection.execute("DELETE FROM loans WHERE item_id = ?", (library_item.get_item_id(),))
+        self.save_item_status(library_item)
+        self.save_fines(patron)
+        self.commit_if_auto()
+
+    def record_request(self, library_item, patron_id):
+        """Records a patron joining the end of the line for an item"""
+        self._connection.execute("INSERT INTO holds (item_id, patron_id) VALUES (?, ?)",
+                                 (library_item.get_item_id(), patron_id))
+        self.save_item_status(library_item)
+        self.commit_if_auto()
+
+    def record_cancel(self, library_item, patron_id):
+        """Records a patron leaving the line for an item"""
+        self.remove_hold(library_item.get_item_id(), patron_id)
+        self.save_item_status(library_item)
+        self.commit_if_auto()
+
+    def record_fines(self, patron):
+        """Records a change to a patron's fines"""
+        self.save_fines(patron)
+        self.commit_if_auto()
+
+    def record_day(self, current_day, newly_overdue):
+        """Records the new date and the loans that became overdue, given as (item id, patron who has it)"""
+        self.set_state("current_day", current_day)
+        for item_id, patron in newly_overdue:
+            self._connection.execute("UPDATE loans SET overdue = 1 WHERE item_id = ?", (item_id,))
+            self.save_fines(patron)
+        self.commit_if_auto()
+
+    def begin_batch(self):
+        """Holds back commits until end_batch, so a batch of changes is saved in one commit"""
+        self._batch_autocommit = self._autocommit
+        self._autocommit = False
+
+    def end_batch(self):
+        """Commits the changes since begin_batch if the database was opened with autocommit"""
+        self._autocommit = self._batch_autocommit
+        self.commit_if_auto()
+
+    def commit_if_auto(self):
+        """Commits if the database was opened with autocommit"""
+        if self._autocommit:
+            self._connection.commit()
+
+    def commit(self):
+        """Saves every change recorded since the last commit"""
+        self._connection.commit()
+
+    def compact(self):
+        """Gives back the space left by deleted rows and folds the write-ahead log into the database file.
+           SQLite reuses freed pages on its own, so this is only needed after many deletions"""
+        self._connection.commit()
+        self._connection.execute("VACUUM")
+        self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """Saves and closes the database"""
+        self._connection.commit()
+        self._connection.close()
+
+
+def item_row(library_item):
+    """Returns the items table row for an item"""
+    kind = item_kind(library_item)
+    maker = None
+    if MAKER_GETTERS[kind] is not None:
+        maker = getattr(library_item, MAKER_GETTERS[kind])()
+    title = library_item.get_title()
+    maker_key = None if maker is None else maker.casefold()
+    return (library_item.get_item_id(), kind, title, maker, title.casefold(), maker_key, library_item.get_location(),
+            library_item.get_date_checked_out())
+
+
+def item_kind(library_item):
+    """Returns the number of the item's kind in ITEM_KINDS"""
+    for kind, item_class in enumerate(ITEM_KINDS):
+        if isinstance(library_item, item_class):
+            return kind
+    raise ValueError("unknown kind of library item")
+
+
+class DatabaseHoldings:
+    """Mapping of item id -> item for Library, reading each item from the database the first time it is looked
+       up and keeping it after that. Storing an item writes its row"""
+
+    def __init__(self, database):
+        """Initializes DatabaseHoldings fields"""
+        self._database = database
+        self._connection = database.get_connection()
+        self._items = {}                # item id -> item read or stored so far
+
+    def __contains__(self, item_id):
+        if item_id in self._items:
+            return True
+        return self._connection.execute("SELECT 1 FROM items WHERE item_id = ?", (item_id,)).fetchone() is not None
+
+    def __getitem__(self, item_id):
+        library_item = self._items.get(item_id)
+        if library_item is None:
+            library_item = self._items[item_id] = self.read_item(item_id)
+        return library_item
+
+    def get(self, item_id, default=None):
+        if item_id not in self:
+            return default
+        return self[item_id]
+
+    def __setitem__(self, item_id, library_item):
+        self._items[item_id] = library_item
+        self._database.save_items([library_item])
+        self._database.commit_if_auto()
+
+    def update(self, pairs):
+        """Stores each item of a list of (item id, item) pairs and keeps them, writing all their rows in one
+           commit"""
+        pairs = list(pairs)
+        self.write(pairs)
+        self._items.update(pairs)
+
+    def write(self, pairs):
+        """Writes the rows of each item of a list of (item id, item) pairs in one commit without keeping the
+           items, so a large load does not fill memory; they are read back on first use like the rest"""
+        pairs = list(pairs)
+        for item_id, library_item in pairs:
+            self._items.pop(item_id, None)
+        self._database.save_items([library_item for item_id, library_item in pairs])
+        self._database.commit_if_auto()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def __iter__(self):
+        for (item_id,) in self._connection.execute("SELECT item_id FROM items ORDER BY rowid").fetchall():
+            yield item_id
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[item_id] for item_id in self]
+
+    def items(self):
+        return [(item_id, self[item_id]) for item_id in self]
+
+    def read_item(self, item_id):
+        """Helper method for __getitem__: Builds an item from its row, its loan, and its holds. Raises KeyError
+           if there is no such item"""
+        row = self._connection.execute(
+            "SELECT kind, title, maker, location, date_checked_out FROM items WHERE item_id = ?", (item_id,)).fetchone()
+        if row is None:
+            raise KeyError(item_id)
+        kind, title, maker, location, date_checked_out = row
+        if MAKER_GETTERS[kind] is None:
+            library_item = ITEM_KINDS[kind](item_id, title)
+        else:
+            library_item = ITEM_KINDS[kind](item_id, title, maker)
+        library_item.set_location(location)
+        library_item.set_date_checked_out(date_checked_out)
+
+        loan = self._connection.execute("SELECT patron_id FROM loans WHERE item_id = ?", (item_id,)).fetchone()
+        if loan is not None:
+            library_item.set_checked_out_by(loan[0])
+
+        # the first patron in line has the hold; the rest wait behind them
+        holds = self._connection.execute("SELECT patron_id FROM holds WHERE item_id = ? ORDER BY hold_number",
+                                         (item_id,)).fetchall()
+        for number, (patron_id,) in enumerate(holds):
+            if number == 0:
+                library_item.set_requested_by(patron_id)
+            else:
+                library_item.add_waiting_patron(patron_id)
+        return library_item
+
+
+class DatabaseMembers:
+    """Mapping of patron id -> patron for Library, reading each patron from the database the first time they
+       are looked up and keeping them after that. Storing a patron writes their row"""
+
+    def __init__(self, database, calendar):
+        """Initializes DatabaseMembers fields"""
+        self._database = database
+        self._connection = database.get_connection()
+        self._calendar = calendar
+        self._patrons = {}              # patron id -> patron read or stored so far
+
+    def __contains__(self, patron_id):
+        if patron_id in self._patrons:
+            return True
+        return self._connection.execute("SELECT 1 FROM patrons WHERE patron_id = ?",
+                                        (patron_id,)).fetchone() is not None
+
+    def __getitem__(self, patron_id):
+        patron = self._patrons.get(patron_id)
+        if patron is None:
+            patron = self.read_patron(patron_id)
+        return patron
+
+    def get(self, patron_id, default=None):
+        if patron_id not in self:
+            return default
+        return self[patron_id]
+
+    def __setitem__(self, patron_id, patron):
+        self._patrons[patron_id] = patron
+        self._database.save_patrons([patron])
+        self._database.commit_if_auto()
+
+    def update(self, pairs):
+        """Stores each patron of a list of (patron id, patron) pairs and keeps them, writing all their rows in
+           one commit"""
+        pairs = list(pairs)
+        self.write(pairs)
+        self._patrons.update(pairs)
+
+    def write(self, pairs):
+        """Writes the rows of each patron of a list of (patron id, patron) pairs in one commit without keeping
+           the patrons. Like DatabaseHoldings.write, they are read back on first use"""
+        pairs = list(pairs)
+        for patron_id, patron in pairs:
+            self._patrons.pop(patron_id, None)
+        self._database.save_patrons([patron for patron_id, patron in pairs])
+        self._database.commit_if_auto()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM patrons").fetchone()[0]
+
+    def __iter__(self):
+        for (patron_id,) in self._connection.execute("SELECT patron_id FROM patrons ORDER BY rowid").fetchall():
+            yield patron_id
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[patron_id] for patron_id in self]
+
+    def items(self):
+        return [(patron_id, self[patron_id]) for patron_id in self]
+
+    def read_patron(self, patron_id):
+        """Helper method for __getitem__: Builds a patron from their row, their loans, and their holds, and
+           keeps them. Raises KeyError if there is no such patron"""
+        row = self._connection.execute(
+            "SELECT name, fine_amount, overdue_items, fines_charged_to FROM patrons WHERE patron_id = ?",
+            (patron_id,)).fetchone()
+        if row is None:
+            raise KeyError(patron_id)
+        patron = self._patrons[patron_id] = Patron(patron_id, row[0])
+        patron.restore_fine_record(*row[1:])
+        patron.set_calendar(self._calendar)
+
+        holdings = self._database.get_holdings()
+        for (item_id,) in self._connection.execute(
+                "SELECT item_id FROM loans WHERE patron_id = ? ORDER BY loan_number", (patron_id,)).fetchall():
+            patron.add_library_item(holdings[item_id])
+        for (item_id,) in self._connection.execute(
+                "SELECT item_id FROM holds WHERE patron_id = ? ORDER BY hold_number", (patron_id,)).fetchall():
+            patron.add_requested_item(holdings[item_id])
+        return patron
+
+
+class DatabaseIndex:
+    """Stands in for a SearchIndex in a Library opened from a database, searching the items table's indexes.
+       Items are indexed when their rows are written, so adding and removing here does nothing"""
+
+    def __init__(self, database, field):
+        """Initializes DatabaseIndex fields"""
+        self._connection = database.get_connection()
+        if SEARCH_FIELDS[field] == "get_title":
+            self._column = "title_key"
+            self._kinds = ()
+        else:
+            self._column = "maker_key"
+            self._kinds = tuple(kind for kind, getter in enumerate(MAKER_GETTERS) if getter == SEARCH_FIELDS[field])
+
+    def add_library_item(self, value, library_item):
+        """Does nothing: the item's row already indexes it"""
+
+    def add_library_items(self, pairs):
+        """Does nothing: the items' rows already index them"""
+
+    def remove_library_item(self, value, library_item):
+        """Does nothing: the item's row already indexes it"""
+
+    def find_where(self, condition, values):
+        """Helper method for the find methods: Returns the ids of the items whose field meets condition, in order
+           of the field and then of when they were added"""
+        query = "SELECT item_id FROM items WHERE " + condition.format(column=self._column)
+        if self._kinds:
+            query += " AND kind IN (%s)" % ", ".join("?" * len(self._kinds))
+            values = tuple(values) + self._kinds
+        query += " ORDER BY %s, rowid" % self._column
+        return [item_id for (item_id,) in self._connection.execute(query, values).fetchall()]
+
+    def find(self, value):
+        """Returns a list of the ids of the items whose value matches"""
+        return self.find_where("{column} = ?", (value.casefold(),))
+
+    def find_prefix(self, prefix):
+        """Returns a list of the ids of the items whose value starts with prefix, in order of value"""
+        prefix = prefix.casefold()
+        return self.find_where("{column} >= ? AND {column} < ?", (prefix, prefix + chr(0x10FFFF)))
+
+    def find_range(self, low, high):
+        """Returns a list of the ids of the items with low <= value < high, in order of value"""
+        return self.find_where("{column} >= ? AND {column} < ?", (low.casefold(), high.casefold()))
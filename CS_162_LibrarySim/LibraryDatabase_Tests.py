@@ -0,0 +1,177 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for keeping a Library in a SQLite database
+
+import os
+import random
+import tempfile
+import unittest
+from Library import LibraryItem, Book, Album, Movie, Patron, Library, ItemStore, STATUS_MESSAGES
+from LibraryDatabase import LibraryDatabase
+
+
+def fill_library(lib):
+    """Adds the same items and patrons to any library"""
+    for n in range(30):
+        lib.add_library_item((Book, Album, Movie)[n % 3]("i%d" % n, "Title %d" % (n % 7), "Maker %d" % (n % 4)))
+    lib.add_library_item(LibraryItem("plain", "Title 1"))
+    for n in range(6):
+        lib.add_patron(Patron("p%d" % n, "Patron %d" % n))
+
+
+class TestLibraryDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, "library.db")
+        self._databases = []
+
+    def tearDown(self):
+        for database in self._databases:
+            database.close()
+        self._directory.cleanup()
+
+    def open_library(self):
+        database = LibraryDatabase(self._path)
+        self._databases.append(database)
+        return Library(database=database)
+
+    def assert_same_library(self, saved, expected):
+        self.assertEqual(saved.get_current_day(), expected.get_current_day())
+        self.assertEqual(saved.get_overdue_items(), expected.get_overdue_items())
+        for item_id, expected_item in expected.get_holdings().items():
+            item = saved.lookup_library_item_from_id(item_id)
+            self.assertEqual(type(item), type(expected_item))
+            self.assertEqual(item.get_location(), expected_item.get_location())
+            self.assertEqual(item.get_checked_out_by(), expected_item.get_checked_out_by())
+            self.assertEqual(item.get_requested_by(), expected_item.get_requested_by())
+            self.assertEqual(item.get_waiting_patrons(), expected_item.get_waiting_patrons())
+            self.assertEqual(item.get_date_checked_out(), expected_item.get_date_checked_out())
+        for patron_id, expected_patron in expected.get_members().items():
+            patron = saved.lookup_patron_from_id(patron_id)
+            self.assertEqual([item.get_item_id() for item in patron.get_checked_out_items()],
+                             [item.get_item_id() for item in expected_patron.get_checked_out_items()])
+            self.assertEqual([item.get_item_id() for item in patron.get_requested_items()],
+                             [item.get_item_id() for item in expected_patron.get_requested_items()])
+            self.assertAlmostEqual(patron.get_fine_amount(), expected_patron.get_fine_amount())
+
+    def test_reopened_library_matches(self):
+        rng = random.Random(22)
+        expected = Library()
+        saved = self.open_library()
+        fill_library(expected)
+        fill_library(saved)
+
+        def apply(lib, move, patron_id, item_id):
+            if move == "check out":
+                return lib.check_out_library_item(patron_id, item_id)
+            if move == "return":
+                return lib.return_library_item(item_id)
+            if move == "request":
+                return lib.request_library_item(patron_id, item_id)
+            if move == "cancel":
+                return lib.cancel_request(patron_id, item_id)
+            if move == "pay":
+                return lib.pay_fine(patron_id, 0.5)
+            if move == "day":
+                return lib.increment_current_date()
+            return lib.advance_days(9)
+
+        for step in range(600):
+            move = (rng.choice(("check out", "check out", "return", "request", "cancel", "pay", "day", "days")),
+                    "p%d" % rng.randrange(6), rng.choice(["i%d" % rng.randrange(30), "plain"]))
+            self.assertEqual(apply(saved, *move), apply(expected, *move))
+
+            if step % 50 == 49:
+                saved = self.open_library()
+                self.assert_same_library(saved, expected)
+
+    def test_lazy_loading(self):
+        lib = self.open_library()
+        fill_library(lib)
+        lib.check_out_library_item("p1", "i0")
+        lib.request_library_item("p2", "i0")
+
+        lib = self.open_library()
+        self.assertEqual(len(lib.get_holdings()), 31)
+        self.assertEqual(len(lib.get_members()), 6)
+        self.assertEqual(lib.get_overdue_items(), {})
+        self.assertEqual(lib.lookup_library_item_from_id("i0").get_checked_out_by(), "p1")
+        self.assertEqual(lib.lookup_patron_from_id("p2").get_requested_items()[0].get_item_id(), "i0")
+        self.assertIsNone(lib.lookup_library_item_from_id("missing"))
+        self.assertIs(lib.lookup_library_item_from_id("i0"), lib.lookup_library_item_from_id("i0"))
+
+        lib.advance_days(30)
+        lib = self.open_library()
+        self.assertEqual(lib.get_current_day(), 30)
+        self.assertEqual(lib.get_overdue_items(), {"i0": "p1"})
+        self.assertAlmostEqual(lib.lookup_patron_from_id("p1").get_fine_amount(), 0.9)
+
+    def test_search(self):
+        expected = Library()
+        saved = self.open_library()
+        fill_library(expected)
+        fill_library(saved)
+        saved = self.open_library()
+
+        def ids(items):
+            return [item.get_item_id() for item in items]
+
+        for field in ("title", "author", "artist", "director"):
+            self.assertEqual(ids(saved.search_library_items(field, "maker 1")),
+                             ids(expected.search_library_items(field, "maker 1")))
+            self.assertEqual(ids(saved.search_library_items(field, "TITLE 3")),
+                             ids(expected.search_library_items(field, "TITLE 3")))
+            self.assertEqual(ids(saved.search_library_items_by_prefix(field, "ma")),
+                             ids(expected.search_library_items_by_prefix(field, "ma")))
+            self.assertEqual(ids(saved.search_library_items_in_range(field, "Title 2", "title 5")),
+                             ids(expected.search_library_items_in_range(field, "Title 2", "title 5")))
+        self.assertEqual(len(saved.search_library_items("title", "title 1")), 6)
+
+    def test_compact_and_item_store(self):
+        lib = self.open_library()
+        fill_library(lib)
+        for n in range(30):
+            lib.check_out_library_item("p0", "i%d" % n)
+            lib.return_library_item("i%d" % n)
+        self._databases[-1].compact()
+        self.assertEqual(self.open_library().lookup_patron_from_id("p0").get_checked_out_items(), [])
+
+        with self.assertRaises(ValueError):
+            Library(ItemStore(), database=self._databases[-1])
+
+    def test_apply_operations(self):
+        lib = self.open_library()
+        fill_library(lib)
+        codes = lib.apply_operations([("check out", "p1", "i0"), ("request", "p2", "i0"), ("return", "i0"),
+                                      ("check out", "p1", "i0"), ("pay", "p3", 2)])
+        self.assertEqual([STATUS_MESSAGES[code] for code in codes],
+                         ["check out successful", "request successful", "return successful",
+                          "item on hold by other patron", "payment successful"])
+
+        lib = self.open_library()
+        self.assertEqual(lib.lookup_library_item_from_id("i0").get_location(), "ON_HOLD_SHELF")
+        self.assertEqual(lib.lookup_patron_from_id("p2").get_requested_items()[0].get_item_id(), "i0")
+        self.assertAlmostEqual(lib.lookup_patron_from_id("p3").get_fine_amount(), -2)
+
+    def test_batches_keep_objects(self):
+        lib = self.open_library()
+        book = Book("b1", "Dune", "Frank Herbert")
+        patron = Patron("p1", "Felicity")
+        lib.add_library_items([book])
+        lib.add_patrons([patron])
+        self.assertIs(lib.lookup_library_item_from_id("b1"), book)
+        self.assertIs(lib.lookup_patron_from_id("p1"), patron)
+        lib.check_out_library_item("p1", "b1")
+        self.assertEqual(book.get_location(), "CHECKED_OUT")
+        self.assertEqual(patron.get_checked_out_items(), [book])
+
+        # without keep, the rows are written and read back as new objects on first use
+        movie = Movie("m1", "Alien", "Ridley Scott")
+        lib.add_library_items([movie], keep=False)
+        lib.add_patrons([Patron("p2", "Waldo")], keep=False)
+        self.assertIsNot(lib.lookup_library_item_from_id("m1"), movie)
+        self.assertEqual(lib.lookup_library_item_from_id("m1").get_director(), "Ridley Scott")
+        self.assertEqual(lib.lookup_patron_from_id("p2").get_patron_name(), "Waldo")
+        self.assertEqual(self.open_library().lookup_library_item_from_id("b1").get_location(), "CHECKED_OUT")
@@ -0,0 +1,169 @@
+# Author: Angela Montez
+# Github Username: almontez
+# Date: 10/18/2026
+# Description: Loads items and patrons into a Library from CSV or JSON Lines files. Records are read one line
+#               at a time and added in batches [see Library.add_library_items], so only one batch is held at
+#               once. Records that cannot be loaded are counted and described in the report, and the load
+#               carries on with the next one
+
+import csv
+import json
+from operator import itemgetter
+from Library import LibraryItem, Book, Album, Movie, Patron
+
+# fields of each record. An item's maker is its author, artist, or director, and is left out for a plain item
+ITEM_FIELDS = ("kind", "item_id", "title", "maker")
+PATRON_FIELDS = ("patron_id", "name")
+
+# what an item record's kind can be, and the class it makes
+ITEM_KINDS = {"book": Book, "album": Album, "movie": Movie, "item": LibraryItem}
+
+
+def read_records(lines, fields, file_format="csv"):
+    """Yields (line number, tuple of the values of fields) for each record in lines [an open file or any
+       iterable of lines], or (line number, reason) as a string for a record that cannot be read.
+       A CSV file starts with a header naming its columns, which may come in any order. A JSON Lines file has
+       one object per line. Blank lines are skipped. Only an item's maker may be left out of a CSV header, for a
+       file of plain items. A CSV row the csv module cannot read [such as a field longer than
+       csv.field_size_limit] is reported and reading goes on with the next line"""
+    if file_format == "csv":
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        missing = [field for field in fields if field not in header and field != "maker"]
+        if missing:
+            raise ValueError("CSV header is missing " + ", ".join(missing))
+        # a file of plain items may leave out the maker column; each row then gets a maker of None at its end
+        width = len(header)
+        no_maker = "maker" in fields and "maker" not in header
+        pick = itemgetter(*[header.index(field) if field in header else width for field in fields])
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as error:
+                yield reader.line_num, "not valid CSV: " + str(error)
+                continue
+            if len(row) != width:
+                if row:
+                    yield reader.line_num, "wrong number of columns"
+                continue
+            if no_maker:
+                row.append(None)
+            yield reader.line_num, pick(row)
+
+    elif file_format == "jsonl":
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_number, "not valid JSON"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, "not a JSON object"
+            else:
+                yield line_number, tuple(record.get(field) for field in fields)
+
+    else:
+        raise ValueError("unknown file format " + repr(file_format))
+
+
+def make_item(kind, item_id, title, maker):
+    """Returns the item for a record, or the reason it cannot be made as a string"""
+    item_class = ITEM_KINDS.get(kind) if isinstance(kind, str) else None
+    if item_class is None:
+        return "unknown kind " + repr(kind)
+    if not item_id or not isinstance(item_id, str):
+        return "missing item_id"
+    if not isinstance(title, str):
+        return "missing title"
+    if item_class is LibraryItem:
+        return LibraryItem(item_id, title)
+    if not maker or not isinstance(maker, str):
+        return "missing maker"
+    return item_class(item_id, title, maker)
+
+
+def item_maker(holdings):
+    """Returns make_item for a load into holdings, turning down an item of a kind the holdings cannot keep
+       [an ItemStore keeps only books, albums, and movies] before it reaches the library"""
+    can_store = getattr(holdings, "can_store", None)
+    if can_store is None:
+        return make_item
+
+    def make(kind, item_id, title, maker):
+        made = make_item(kind, item_id, title, maker)
+        if not isinstance(made, str) and not can_store(made):
+            return "kind " + repr(kind) + " cannot be stored"
+        return made
+    return make
+
+
+def make_patron(patron_id, name):
+    """Returns the patron for a record, or the reason they cannot be made as a string"""
+    if not patron_id or not isinstance(patron_id, str):
+        return "missing patron_id"
+    if not isinstance(name, str):
+        return "missing name"
+    return Patron(patron_id, name)
+
+
+def ingest(records, make, id_position, add_batch, existing, batch_size, max_errors):
+    """Helper method for ingest_items and ingest_patrons: Makes an object from each record, skipping ids [the
+       record's value at id_position] already in existing or earlier in the file, and hands the objects to
+       add_batch batch_size at a time. Returns the report"""
+    report = {"loaded": 0, "rejected": 0, "errors": []}
+    batch = []
+    batch_ids = set()
+    for line_number, record in records:
+        made = record
+        if not isinstance(record, str):
+            made = make(*record)
+        if isinstance(made, str):
+            report["rejected"] += 1
+            if len(report["errors"]) < max_errors:
+                report["errors"].append((line_number, made))
+            continue
+
+        made_id = record[id_position]
+        if made_id in batch_ids or made_id in existing:
+            report["rejected"] += 1
+            if len(report["errors"]) < max_errors:
+                report["errors"].append((line_number, "duplicate id " + repr(made_id)))
+            continue
+        batch.append(made)
+        batch_ids.add(made_id)
+
+        if len(batch) >= batch_size:
+            add_batch(batch)
+            report["loaded"] += len(batch)
+            batch = []
+            batch_ids = set()
+
+    add_batch(batch)
+    report["loaded"] += len(batch)
+    return report
+
+
+def ingest_items(library, lines, file_format="csv", batch_size=10000, max_errors=100):
+    """Loads the item records in lines [see read_records and ITEM_FIELDS] into library. Returns a report
+       {"loaded": items added, "rejected": records skipped, "errors": [(line number, reason), ...]} listing the
+       first max_errors records skipped. An item whose id is already in the library is skipped. A library kept
+       in a database reads the items back from it as they are used rather than holding them all.
+       Nothing loaded can form a reference cycle, so for a very large file the caller may save about a third
+       of the time by pausing the cycle collector [gc.disable] around the load"""
+    return ingest(read_records(lines, ITEM_FIELDS, file_format), item_maker(library.get_holdings()), 1,
+                  lambda batch: library.add_library_items(batch, keep=False), library.get_holdings(), batch_size,
+                  max_errors)
+
+
+def ingest_patrons(library, lines, file_format="csv", batch_size=10000, max_errors=100):
+    """Loads the patron records in lines [see read_records and PATRON_FIELDS] into library. Returns a report
+       like ingest_items. A patron whose id is already a member is skipped"""
+    return ingest(read_records(lines, PATRON_FIELDS, file_format), make_patron, 0,
+                  lambda batch: library.add_patrons(batch, keep=False), library.get_members(), batch_size,
+                  max_errors)
@@ -0,0 +1,144 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for loading items and patrons into a Library from files
+
+import csv
+import io
+import json
+import unittest
+from Library import Book, Album, Movie, LibraryItem, Patron, Library, ItemStore
+from LibraryDatabase import LibraryDatabase
+from LibraryIngest import ingest_items, ingest_patrons
+
+
+ITEMS_CSV = """kind,item_id,title,maker
+book,b1,Dune,Frank Herbert
+album,a1,Blue,Joni Mitchell
+movie,m1,Alien,Ridley Scott
+magazine,z1,Time,Nobody
+book,b2,Emma
+item,x1,Plain,
+book,b1,Dune Again,Frank Herbert
+
+book,b3,"Dune, Messiah",Frank Herbert
+"""
+
+
+class TestIngest(unittest.TestCase):
+
+    def test_items_csv(self):
+        lib = Library()
+        lib.add_library_item(Book("a1", "Already", "Here"))
+        report = ingest_items(lib, io.StringIO(ITEMS_CSV), batch_size=2)
+        self.assertEqual((report["loaded"], report["rejected"]), (4, 4))
+        self.assertEqual(report["errors"], [(3, "duplicate id 'a1'"), (5, "unknown kind 'magazine'"),
+                                            (6, "wrong number of columns"), (8, "duplicate id 'b1'")])
+
+        self.assertEqual(lib.lookup_library_item_from_id("a1").get_title(), "Already")
+        self.assertEqual(type(lib.lookup_library_item_from_id("x1")), LibraryItem)
+        self.assertEqual(lib.lookup_library_item_from_id("m1").get_director(), "Ridley Scott")
+        self.assertEqual([item.get_item_id() for item in lib.search_library_items_by_prefix("title", "dune")],
+                         ["b1", "b3"])
+        self.assertEqual([item.get_item_id() for item in lib.search_library_items("author", "frank herbert")],
+                         ["b1", "b3"])
+
+    def test_items_jsonl(self):
+        lines = [json.dumps({"kind": "book", "item_id": "b1", "title": "Dune", "maker": "Frank Herbert"}),
+                 "{not json",
+                 "[1, 2]",
+                 json.dumps({"kind": "album", "item_id": 7, "title": "Blue", "maker": "Joni Mitchell"}),
+                 json.dumps({"kind": "album", "item_id": "a1", "maker": "Joni Mitchell"}),
+                 "",
+                 json.dumps({"kind": "item", "item_id": "x1", "title": "Plain"})]
+        lib = Library()
+        report = ingest_items(lib, (line + "\n" for line in lines), "jsonl", max_errors=2)
+        self.assertEqual(report["loaded"], 2)
+        self.assertEqual(report["rejected"], 4)
+        self.assertEqual(report["errors"], [(2, "not valid JSON"), (3, "not a JSON object")])
+        self.assertEqual(sorted(lib.get_holdings()), ["b1", "x1"])
+
+    def test_bad_values(self):
+        lines = [json.dumps({"kind": ["book"], "item_id": "b1", "title": "Dune", "maker": "Frank Herbert"}),
+                 json.dumps({"kind": {"book": 1}, "item_id": "b2", "title": "Dune", "maker": "Frank Herbert"}),
+                 json.dumps({"kind": "book", "item_id": ["b3"], "title": "Dune", "maker": "Frank Herbert"}),
+                 json.dumps({"kind": "book", "item_id": 4, "title": "Dune", "maker": "Frank Herbert"}),
+                 json.dumps({"kind": "book", "item_id": "b5", "title": "Dune", "maker": ""}),
+                 json.dumps({"kind": "book", "item_id": "b6", "title": "Dune", "maker": "Frank Herbert"})]
+        lib = Library()
+        report = ingest_items(lib, lines, "jsonl")
+        self.assertEqual((report["loaded"], report["rejected"]), (1, 5))
+        self.assertEqual(report["errors"], [(1, "unknown kind ['book']"), (2, "unknown kind {'book': 1}"),
+                                            (3, "missing item_id"), (4, "missing item_id"), (5, "missing maker")])
+        self.assertEqual(list(lib.get_holdings()), ["b6"])
+
+        report = ingest_items(lib, io.StringIO("kind,item_id,title,maker\nbook,b7,Emma,\n"))
+        self.assertEqual(report["errors"], [(2, "missing maker")])
+
+    def test_matches_one_at_a_time(self):
+        lines = ["kind,item_id,title,maker"] + ["%s,i%d,Title %d,Maker %d" % (("book", "album", "movie")[n % 3],
+                                                                             n, n % 50, n % 7) for n in range(500)]
+        loaded = Library()
+        ingest_items(loaded, lines, batch_size=64)
+        added = Library()
+        for line in lines[1:]:
+            kind, item_id, title, maker = line.split(",")
+            added.add_library_item({"book": Book, "album": Album, "movie": Movie}[kind](item_id, title, maker))
+        for field in ("title", "author", "artist", "director"):
+            self.assertEqual([item.get_item_id() for item in loaded.search_library_items_in_range(field, "m", "u")],
+                             [item.get_item_id() for item in added.search_library_items_in_range(field, "m", "u")])
+
+    def test_into_item_store(self):
+        lib = Library(ItemStore())
+        report = ingest_items(lib, io.StringIO(ITEMS_CSV), batch_size=3)
+        self.assertEqual((report["loaded"], report["rejected"]), (4, 4))
+        self.assertIn((7, "kind 'item' cannot be stored"), report["errors"])
+        self.assertEqual(sorted(lib.get_holdings()), ["a1", "b1", "b3", "m1"])
+        self.assertEqual([item.get_item_id() for item in lib.search_library_items("author", "frank herbert")],
+                         ["b1", "b3"])
+
+        # a batch the store turns down leaves the library as it was
+        with self.assertRaises(ValueError):
+            lib.add_library_items([Book("b4", "Persuasion", "Jane Austen"), LibraryItem("x2", "Plain")])
+        self.assertNotIn("b4", lib.get_holdings())
+        self.assertEqual(lib.search_library_items("title", "persuasion"), [])
+
+    def test_field_too_long(self):
+        long_title = "x" * (csv.field_size_limit() + 1)
+        lines = io.StringIO("kind,item_id,title,maker\nbook,b1,%s,Frank Herbert\nbook,b2,Emma,Jane Austen\n"
+                            % long_title)
+        lib = Library()
+        report = ingest_items(lib, lines)
+        self.assertEqual((report["loaded"], report["rejected"]), (1, 1))
+        self.assertEqual(report["errors"][0][0], 2)
+        self.assertTrue(report["errors"][0][1].startswith("not valid CSV"))
+        self.assertEqual(list(lib.get_holdings()), ["b2"])
+
+    def test_patrons(self):
+        lib = Library()
+        lib.add_patron(Patron("p1", "First"))
+        report = ingest_patrons(lib, io.StringIO("name,patron_id\nSecond,p2\nAgain,p1\nNo id,\nThird,p3\n"))
+        self.assertEqual((report["loaded"], report["rejected"]), (2, 2))
+        self.assertEqual(report["errors"], [(3, "duplicate id 'p1'"), (4, "missing patron_id")])
+        self.assertEqual(lib.lookup_patron_from_id("p3").get_patron_name(), "Third")
+
+        report = ingest_patrons(lib, ['{"patron_id": "p4", "name": "Fourth"}', '{"patron_id": "p5"}'], "jsonl")
+        self.assertEqual(report["errors"], [(2, "missing name")])
+        lib.advance_days(3)
+        self.assertEqual(lib.lookup_patron_from_id("p4").get_fine_amount(), 0)
+
+    def test_bad_files(self):
+        with self.assertRaises(ValueError):
+            ingest_items(Library(), io.StringIO("kind,title,maker\nbook,Dune,Frank Herbert\n"))
+        with self.assertRaises(ValueError):
+            ingest_items(Library(), io.StringIO(ITEMS_CSV), "xml")
+        self.assertEqual(ingest_items(Library(), io.StringIO(""))["loaded"], 0)
+
+    def test_into_database(self):
+        database = LibraryDatabase(":memory:")
+        lib = Library(database=database)
+        report = ingest_items(lib, io.StringIO(ITEMS_CSV), batch_size=3)
+        self.assertEqual((report["loaded"], report["rejected"]), (5, 3))
+        self.assertEqual(lib.lookup_library_item_from_id("b3").get_author(), "Frank Herbert")
+        self.assertEqual(len(lib.search_library_items("title", "DUNE")), 1)
+        database.close()
@@ -3,8 +3,10 @@
 # Date: 01/19/2022
 # Description: Unit Tests for Library Simulator
 
+import random
 import unittest
-from Library import LibraryItem, Book, Album, Movie, Patron, Library
+from Library import LibraryItem, Book, Album, Movie, Patron, Library, SearchIndex, HoldQueue, ItemStore, \
+    StoredBook, STATUS_MESSAGES, UNKNOWN_OPERATION, PATRON_NOT_FOUND, CHECK_OUT_SUCCESSFUL
 
 
 class TestLibraryItem(unittest.TestCase):
@@ -103,6 +105,22 @@ class TestPatron(unittest.TestCase):
         patron_items = patron1.get_checked_out_items()
         self.assertNotIn(book1, patron_items)
 
+    def test_checked_out_items_by_id(self):
+        patron1 = Patron("p1", "Angela")
+        books = [Book("b%d" % n, "book", "author") for n in range(1000)]
+        for book in books:
+            patron1.add_library_item(book)
+        for book in books[::2]:
+            patron1.remove_library_item(book)
+
+        self.assertEqual(patron1.get_checked_out_items(), books[1::2])
+        self.assertEqual(patron1.get_num_checked_out_items(), 500)
+        self.assertEqual(patron1.get_checked_out_item("b7"), books[7])
+        self.assertEqual(patron1.get_checked_out_item("b8"), None)
+
+        patron1.add_library_item(books[0])
+        self.assertEqual(patron1.get_checked_out_items()[-1], books[0])
+
     def test_fines(self):
         patron1 = Patron("p1", "Angela")
         amount_owed = patron1.get_fine_amount()
@@ -117,6 +135,157 @@ class TestPatron(unittest.TestCase):
         self.assertAlmostEqual(amount_owed, 0)
 
 
+class TestSearchIndex(unittest.TestCase):
+
+    def test_find(self):
+        index = SearchIndex()
+        book1 = Book("b1", "Dub", "A.P. Gumbs")
+        book2 = Book("b2", "dub", "Someone Else")
+        index.add_library_item("Dub", book1)
+        index.add_library_item("dub", book2)
+        self.assertEqual(index.find("DUB"), [book1, book2])
+        self.assertEqual(index.find("Du"), [])
+
+        index.remove_library_item("Dub", book1)
+        index.remove_library_item("Dub", book1)
+        self.assertEqual(index.find("dub"), [book2])
+
+    def test_prefix_and_range(self):
+        index = SearchIndex()
+        titles = ["Leaves of Grass", "Leaf Storm", "Beloved", "Lean In", "Le Petit Prince", "Moby Dick"]
+        for title in titles:
+            index.add_library_item(title, title)
+        self.assertEqual(index.find_prefix("lea"), ["Leaf Storm", "Lean In", "Leaves of Grass"])
+        self.assertEqual(index.find_prefix("Z"), [])
+        self.assertEqual(index.find_range("B", "Lean"), ["Beloved", "Le Petit Prince", "Leaf Storm"])
+
+        # values removed and added again between searches
+        index.remove_library_item("Lean In", "Lean In")
+        self.assertEqual(index.find_prefix("lea"), ["Leaf Storm", "Leaves of Grass"])
+        index.add_library_item("Lean In", "Lean In")
+        index.remove_library_item("Beloved", "Beloved")
+        index.add_library_item("Leaf", "Leaf")
+        self.assertEqual(index.find_prefix("lea"), ["Leaf", "Leaf Storm", "Lean In", "Leaves of Grass"])
+        self.assertEqual(index.get_sorted_keys(), sorted(set(index.get_sorted_keys())))
+        self.assertEqual(len(index.get_sorted_keys()), 6)
+
+
+class TestHoldQueue(unittest.TestCase):
+
+    def test_queue(self):
+        queue = HoldQueue()
+        self.assertEqual(queue.pop_first(), None)
+        for patron_id in ("p1", "p2", "p3", "p4"):
+            self.assertTrue(queue.add_patron(patron_id))
+        self.assertFalse(queue.add_patron("p2"))
+
+        self.assertTrue(queue.remove_patron("p3"))
+        self.assertFalse(queue.remove_patron("p3"))
+        self.assertEqual(queue.get_patrons(), ["p1", "p2", "p4"])
+        self.assertEqual(queue.pop_first(), "p1")
+        self.assertTrue(queue.remove_patron("p4"))
+        queue.add_patron("p1")
+        self.assertEqual(queue.get_patrons(), ["p2", "p1"])
+        self.assertEqual(queue.get_first(), "p2")
+        self.assertTrue(queue.has_patron("p1"))
+        self.assertEqual(queue.get_length(), 2)
+
+
+class TestItemStore(unittest.TestCase):
+
+    def test_compact_items(self):
+        book1 = Book("b1", "Leaves of Grass", "W.Whitman")
+        with self.assertRaises(AttributeError):
+            book1.nickname = "Leaves"
+        book1.set_location("".join(["CHECKED", "_OUT"]))
+        self.assertIs(book1.get_location(), "CHECKED_OUT")
+
+    def test_store_fields(self):
+        store = ItemStore()
+        book1 = Book("b1", "Leaves of Grass \u00e9", "W.Whitman")
+        book1.set_requested_by("p2")
+        book1.add_waiting_patron("p3")
+        store.add_library_item(book1)
+        store.add_library_item(Movie("m1", "Dune", "D.Villeneuve"))
+        self.assertEqual(store.get_num_items(), 2)
+        self.assertEqual(store.lookup_library_item_from_id("b3"), None)
+
+        stored = store["b1"]
+        self.assertIsInstance(stored, StoredBook)
+        self.assertEqual(stored, store.lookup_library_item_from_id("b1"))
+        self.assertEqual(stored.get_title(), "Leaves of Grass \u00e9")
+        self.assertEqual(stored.get_author(), "W.Whitman")
+        self.assertEqual(stored.get_check_out_length(), 21)
+        self.assertEqual(stored.get_requested_by(), "p2")
+        self.assertEqual(stored.get_waiting_patrons(), ["p3"])
+        self.assertEqual(store["m1"].get_director(), "D.Villeneuve")
+        self.assertEqual(store["m1"].get_check_out_length(), 7)
+
+        stored.set_location("CHECKED_OUT")
+        stored.set_checked_out_by("p1")
+        stored.set_date_checked_out(100)
+        self.assertEqual(store["b1"].get_location(), "CHECKED_OUT")
+        self.assertEqual(store["b1"].get_checked_out_by(), "p1")
+        self.assertEqual(store["b1"].get_date_checked_out(), 100)
+        self.assertEqual(store["m1"].get_date_checked_out(), None)
+        with self.assertRaises(ValueError):
+            stored.set_location("LOST")
+        with self.assertRaises(ValueError):
+            store.add_library_item(LibraryItem("x1", "plain"))
+
+        # replacing an item keeps its item number
+        store.add_library_item(Album("b1", "Lemonade", "Beyonce"))
+        self.assertEqual(store["b1"], stored)
+        self.assertEqual(store["b1"].get_artist(), "Beyonce")
+        self.assertEqual(store["b1"].get_location(), "ON_SHELF")
+        self.assertEqual(list(store), ["b1", "m1"])
+
+    def test_library_with_store(self):
+        rng = random.Random(21)
+        libraries = [Library(), Library(ItemStore())]
+        for lib in libraries:
+            for n in range(12):
+                lib.add_library_item((Book, Album, Movie)[n % 3]("i%d" % n, "Title %d" % n, "Maker %d" % (n % 4)))
+            for n in range(4):
+                lib.add_patron(Patron("p%d" % n, "patron"))
+
+        for step in range(400):
+            patron_id = "p%d" % rng.randrange(4)
+            item_id = "i%d" % rng.randrange(12)
+            move = rng.choice(("check out", "return", "request", "cancel", "day"))
+            results = []
+            for lib in libraries:
+                if move == "check out":
+                    results.append(lib.check_out_library_item(patron_id, item_id))
+                elif move == "return":
+                    results.append(lib.return_library_item(item_id))
+                elif move == "request":
+                    results.append(lib.request_library_item(patron_id, item_id))
+                elif move == "cancel":
+                    results.append(lib.cancel_request(patron_id, item_id))
+                else:
+                    results.append(lib.increment_current_date())
+            self.assertEqual(results[0], results[1])
+
+        plain, stored = libraries
+        for item_id in plain.get_holdings():
+            item = plain.lookup_library_item_from_id(item_id)
+            copy = stored.lookup_library_item_from_id(item_id)
+            self.assertEqual((item.get_location(), item.get_checked_out_by(), item.get_requested_by(),
+                              item.get_waiting_patrons(), item.get_date_checked_out()),
+                             (copy.get_location(), copy.get_checked_out_by(), copy.get_requested_by(),
+                              copy.get_waiting_patrons(), copy.get_date_checked_out()))
+        for patron_id in plain.get_members():
+            self.assertEqual(plain.lookup_patron_from_id(patron_id).get_fine_amount(),
+                             stored.lookup_patron_from_id(patron_id).get_fine_amount())
+            self.assertEqual([item.get_item_id() for item in
+                              plain.lookup_patron_from_id(patron_id).get_checked_out_items()],
+                             [item.get_item_id() for item in
+                              stored.lookup_patron_from_id(patron_id).get_checked_out_items()])
+        self.assertEqual([item.get_item_id() for item in stored.search_library_items_by_prefix("title", "title 1")],
+                         ["i1", "i10", "i11"])
+
+
 class TestLibrary(unittest.TestCase):
 
     def test_holdings(self):
@@ -137,6 +306,53 @@ class TestLibrary(unittest.TestCase):
         self.assertEqual(book1, lib.lookup_library_item_from_id('b1'))
         self.assertEqual(None, lib.lookup_library_item_from_id('b3'))
 
+    def test_search(self):
+        lib = Library()
+        book1 = Book("b1", "Leaves of Grass", "W.Whitman")
+        book2 = Book("b2", "Dub", "A.P. Gumbs")
+        album1 = Album("a1", "Lemonade", "Beyonce")
+        movie1 = Movie("m1", "Dune", "D.Villeneuve")
+        for item in (book1, book2, album1, movie1):
+            lib.add_library_item(item)
+
+        self.assertEqual(lib.search_library_items("title", "dune"), [movie1])
+        self.assertEqual(lib.search_library_items("author", "A.P. Gumbs"), [book2])
+        self.assertEqual(lib.search_library_items("artist", "Beyonce"), [album1])
+        self.assertEqual(lib.search_library_items("director", "Beyonce"), [])
+        self.assertEqual(lib.search_library_items("publisher", "x"), None)
+        self.assertEqual(lib.search_library_items_by_prefix("title", "Le"), [book1, album1])
+        self.assertEqual(lib.search_library_items_in_range("title", "D", "E"), [book2, movie1])
+
+        # replacing an item under the same id replaces it in the indexes
+        book3 = Book("b2", "Spill", "A.P. Gumbs")
+        lib.add_library_item(book3)
+        self.assertEqual(lib.search_library_items("title", "Dub"), [])
+        self.assertEqual(lib.search_library_items("author", "a.p. gumbs"), [book3])
+
+    def test_add_in_batches(self):
+        lib = Library()
+        lib.add_library_item(Book("b1", "Leaves of Grass", "W.Whitman"))
+        book1 = Book("b1", "Dub", "A.P. Gumbs")
+        movie1 = Movie("m1", "Dune", "D.Villeneuve")
+        movie2 = Movie("m1", "Dune Part Two", "D.Villeneuve")
+        album1 = Album("a1", "Lemonade", "Beyonce")
+        lib.add_library_items([book1, movie1, movie2, album1, LibraryItem("x1", "Dune")])
+
+        # later items under an id already in use replace the earlier ones, as add_library_item does
+        self.assertEqual(len(lib.get_holdings()), 4)
+        self.assertEqual(lib.search_library_items("title", "leaves of grass"), [])
+        self.assertEqual(lib.search_library_items_by_prefix("title", "du"), [book1, lib.get_holdings()["x1"], movie2])
+        self.assertEqual(lib.search_library_items("director", "d.villeneuve"), [movie2])
+        self.assertEqual(lib.search_library_items("artist", "beyonce"), [album1])
+
+        patron1 = Patron("p1", "Felicity")
+        lib.advance_days(5)
+        lib.add_patrons([patron1, Patron("p2", "Waldo")])
+        self.assertEqual(lib.lookup_patron_from_id("p1"), patron1)
+        lib.check_out_library_item("p1", "m1")
+        lib.advance_days(10)
+        self.assertAlmostEqual(patron1.get_fine_amount(), .30)
+
     def test_membership(self):
         lib = Library()
         patron1 = Patron("p1", "Angela")
@@ -241,7 +457,60 @@ class TestLibrary(unittest.TestCase):
         self.assertEqual(book1.get_location(), "ON_HOLD_SHELF")
 
         book2.set_requested_by('p2')
+        self.assertEqual(lib.request_library_item('p1', 'b2'), "request successful")
         self.assertEqual(lib.request_library_item('p1', 'b2'), "item already on hold")
+        self.assertEqual(lib.request_library_item('p1', 'b1'), "item already on hold")
+        self.assertEqual(book2.get_requested_by(), 'p2')
+        self.assertEqual(book2.get_waiting_patrons(), ['p1'])
+
+    def test_hold_queue_handoff(self):
+        lib = Library()
+        book1 = Book("b1", "Leaves of Grass", "W.Whitman")
+        lib.add_library_item(book1)
+        for patron_id in ("p1", "p2", "p3", "p4"):
+            lib.add_patron(Patron(patron_id, "patron"))
+
+        lib.check_out_library_item('p4', 'b1')
+        for patron_id in ("p1", "p2", "p3"):
+            self.assertEqual(lib.request_library_item(patron_id, 'b1'), "request successful")
+
+        # the item goes to the hold shelf for the first in line, then to each patron waiting in turn
+        lib.return_library_item('b1')
+        self.assertEqual(book1.get_location(), "ON_HOLD_SHELF")
+        self.assertEqual(lib.check_out_library_item('p2', 'b1'), "item on hold by other patron")
+        self.assertEqual(lib.check_out_library_item('p1', 'b1'), "check out successful")
+        self.assertEqual(book1.get_requested_by(), 'p2')
+        self.assertEqual(lib.lookup_patron_from_id('p1').get_requested_items(), [])
+
+        lib.return_library_item('b1')
+        self.assertEqual(lib.cancel_request('p2', 'b1'), "cancel successful")
+        self.assertEqual(book1.get_requested_by(), 'p3')
+        self.assertEqual(book1.get_location(), "ON_HOLD_SHELF")
+        self.assertEqual(lib.cancel_request('p3', 'b1'), "cancel successful")
+        self.assertEqual(book1.get_requested_by(), None)
+        self.assertEqual(book1.get_location(), "ON_SHELF")
+        self.assertEqual(lib.cancel_request('p3', 'b1'), "no request to cancel")
+
+    def test_cancel_all_requests(self):
+        lib = Library()
+        items = [Book("b%d" % n, "book", "author") for n in range(5)]
+        for item in items:
+            lib.add_library_item(item)
+        lib.add_patron(Patron("p1", "Angela"))
+        lib.add_patron(Patron("p2", "JoJo"))
+
+        for item in items[:3]:
+            lib.request_library_item('p2', item.get_item_id())
+        for item in items:
+            lib.request_library_item('p1', item.get_item_id())
+        self.assertEqual(lib.lookup_patron_from_id('p1').get_requested_items(), items)
+
+        self.assertEqual(lib.cancel_all_requests('p1'), "cancel successful")
+        self.assertEqual(lib.lookup_patron_from_id('p1').get_requested_items(), [])
+        self.assertEqual([item.get_requested_by() for item in items], ['p2', 'p2', 'p2', None, None])
+        self.assertEqual([item.get_location() for item in items], ["ON_HOLD_SHELF"] * 3 + ["ON_SHELF"] * 2)
+        self.assertEqual(items[0].get_waiting_patrons(), [])
+        self.assertEqual(lib.cancel_all_requests('p9'), "patron not found")
 
     def test_pay_fines(self):
         lib = Library()
@@ -286,3 +555,141 @@ class TestLibrary(unittest.TestCase):
         lib.pay_fine('p1', 7.20)
         self.assertAlmostEqual(patron1.get_fine_amount(), 0)
         # self.assertAlmostEqual(patron2.get_fine_amount(), 4.30)
+
+    def test_fines_match_daily_scan(self):
+        rng = random.Random(17)
+        lib = Library()
+        items = [Book("b%d" % n, "book", "author") for n in range(10)] + \
+                [Album("a%d" % n, "album", "artist") for n in range(10)] + \
+                [Movie("m%d" % n, "movie", "director") for n in range(10)]
+        patrons = [Patron("p%d" % n, "patron") for n in range(5)]
+        for item in items:
+            lib.add_library_item(item)
+        for patron in patrons:
+            lib.add_patron(patron)
+
+        # fines worked out the old way: every day, every checked out item
+        expected = {patron.get_patron_id(): 0 for patron in patrons}
+        for day in range(1, 200):
+            for move in range(rng.randint(0, 4)):
+                item = rng.choice(items)
+                if item.get_location() == "CHECKED_OUT":
+                    lib.return_library_item(item.get_item_id())
+                else:
+                    item.set_requested_by(None)
+                    lib.check_out_library_item(rng.choice(patrons).get_patron_id(), item.get_item_id())
+
+            lib.increment_current_date()
+            for patron in patrons:
+                for item in patron.get_checked_out_items():
+                    if lib.get_current_day() - item.get_date_checked_out() > item.get_check_out_length():
+                        expected[patron.get_patron_id()] += .10
+            self.assertEqual(sorted(lib.get_overdue_items()),
+                             sorted(item.get_item_id() for patron in patrons
+                                    for item in patron.get_checked_out_items()
+                                    if lib.get_current_day() - item.get_date_checked_out()
+                                    > item.get_check_out_length()))
+
+            if rng.random() < 0.2:
+                patron = rng.choice(patrons)
+                self.assertAlmostEqual(patron.get_fine_amount(), expected[patron.get_patron_id()])
+                lib.pay_fine(patron.get_patron_id(), 1)
+                expected[patron.get_patron_id()] -= 1
+
+        for patron in patrons:
+            self.assertAlmostEqual(patron.get_fine_amount(), expected[patron.get_patron_id()])
+
+    def test_advance_days(self):
+        def make_library():
+            lib = Library()
+            for n in range(20):
+                lib.add_library_item((Book, Album, Movie)[n % 3]("i%d" % n, "title", "maker"))
+            for n in range(4):
+                lib.add_patron(Patron("p%d" % n, "patron"))
+            return lib
+
+        rng = random.Random(18)
+        stepped = make_library()
+        jumped = make_library()
+        for week in range(40):
+            moves = [(rng.choice(("check out", "return")), "p%d" % rng.randrange(4), "i%d" % rng.randrange(20))
+                     for move in range(rng.randint(0, 6))]
+            for lib in (stepped, jumped):
+                for move, patron_id, item_id in moves:
+                    if move == "check out":
+                        lib.check_out_library_item(patron_id, item_id)
+                    else:
+                        lib.return_library_item(item_id)
+
+            days = rng.randint(0, 30)
+            for day in range(days):
+                stepped.increment_current_date()
+            jumped.advance_days(days)
+            self.assertEqual(jumped.get_current_day(), stepped.get_current_day())
+            self.assertEqual(jumped.get_overdue_items(), stepped.get_overdue_items())
+            if rng.random() < 0.3:
+                for n in range(4):
+                    self.assertEqual(jumped.lookup_patron_from_id("p%d" % n).get_fine_amount(),
+                                     stepped.lookup_patron_from_id("p%d" % n).get_fine_amount())
+
+        self.assertGreater(stepped.lookup_patron_from_id("p0").get_fine_amount(), 0)
+        for n in range(4):
+            self.assertEqual(jumped.lookup_patron_from_id("p%d" % n).get_fine_amount(),
+                             stepped.lookup_patron_from_id("p%d" % n).get_fine_amount())
+
+        jumped.advance_days(-3)
+        self.assertEqual(jumped.get_current_day(), stepped.get_current_day())
+
+    def test_apply_operations(self):
+        def make_library(stored):
+            lib = Library(ItemStore()) if stored else Library()
+            for n in range(20):
+                lib.add_library_item((Book, Album, Movie)[n % 3]("i%d" % n, "title", "maker"))
+            for n in range(4):
+                lib.add_patron(Patron("p%d" % n, "patron"))
+            return lib
+
+        rng = random.Random(24)
+        for stored in (False, True):
+            one_by_one = make_library(stored)
+            batched = make_library(stored)
+            for day in range(30):
+                operations = []
+                for n in range(rng.randint(0, 12)):
+                    patron_id = "p%d" % rng.randrange(5)
+                    item_id = "i%d" % rng.randrange(21)
+                    operations.append(rng.choice([("check out", patron_id, item_id), ("return", item_id),
+                                                  ("request", patron_id, item_id), ("cancel", patron_id, item_id),
+                                                  ("pay", patron_id, .25)]))
+                messages = []
+                for operation in operations:
+                    method = {"check out": one_by_one.check_out_library_item, "return": one_by_one.return_library_item,
+                              "request": one_by_one.request_library_item, "cancel": one_by_one.cancel_request,
+                              "pay": one_by_one.pay_fine}[operation[0]]
+                    messages.append(method(*operation[1:]))
+                codes = batched.apply_operations(operations)
+                self.assertEqual([STATUS_MESSAGES[code] for code in codes], messages)
+                one_by_one.increment_current_date()
+                batched.increment_current_date()
+
+            for n in range(20):
+                item = batched.lookup_library_item_from_id("i%d" % n)
+                expected = one_by_one.lookup_library_item_from_id("i%d" % n)
+                self.assertEqual((item.get_location(), item.get_checked_out_by(), item.get_requested_by(),
+                                  item.get_waiting_patrons()),
+                                 (expected.get_location(), expected.get_checked_out_by(), expected.get_requested_by(),
+                                  expected.get_waiting_patrons()))
+            for n in range(4):
+                self.assertAlmostEqual(batched.lookup_patron_from_id("p%d" % n).get_fine_amount(),
+                                       one_by_one.lookup_patron_from_id("p%d" % n).get_fine_amount())
+
+        self.assertEqual(Library().apply_operations([("renew", "i1"), ("pay", "p1", 1)]),
+                         bytes([UNKNOWN_OPERATION, PATRON_NOT_FOUND]))
+
+        # malformed operations get a code too, and the rest of the batch still runs
+        lib = Library()
+        lib.add_library_item(Book("b1", "Dune", "Frank Herbert"))
+        lib.add_patron(Patron("p1", "Felicity"))
+        self.assertEqual(lib.apply_operations([("return",), (), ("check out", "p1"), (["return"], "b1"),
+                                               ("return", "b1", "p1"), ("check out", "p1", "b1")]),
+                         bytes([UNKNOWN_OPERATION] * 5 + [CHECK_OUT_SUCCESSFUL]))
@@ -12,42 +12,231 @@
 #              A turn consists of a player firing a torpedo at their opponent's ship. The 'first' player goes first.
 #              Win Conditions: Player must sink all of opponent's ships.
 
-class MapKey:
-    """Represents a map legend or key for all x, y coordinates on the board. Critical part of program used in
-       all other classes. Example: {'A1': (0, 0), 'A2': (0, 1), 'A3': (0, 2),...}"""
-
-    def __init__(self):
-        """Constructs a dictionary with all the x,y coordinates on the board identified by their row/column headers"""
-        coord_dict = {}
+import struct
+from functools import lru_cache
+from time import perf_counter
+from types import MappingProxyType
+
+
+def _build_ray_masks(orientation):
+    """Returns a table of ship bitmasks for one orientation: table[length][square number] is the bitmask of
+       the squares a ship of that length covers with its head on that square, or None if it would run off
+       the board. Square number of (row, col) is row * 10 + col"""
+    step = 1            # value used when orientation = R
+    if orientation == 'C':
+        step = 10       # value used when orientation = C
+
+    table = []
+    for length in range(11):
+        masks = []
+        for index in range(100):
+            row, col = divmod(index, 10)
+            subtract_value = row
+            if orientation == 'R':
+                subtract_value = col
+            if 10 - subtract_value < length:
+                masks.append(None)
+            else:
+                masks.append(sum(1 << (index + step * pos) for pos in range(length)))
+        table.append(tuple(masks))
+
+    return tuple(table)
+
+
+# Lookup tables shared by every standard 10x10 Board, Ship, and ShipGame. Built once when the module is imported and
+# never modified, so no object needs a coordinate map of its own.
+ROW_LABELS = ('A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J')
+COLUMN_LABELS = ('1', '2', '3', '4', '5', '6', '7', '8', '9', '10')
+
+# square number -> row/column header [Ex: 0 -> 'A1', 99 -> 'J10']
+INDEX_COORD = tuple(letter + number for letter in ROW_LABELS for number in COLUMN_LABELS)
+
+# row/column header -> square number [Ex: 'A1' -> 0, 'J10' -> 99]
+COORD_INDEX = MappingProxyType({coord: index for index, coord in enumerate(INDEX_COORD)})
+
+# row/column header -> x,y coordinates [Ex: 'A1' -> (0, 0)]
+COORD_MAP = MappingProxyType({coord: divmod(index, 10) for index, coord in enumerate(INDEX_COORD)})
+
+# RAY_MASKS[orientation][length][square number] -> bitmask of ship squares, or None if ship does not fit
+RAY_MASKS = MappingProxyType({'R': _build_ray_masks('R'), 'C': _build_ray_masks('C')})
+
+# boards with at most this many squares get a header -> square number table; bigger ones parse headers
+_TABLE_LIMIT = 4096
+
+
+def row_label(row):
+    """Returns the header of a row: A - Z, then AA, AB,... AZ, BA,... [like spreadsheet columns]"""
+    label = ''
+    row += 1
+    while row:
+        row, letter = divmod(row - 1, 26)
+        label = chr(ord('A') + letter) + label
+    return label
+
+
+class BoardGeometry:
+    """Represents the size of a board and its labeling scheme. Rows are lettered A, B,... Z, AA, AB,... and
+       columns are numbered 1, 2, 3,... Square number of (row, col) is row * cols + col.
+       Holds no game state, so every board of the same size shares one [see get_geometry]"""
+
+    def __init__(self, rows, cols):
+        """Initialize BoardGeometry fields. Builds header -> square number and square number -> x,y coordinate
+           tables for small boards only"""
+        if rows < 1 or cols < 1:
+            raise ValueError('board must have at least one row and one column')
+        self._rows = rows
+        self._cols = cols
+
+        self._coord_index = None
+        if rows == 10 and cols == 10:
+            self._coord_index = COORD_INDEX
+        elif rows * cols <= _TABLE_LIMIT:
+            self._coord_index = {self.get_coord(index): index for index in range(rows * cols)}
+
+        self._positions = None
+        if rows * cols <= _TABLE_LIMIT:
+            self._positions = tuple(divmod(index, cols) for index in range(rows * cols))
+
+    def __reduce__(self):
+        """Pickles as the board size only; unpickling hands back the shared geometry for that size"""
+        return get_geometry, (self._rows, self._cols)
+
+    def get_rows(self):
+        """Returns the number of rows on the board"""
+        return self._rows
+
+    def get_cols(self):
+        """Returns the number of columns on the board"""
+        return self._cols
+
+    def get_index(self, coordinate):
+        """Returns the square number of a row/column header [Ex: 'B7'], or None if it is not on the board"""
+        if self._coord_index is not None:
+            if not isinstance(coordinate, str):
+                return None
+            return self._coord_index.get(coordinate)
+        return self.parse_coord(coordinate)
+
+    def parse_coord(self, coordinate):
+        """Works out the square number of a row/column header without a table. Returns None if the header is
+           not on the board. Accepts exactly the headers get_coord produces"""
+        if not isinstance(coordinate, str):
+            return None
+
+        # split row letters from column digits
+        split = 0
+        while split < len(coordinate) and 'A' <= coordinate[split] <= 'Z':
+            split += 1
+        digits = coordinate[split:]
+        if split == 0 or not digits.isascii() or not digits.isdigit() or digits[0] == '0':
+            return None
+
+        row = 0
+        for letter in coordinate[:split]:
+            row = row * 26 + ord(letter) - ord('A') + 1
+        row -= 1
+        col = int(digits) - 1
+        if row >= self._rows or col >= self._cols:
+            return None
+        return row * self._cols + col
+
+    def get_coord(self, index):
+        """Returns the row/column header of a square number [Ex: 0 -> 'A1']"""
+        row, col = divmod(index, self._cols)
+        return row_label(row) + str(col + 1)
+
+    def get_position(self, coordinate):
+        """Returns the x,y coordinates of a row/column header that is on the board [Ex: 'B7' -> (1, 6)]"""
+        return divmod(self.get_index(coordinate), self._cols)
+
+    def get_positions(self, squares):
+        """Returns a list of the x,y coordinates of square numbers [Ex: [0, 16] -> [(0, 0), (1, 6)]]"""
+        if self._positions is not None:
+            return list(map(self._positions.__getitem__, squares))
+        return [divmod(index, self._cols) for index in squares]
+
+    def get_ship_mask(self, index, length, orientation):
+        """Returns the bitmask of the squares covered by a ship of the given length with its head on square
+           `index`, or None if the ship would not fit [see ship_mask]"""
+        if self._coord_index is COORD_INDEX:
+            return ship_mask(index, length, orientation)
+
+        row, col = divmod(index, self._cols)
+        subtract_value = row                                # value used when orientation = C
+        space_available = self._rows
+        if orientation.upper() == 'R':
+            subtract_value = col                            # value used when orientation = R
+            space_available = self._cols
+        if length < 0 or space_available - subtract_value < length:
+            return None
+
+        if orientation.upper() == 'R':
+            return ((1 << length) - 1) << index
+        if orientation.upper() == 'C':
+            return sum(1 << (index + pos * self._cols) for pos in range(length))
+        return 1 << index       # Ship.build_ship stacks every piece on the head for any other orientation
+
+    def get_ship_squares(self, index, length, orientation):
+        """Returns a range of the square numbers covered by a ship of the given length with its head on square
+           `index`, or None if the ship would not fit. Same squares as get_ship_mask without building a
+           bitmask the size of the board"""
+        row, col = divmod(index, self._cols)
+        subtract_value = row                                # value used when orientation = C
+        space_available = self._rows
+        if orientation.upper() == 'R':
+            subtract_value = col                            # value used when orientation = R
+            space_available = self._cols
+        if length < 0 or space_available - subtract_value < length:
+            return None
+
+        if orientation.upper() == 'R':
+            return range(index, index + length)
+        if orientation.upper() == 'C':
+            return range(index, index + length * self._cols, self._cols)
+        return range(index, index + 1)      # Ship.build_ship stacks every piece on the head for any other orientation
+
+
+# board sizes whose BoardGeometry is kept; past this the least recently asked for size is dropped
+_GEOMETRY_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=_GEOMETRY_CACHE_SIZE)
+def get_geometry(rows, cols):
+    """Returns the shared BoardGeometry for a board size, creating it the first time it is asked for. Every
+       board of one size made while the size is in the cache shares a geometry"""
+    return BoardGeometry(rows, cols)
+
+
+# geometry of the standard 10x10 board
+STANDARD_GEOMETRY = get_geometry(10, 10)
 
-        letters = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J']
-        numbers = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10']
 
-        for row in range(10):
-            for col in range(10):
-                key = letters[row] + numbers[col]
-                coord_dict[key] = (row, col)
+class MapKey:
+    """Represents a map legend or key for all x, y coordinates on the board.
+       Example: {'A1': (0, 0), 'A2': (0, 1), 'A3': (0, 2),...}
+       Kept for callers that still want an object; the map itself is the shared COORD_MAP table"""
 
-        self._map_key = coord_dict
+    def __init__(self):
+        """Points at the shared read-only map of x,y coordinates [see COORD_MAP]"""
+        self._map_key = COORD_MAP
 
     def get_map(self):
-        """Returns a dictionary with all the x,y coordinates on the board identified by their row/column headers"""
+        """Returns a read-only mapping of all the x,y coordinates on the board identified by their row/column
+           headers"""
         return self._map_key
 
 
 class Board:
-    """Represents a 10x10 game board. Each player should have their own game board"""
+    """Represents a game board [10x10 unless given another BoardGeometry]. Each player should have their own
+       game board. Only squares that are not open water are stored, so memory and time per move depend on
+       the number of ships and torpedoes, not the size of the board"""
 
-    def __init__(self):
+    def __init__(self, geometry=STANDARD_GEOMETRY):
         """Creates a dictionary that represents the board"""
-        coord_status_dict = {}
-
-        for row in range(10):
-            for col in range(10):
-                coord_status_dict[(row, col)] = 'O'
-
-        self._board = coord_status_dict     # actual game board
-        self._coord_key = MapKey()          # from MapKey class: used in translating row/col input to x,y coord.
+        self._geometry = geometry
+        self._board = {}                    # actual game board: x,y coordinates -> 'X' or 'H'; missing = 'O'
+        self._ship_index = {}               # x,y coordinates of each ship piece -> id of the ship it belongs to
+        self._ship_count = 0                # number of ships added; next ship id
 
     def validate_fit(self, ship_size, ship_location, ship_orientation):
         """Checks if new ship will fit on board without overlapping any previously placed ships
@@ -58,21 +247,22 @@ class Board:
         ship_text = 'X'
 
         # get x,y coordinates of ship head
-        coord_map = self._coord_key.get_map()
-        start_coord = coord_map[ship_location]
+        start_coord = self._geometry.get_position(ship_location)
         row, col = start_coord
 
         # determine if ship fits on board at starting position
-        subtract_value = row         # value used when orientation = C
+        subtract_value = row                            # value used when orientation = C
+        space_available = self._geometry.get_rows()
         if ship_orientation.upper() == 'R':
-            subtract_value = col     # value used when orientation = R
-        space_available = 10 - subtract_value
+            subtract_value = col                        # value used when orientation = R
+            space_available = self._geometry.get_cols()
+        space_available -= subtract_value
         if space_available < ship_size:
             return False
 
         # determine if new ship will overlap with existing ships
         for pos in range(ship_size):
-            if self._board[(row, col)] == ship_text:
+            if self._board.get((row, col)) == ship_text:
                 return False
 
             # move to next coordinate based on orientation
@@ -84,16 +274,27 @@ class Board:
         return True
 
     def add_ship_to_board(self, ship):
-        """Updates player board by adding a ship. Called from within place_ship method of ShipGame class"""
+        """Updates player board by adding a ship. Returns the id given to the ship [ids count up from 0 in
+           placement order]. Called from within place_ship method of ShipGame class"""
         # ships represented as X on board
         ship_text = 'X'
 
         # list of ship pieces
         ship_pieces = ship.get_ship()
+        ship_id = self._ship_count
+        self._ship_count += 1
 
         # add ship pieces to board
         for coordinates in ship_pieces:
             self._board[coordinates] = ship_text
+            self._ship_index[coordinates] = ship_id
+
+        return ship_id
+
+    def get_ship_id(self, target):
+        """Returns the id of the ship with a piece on the target square, or None if there is no ship there"""
+        coordinate = self._geometry.get_position(target)
+        return self._ship_index.get(coordinate)
 
     def record_attack(self, target):
         """Updates opponent's board after a torpedo has been fired. Called from within fire_torpedo method of
@@ -105,11 +306,10 @@ class Board:
         ship_text = 'X'
 
         # get x,y coordinates of target
-        coord_map = self._coord_key.get_map()
-        coordinate = coord_map[target]
+        coordinate = self._geometry.get_position(target)
 
         # update board with a hit
-        if self._board[coordinate] == ship_text:
+        if self._board.get(coordinate) == ship_text:
             # torpedo hit a ship
             self._board[coordinate] = hit
             return True
@@ -118,39 +318,314 @@ class Board:
             self._board[coordinate] = hit
             return False
 
+    def get_square(self, row, col):
+        """Returns the symbol for a square: 'X' for ship, 'H' for fired upon, 'O' for open water"""
+        return self._board.get((row, col), 'O')
+
+    def restore_square(self, row, col, mark):
+        """Puts back the symbol a square had before a torpedo [see get_square]. Called from within
+           undo_torpedo method of ShipGame class"""
+        if mark == 'O':
+            self._board.pop((row, col), None)
+        else:
+            self._board[(row, col)] = mark
+
+    def get_fired_squares(self):
+        """Returns a sorted list of the square numbers that have been fired upon"""
+        cols = self._geometry.get_cols()
+        return sorted(row * cols + col for (row, col), mark in self._board.items() if mark == 'H')
+
+    def restore_fired_squares(self, squares):
+        """Marks square numbers as fired upon without any game logic. Used when loading a snapshot"""
+        self._board.update(dict.fromkeys(self._geometry.get_positions(squares), 'H'))
+
+    def get_row(self, row):
+        """Returns a list with a code for each square in a row: 'O' open water, 'X' ship, 'H' ship that has
+           been hit, 'M' open water that has been fired upon [shown as 'H' on the player's own view]"""
+        marks = self._board
+        codes = []
+        for col in range(self._geometry.get_cols()):
+            mark = marks.get((row, col), 'O')
+            if mark == 'H' and (row, col) not in self._ship_index:
+                mark = 'M'
+            codes.append(mark)
+        return codes
+
+    def get_geometry(self):
+        """Returns the BoardGeometry [size and labels] of the board"""
+        return self._geometry
+
+    def render_game_board(self, fog_of_war=False, ansi=False):
+        """Returns the game board as one string, laid out as print_game_board shows it [see render_board for
+           the fog_of_war and ansi options]"""
+        return render_board(self, fog_of_war, ansi)
+
+    def write_game_board(self, file, fog_of_war=False, ansi=False):
+        """Writes the game board to a file-like object in a single write"""
+        file.write(render_board(self, fog_of_war, ansi))
+
     def print_game_board(self):
         """Displays game board. Called from within view_player_board method of ShipGame class."""
-        let = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J']
-        num = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10']
+        print(render_board(self), end='')
+        return "Board Printed"
+
+
+class BitBoard:
+    """Represents a game board [10x10 unless given another BoardGeometry] stored as integer bitmasks. Bit
+       (row * cols + col) of each mask stands for the square at (row, col). Drop-in replacement for Board:
+       ShipGame uses it when created with bitboard=True. Masks grow with the board, so Board is the better
+       choice for very large boards"""
+
+    def __init__(self, geometry=STANDARD_GEOMETRY):
+        """Creates the empty bitmasks that represent the board"""
+        self._geometry = geometry
+        self._ships = 0                     # squares holding a ship piece ['X' on a Board]
+        self._hits = 0                      # ship squares that have been hit
+        self._misses = 0                    # empty squares that have been fired upon
+        self._ship_index = {}               # square number of each ship piece -> id of the ship it belongs to
+        self._ship_count = 0                # number of ships added; next ship id
+
+    def validate_fit(self, ship_size, ship_location, ship_orientation):
+        """Checks if new ship will fit on board without overlapping any previously placed ships
+           Returns True if ship will fit. Returns False is ship will not fit. Called within place_ship
+           method of ShipGame class"""
+        # determine if ship fits on board at starting position
+        index = self._geometry.get_index(ship_location)
+        mask = self._geometry.get_ship_mask(index, ship_size, ship_orientation)
+        if mask is None:
+            return False
+
+        # a single AND against the ship pieces not yet hit detects any overlap; as on a Board, a ship may
+        # go over a square that has been fired upon
+        return not self._ships & ~self._hits & mask
+
+    def add_ship_to_board(self, ship):
+        """Updates player board by adding a ship. Returns the id given to the ship [ids count up from 0 in
+           placement order]. Called from within place_ship method of ShipGame class"""
+        ship_id = self._ship_count
+        self._ship_count += 1
+        cols = self._geometry.get_cols()
+
+        mask = 0
+        for row, col in ship.get_ship():
+            mask |= 1 << (row * cols + col)
+            self._ship_index[row * cols + col] = ship_id
+
+        # a ship placed over a square that has been fired upon takes it over, as the Board does by writing
+        # over the square: it is a piece of the new ship that has not been hit
+        self._ships |= mask
+        self._hits &= ~mask
+        self._misses &= ~mask
+
+        return ship_id
+
+    def get_ship_id(self, target):
+        """Returns the id of the ship with a piece on the target square, or None if there is no ship there"""
+        return self._ship_index.get(self._geometry.get_index(target))
+
+    def record_attack(self, target):
+        """Updates opponent's board after a torpedo has been fired. Called from within fire_torpedo method of
+           ShipGame class"""
+        bit = 1 << self._geometry.get_index(target)
 
-        # print column headers [1 - 10]
-        print(end='       ')    # used to align column headers
-        for col in range(10):
-            print(num[col], end='      ')
-        print('\n')
+        # torpedo hit a ship piece that has not been hit before
+        if self._ships & bit and not self._hits & bit:
+            self._hits |= bit
+            return True
 
-        for row in range(10):
-            # print row headers [A - J]
-            print(let[row], end='      ')
+        # torpedo did not hit a ship
+        if not self._ships & bit:
+            self._misses |= bit
+        return False
+
+    def get_fired_squares(self):
+        """Returns a sorted list of the square numbers that have been fired upon"""
+        return squares_in_mask(self._hits | self._misses)
+
+    def restore_fired_squares(self, squares):
+        """Marks square numbers as fired upon without any game logic. Used when loading a snapshot"""
+        fired = 0
+        for index in squares:
+            fired |= 1 << index
+        self._hits |= fired & self._ships
+        self._misses |= fired & ~self._ships
+
+    def get_square(self, row, col):
+        """Returns the Board symbol for a square: 'X' for ship, 'H' for fired upon, 'O' for open water"""
+        bit = 1 << (row * self._geometry.get_cols() + col)
+        if (self._hits | self._misses) & bit:
+            return 'H'
+        if self._ships & bit:
+            return 'X'
+        return 'O'
+
+    def restore_square(self, row, col, mark):
+        """Puts back the symbol a square had before a torpedo [see get_square]. Called from within
+           undo_torpedo method of ShipGame class"""
+        bit = 1 << (row * self._geometry.get_cols() + col)
+        self._hits &= ~bit
+        self._misses &= ~bit
+        if mark == 'H':
+            if self._ships & bit:
+                self._hits |= bit
+            else:
+                self._misses |= bit
+
+    def get_row(self, row):
+        """Returns a list with a code for each square in a row: 'O' open water, 'X' ship, 'H' ship that has
+           been hit, 'M' open water that has been fired upon [shown as 'H' on the player's own view]"""
+        cols = self._geometry.get_cols()
+        shift = row * cols
+        row_mask = (1 << cols) - 1
+        ships = self._ships >> shift & row_mask
+        hits = self._hits >> shift & row_mask
+        misses = self._misses >> shift & row_mask
+
+        codes = []
+        for col in range(cols):
+            bit = 1 << col
+            if hits & bit:
+                codes.append('H')
+            elif misses & bit:
+                codes.append('M')
+            elif ships & bit:
+                codes.append('X')
+            else:
+                codes.append('O')
+        return codes
 
-            # print grid
-            for col in range(10):
-                print(self._board[row, col], end='      ')
-            print('\n')
+    def get_geometry(self):
+        """Returns the BoardGeometry [size and labels] of the board"""
+        return self._geometry
 
+    def render_game_board(self, fog_of_war=False, ansi=False):
+        """Returns the game board as one string, laid out as print_game_board shows it [see render_board for
+           the fog_of_war and ansi options]"""
+        return render_board(self, fog_of_war, ansi)
+
+    def write_game_board(self, file, fog_of_war=False, ansi=False):
+        """Writes the game board to a file-like object in a single write"""
+        file.write(render_board(self, fog_of_war, ansi))
+
+    def print_game_board(self):
+        """Displays game board. Called from within view_player_board method of ShipGame class."""
+        print(render_board(self), end='')
         return "Board Printed"
 
 
+def ship_mask(index, length, orientation):
+    """Returns the bitmask of the squares covered by a ship of the given length with its head on square
+       `index` of a 10x10 board, running along a row ('R') or down a column ('C'). Returns None if the ship
+       would not fit"""
+    if not 0 <= length <= 10:
+        return None
+
+    masks = RAY_MASKS.get(orientation.upper())
+    if masks is not None:
+        return masks[length][index]
+
+    # Ship.build_ship stacks every piece on the head for any other orientation
+    if 10 - index // 10 < length:
+        return None
+    return 1 << index
+
+
+# symbol shown for each square code [see Board.get_row]: to the player, and to the opponent [fog of war]
+_OWN_VIEW = {'O': 'O', 'X': 'X', 'H': 'H', 'M': 'H'}
+_FOG_OF_WAR_VIEW = {'O': 'O', 'X': 'O', 'H': 'H', 'M': 'M'}
+
+# terminal colors used when rendering with ansi=True
+_ANSI_COLORS = {'O': '\033[34m', 'X': '\033[37;1m', 'H': '\033[31;1m', 'M': '\033[33m'}
+_ANSI_RESET = '\033[0m'
+
+_CELL_GAP = '      '      # space after each header and square, as print_game_board has always shown it
+
+
+def render_board(board, fog_of_war=False, ansi=False):
+    """Builds the grid for a Board or BitBoard as a single string. fog_of_war=True shows the board as the
+       opponent sees it: ships that have not been hit are hidden and misses show as 'M'. ansi=True colors
+       each square with terminal escape codes"""
+    geometry = board.get_geometry()
+    view = _OWN_VIEW
+    if fog_of_war:
+        view = _FOG_OF_WAR_VIEW
+
+    # symbol [plus gap] for each square code
+    squares = {}
+    for code, symbol in view.items():
+        if ansi:
+            color = _ANSI_COLORS[code]
+            if symbol == 'O':
+                color = _ANSI_COLORS['O']       # hidden ships look like open water
+            symbol = color + symbol + _ANSI_RESET
+        squares[code] = symbol + _CELL_GAP
+
+    # column headers [1 - 10], then one line per row headed by its letters [A - J]
+    lines = ['       ' + ''.join(str(col + 1) + _CELL_GAP for col in range(geometry.get_cols())) + '\n\n']
+    for row in range(geometry.get_rows()):
+        lines.append(row_label(row) + _CELL_GAP + ''.join([squares[code] for code in board.get_row(row)]) + '\n\n')
+    return ''.join(lines)
+
+
+def random_fleet(ship_sizes, rng, geometry=STANDARD_GEOMETRY, max_attempts=100000):
+    """Returns a fleet picked uniformly at random from every legal way to lay out ships of the given sizes on
+       an empty board, as a list of (ship_size, ship_location, ship_orientation) ready for place_fleet.
+       Each ship gets a random placement that fits the board and the whole fleet is drawn again if two ships
+       overlap, so every legal fleet is equally likely. rng is a random.Random. Raises ValueError for a size
+       place_ship would reject, or if no legal fleet turns up in max_attempts draws"""
+    rows = geometry.get_rows()
+    cols = geometry.get_cols()
+    for ship_size in ship_sizes:
+        if ship_size < 2 or ship_size > max(rows, cols):
+            raise ValueError('ship size %r cannot be placed' % (ship_size,))
+
+    # placements that fit, counted rather than listed: every 'R' head in square order, then every 'C' head
+    across = [rows * max(cols - ship_size + 1, 0) for ship_size in ship_sizes]
+    down = [max(rows - ship_size + 1, 0) * cols for ship_size in ship_sizes]
+
+    # longest ships first: an overlap shows up after fewer draws
+    order = sorted(range(len(ship_sizes)), key=lambda ship: -ship_sizes[ship])
+    chosen = [None] * len(ship_sizes)
+    for attempt in range(max_attempts):
+        covered = set()
+        for ship in order:
+            pick = rng.randrange(across[ship] + down[ship])
+            if pick < across[ship]:
+                row, col = divmod(pick, cols - ship_sizes[ship] + 1)
+                orientation = 'R'
+            else:
+                row, col = divmod(pick - across[ship], cols)
+                orientation = 'C'
+            head = row * cols + col
+            squares = geometry.get_ship_squares(head, ship_sizes[ship], orientation)
+            if not covered.isdisjoint(squares):
+                break
+            covered.update(squares)
+            chosen[ship] = (head, orientation)
+        else:
+            return [(ship_size, geometry.get_coord(head), orientation)
+                    for ship_size, (head, orientation) in zip(ship_sizes, chosen)]
+
+    raise ValueError('no legal fleet found for ship sizes %r' % (list(ship_sizes),))
+
+
+def squares_in_mask(mask):
+    """Returns a sorted list of the square numbers whose bits are set in a bitmask"""
+    bits = bin(mask)[:1:-1]         # lowest bit first
+    return [index for index, bit in enumerate(bits) if bit == '1']
+
+
 class Ship:
     """Ship object with a size, location, and orientation"""
 
-    def __init__(self, ship_size, ship_location, ship_orientation):
+    def __init__(self, ship_size, ship_location, ship_orientation, geometry=STANDARD_GEOMETRY):
         """Construct Ship Object"""
+        self._geometry = geometry                # size and labels of the board the ship is placed on
         self._size = ship_size
         self._location = ship_location           # only reference head of ship [Ex: A1]; not all of ship
         self._orientation = ship_orientation     # R = Row[Horizontal], C = Column[Vertical]
-        self._map_key = MapKey()                 # from MapKey class: used in constructing ship
-        self._ship = self.build_ship()           # holds all coordinates that makes up ship
+        self._ship = dict.fromkeys(self.build_ship(), True)     # coordinates of pieces -> True if not yet hit
+        self._hits_remaining = ship_size         # hits needed to sink ship
 
     def build_ship(self):
         """Build ship: Add all coordinates of ship to ship list. Returns ship_pieces as a list to self._ship
@@ -158,31 +633,49 @@ class Ship:
         ship_pieces = []
 
         # get x,y coordinates of ship head
-        parts = self._map_key.get_map()
-        start_coordinates = parts[self._location]
+        start_coordinates = self._geometry.get_position(self._location)
 
         # determine loop count and variables
         length = self._size
         row, col = start_coordinates
 
+        # move to next coordinate based on orientation
+        row_step = 0
+        col_step = 0
+        if self._orientation.upper() == 'C':
+            row_step = 1
+        elif self._orientation.upper() == 'R':
+            col_step = 1
+
         # build ship of variable size given orientation
         for pos in range(length):
-            coordinates = (row, col)
-            ship_pieces.append(coordinates)
-
-            # move to next coordinate based on orientation
-            if self._orientation.upper() == 'C':
-                row += 1
-            elif self._orientation.upper() == 'R':
-                col += 1
+            ship_pieces.append((row + pos * row_step, col + pos * col_step))
 
         return ship_pieces
 
     def remove_ship_piece(self, target):
-        """Represents a ship piece being hit. Removes coordinate of ship from ship list.
+        """Represents a ship piece being hit. Removes coordinate of ship from ship pieces.
            Called from within update_player_ship method of ShipGame class"""
-        if target in self._ship:
-            self._ship.remove(target)
+        if self._ship.get(target):
+            self._ship[target] = False
+            self._hits_remaining -= 1
+
+    def remove_ship_pieces(self, targets):
+        """Removes every piece of the ship on a set of x,y coordinates. Called from within restore_position
+           method of ShipGame class"""
+        for target in targets.intersection(self._ship):
+            self.remove_ship_piece(target)
+
+    def restore_ship_piece(self, target):
+        """Undoes remove_ship_piece: the piece at target is no longer hit. Called from within undo_torpedo
+           method of ShipGame class"""
+        if self._ship.get(target) is False:
+            self._ship[target] = True
+            self._hits_remaining += 1
+
+    def get_hits_remaining(self):
+        """Returns the number of hits needed to sink the ship. Ship is sunk at zero"""
+        return self._hits_remaining
 
     def get_ship_size(self):
         """Returns the size/length of a player's ship"""
@@ -198,32 +691,102 @@ class Ship:
         return self._orientation
 
     def get_ship(self):
-        """Returns a list of all the coordinates of a ship"""
-        return self._ship
+        """Returns a list of all the coordinates of a ship that have not been hit"""
+        return [coordinates for coordinates, afloat in self._ship.items() if afloat]
+
+
+# snapshot layout [see ShipGame.save_snapshot]
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct('<BBBHH')      # version, flags, state, rows, cols
+_SNAPSHOT_SHIP = struct.Struct('<IHB')          # head square, size, orientation code
+_COUNT = struct.Struct('<I')
+_SNAPSHOT_MASK_LIMIT = 4096                     # biggest board whose fired squares are saved as a bitmask
+
+_STATE_CODES = ('UNFINISHED', 'FIRST_WON', 'SECOND_WON')
+_LAST_SHOT_CODES = (None, 'MISS', 'HIT', 'SUNK')
+_ORIENTATIONS = ('R', 'C', 'r', 'c', 'X')
+_ORIENTATION_CODES = {'R': 0, 'C': 1, 'r': 2, 'c': 3}
+_OTHER_ORIENTATION = 4                          # any other orientation acts the same, so it is saved as 'X'
+
+
+def restore_game(data):
+    """Returns a new ShipGame rebuilt from a snapshot made by ShipGame.save_snapshot"""
+    version, flags, state, rows, cols = _SNAPSHOT_HEADER.unpack_from(data)
+    if version != _SNAPSHOT_VERSION:
+        raise ValueError('unknown snapshot version %d' % version)
+    game = ShipGame(bool(flags & 1), rows, cols)
+    game.load_snapshot(data)
+    return game
 
 
 class ShipGame:
     """Simulates a simplified version of the game Battleship"""
 
-    def __init__(self):
-        """Initialize ShipGame data members"""
+    def __init__(self, bitboard=False, rows=10, cols=10):
+        """Initialize ShipGame data members. Boards are 10x10 unless rows/cols say otherwise [rows are
+           lettered A, B,... Z, AA, AB,...; columns are numbered from 1]. Pass bitboard=True to keep both
+           boards as integer bitmasks [see BitBoard class]; the public methods behave the same either way"""
         self._turn = 'first'
         self._state = 'UNFINISHED'              # states = 'FIRST_WON', 'SECOND_WON', 'UNFINISHED'
-
-        self._player1_board = Board()           # create player 1 board
-        self._player1_ships = []                # hold player 1 ship objects
-
-        self._player2_board = Board()           # create player 2 board
-        self._player2_ships = []                # hold player 2 ship objects
-
-        self._map_key = MapKey()                # from MapKey class: used in translating row/col input to x,y coord.
+        self._geometry = get_geometry(rows, cols)   # size and labeling scheme shared by both boards
+        self._bitboard = bitboard
+
+        board_class = Board
+        if bitboard:
+            board_class = BitBoard
+
+        self._player1_board = board_class(self._geometry)   # create player 1 board
+        self._player1_ships = {}                # hold player 1 ship objects that are still afloat by ship id
+        self._player1_fleet = []                # every ship player 1 placed, in ship id order
+
+        self._player2_board = board_class(self._geometry)   # create player 2 board
+        self._player2_ships = {}                # hold player 2 ship objects that are still afloat by ship id
+        self._player2_fleet = []                # every ship player 2 placed, in ship id order
+
+        self._last_shot_result = None           # 'MISS', 'HIT', or 'SUNK' for the last torpedo fired
+        self._history = []                      # one entry per torpedo fired: what undo_torpedo needs
+        self._journal = None                    # records every place_ship, fire_torpedo, and undo_torpedo call
+        self._game_id = 0                       # number this game goes by in the journal
+        self._instruments = None                # counts and times place_ship and fire_torpedo calls
+
+    def set_journal(self, journal, game_id=0):
+        """Records every place_ship, fire_torpedo, and undo_torpedo call from now on, accepted or not, by
+           calling journal.record_place(game_id, player, ship_size, ship_location, ship_orientation, accepted),
+           journal.record_fire(game_id, player, target, accepted), and journal.record_undo(game_id, accepted)
+           [see ShipGameJournal.MoveJournal]. Pass None to stop recording"""
+        self._journal = journal
+        self._game_id = game_id
+
+    def set_instruments(self, instruments):
+        """Times every place_ship and fire_torpedo call from now on and works out why each rejected one was
+           rejected, then calls instruments.record(method name, seconds, reason) with reason None for an
+           accepted call [see ShipGameInstruments.Instruments, and place_rejection and fire_rejection for the
+           reasons]. Several games may share one instruments. Pass None to stop; the only cost left is one
+           check per call"""
+        self._instruments = instruments
 
     def place_ship(self, player, ship_size, ship_location, ship_orientation):
         """Adds a ship of a given size and orientation to a specified location on the player's board"""
+        if self._instruments is None:
+            placed = self.add_ship(player, ship_size, ship_location, ship_orientation)
+        else:
+            start_time = perf_counter()
+            placed = self.add_ship(player, ship_size, ship_location, ship_orientation)
+            seconds = perf_counter() - start_time
+            reason = None
+            if not placed:
+                reason = self.place_rejection(player, ship_size, ship_location, ship_orientation)
+            self._instruments.record('place_ship', seconds, reason)
+        if self._journal is not None:
+            self._journal.record_place(self._game_id, player, ship_size, ship_location, ship_orientation, placed)
+        return placed
+
+    def add_ship(self, player, ship_size, ship_location, ship_orientation):
+        """Helper method for place_ship: Validates and adds the ship. Returns True if the ship was added"""
 
         # min size of ship is length 2
-        # max size of ship is length 10 [size of board]
-        if ship_size < 2 or ship_size > 10:
+        # max size of ship is the longer side of the board [10 on a standard board]
+        if ship_size < 2 or ship_size > max(self._geometry.get_rows(), self._geometry.get_cols()):
             return False
 
         # check coordinate is on map
@@ -234,24 +797,107 @@ class ShipGame:
         # set variables for player board and ship holdings
         board = self._player1_board
         ship_holdings = self._player1_ships
+        fleet = self._player1_fleet
         if player == 'second':
             board = self._player2_board
             ship_holdings = self._player2_ships
+            fleet = self._player2_fleet
 
         # validate ship will fit on board without overlaps
         is_valid = board.validate_fit(ship_size, ship_location, ship_orientation)
 
         # add ship to player's board and holdings
         if is_valid:
-            new_ship = Ship(ship_size, ship_location, ship_orientation)    # create ship
-            board.add_ship_to_board(new_ship)   # add ship to board
-            ship_holdings.append(new_ship)      # add ship to player's holdings
+            new_ship = Ship(ship_size, ship_location, ship_orientation, self._geometry)    # create ship
+            ship_id = board.add_ship_to_board(new_ship)     # add ship to board
+            ship_holdings[ship_id] = new_ship               # add ship to player's holdings
+            fleet.append(new_ship)
             return True
         else:
             return False
 
+    def place_rejection(self, player, ship_size, ship_location, ship_orientation):
+        """Returns why place_ship would reject a ship: 'bad size', 'bad coordinate', 'off board' [the ship
+           runs past the edge], or 'overlap' [it crosses a ship already placed]. Returns None if it would
+           be accepted"""
+        if ship_size < 2 or ship_size > max(self._geometry.get_rows(), self._geometry.get_cols()):
+            return 'bad size'
+        index = self._geometry.get_index(ship_location)
+        if index is None:
+            return 'bad coordinate'
+        if self._geometry.get_ship_squares(index, ship_size, ship_orientation) is None:
+            return 'off board'
+
+        board = self._player1_board
+        if player == 'second':
+            board = self._player2_board
+        if not board.validate_fit(ship_size, ship_location, ship_orientation):
+            return 'overlap'
+        return None
+
+    def place_fleet(self, player, specs):
+        """Adds a whole fleet to the player's board at once: specs is a list of (ship_size, ship_location,
+           ship_orientation). Every ship is added, or none are if place_ship would reject any of them [counting
+           the ships before it in specs]. Returns True if the fleet was added. See random_fleet"""
+        placed = self.add_fleet(player, specs)
+        if self._journal is not None:
+            for ship_size, ship_location, ship_orientation in specs:
+                self._journal.record_place(self._game_id, player, ship_size, ship_location, ship_orientation,
+                                           placed)
+        return placed
+
+    def add_fleet(self, player, specs):
+        """Helper method for place_fleet: Validates every ship before adding any"""
+        geometry = self._geometry
+        max_size = max(geometry.get_rows(), geometry.get_cols())
+
+        # set variables for player board and ship holdings
+        board = self._player1_board
+        ship_holdings = self._player1_ships
+        fleet = self._player1_fleet
+        if player == 'second':
+            board = self._player2_board
+            ship_holdings = self._player2_ships
+            fleet = self._player2_fleet
+
+        # each ship must fit the board and miss the ships before it in specs and any already on the board
+        covered = set()
+        for ship_size, ship_location, ship_orientation in specs:
+            if ship_size < 2 or ship_size > max_size or not self.valid_coord(ship_location):
+                return False
+            squares = geometry.get_ship_squares(geometry.get_index(ship_location), ship_size, ship_orientation)
+            if squares is None or not covered.isdisjoint(squares):
+                return False
+            if fleet and not board.validate_fit(ship_size, ship_location, ship_orientation):
+                return False
+            covered.update(squares)
+
+        # add ships to player's board and holdings
+        for ship_size, ship_location, ship_orientation in specs:
+            new_ship = Ship(ship_size, ship_location, ship_orientation, geometry)
+            ship_holdings[board.add_ship_to_board(new_ship)] = new_ship
+            fleet.append(new_ship)
+        return True
+
     def fire_torpedo(self, player, target):
         """Fires a torpedo at opponent's ship."""
+        if self._instruments is None:
+            fired = self.launch_torpedo(player, target)
+        else:
+            start_time = perf_counter()
+            fired = self.launch_torpedo(player, target)
+            seconds = perf_counter() - start_time
+            reason = None
+            if not fired:
+                reason = self.fire_rejection(player, target)
+            self._instruments.record('fire_torpedo', seconds, reason)
+        if self._journal is not None:
+            self._journal.record_fire(self._game_id, player, target, fired)
+        return fired
+
+    def launch_torpedo(self, player, target):
+        """Helper method for fire_torpedo: Validates the move and fires the torpedo. Returns True if the
+           torpedo was fired"""
 
         # confirm game has not already been won by a player
         if self._state != 'UNFINISHED':
@@ -271,38 +917,93 @@ class ShipGame:
         else:
             return False
 
+        # remember what the torpedo changes so it can be undone
+        row, col = self._geometry.get_position(target)
+        self._history.append((player, row, col, board.get_square(row, col), self._last_shot_result))
+
         # torpedo target: add hit to opponent's board
         is_hit = board.record_attack(target)
+        self._last_shot_result = 'MISS'
 
+        # remove hit ship part; only a sinking can end the game
         if is_hit:
-            # remove sunken ship parts from ship list
-            self.update_player_ships(target, holdings)
-
-        # remove sunken ships from opponent's holdings
-        for ship in holdings:
-            if not ship.get_ship():
-                holdings.remove(ship)
-
-            # check for win
-            self.check_for_win(player)
+            self._last_shot_result = 'HIT'
+            if self.update_player_ships(target, board, holdings):
+                self._last_shot_result = 'SUNK'
+                self.check_for_win(player)
 
         # update game turn
         self.update_turn(player)
         return True
 
-    def update_player_ships(self, target, holdings):
-        """Helper method for fire_torpedo: Updates pieces remaining of a player's ship after being hit"""
+    def fire_rejection(self, player, target):
+        """Returns why fire_torpedo would reject a torpedo: 'game over', 'wrong turn', or 'bad coordinate'
+           [checked in that order]. Returns None if it would be fired"""
+        if self._state != 'UNFINISHED':
+            return 'game over'
+        if not self.valid_move(player):
+            return 'wrong turn'
+        if not self.valid_coord(target):
+            return 'bad coordinate'
+        return None
+
+    def update_player_ships(self, target, board, holdings):
+        """Helper method for fire_torpedo: Updates pieces remaining of a player's ship after being hit.
+           Removes the ship from holdings and returns True if the hit sank it"""
         # get user input as x,y coordinates
-        coord_map = self._map_key.get_map()
-        target_coord = coord_map[target]
+        target_coord = self._geometry.get_position(target)
 
-        # set loop counter
-        size = len(holdings)
-        for idx in range(size):
-            for ship in holdings:
-                if target_coord in ship.get_ship():
-                    ship.remove_ship_piece(target_coord)
-                    return True
+        # board knows which ship sits on the target
+        ship_id = board.get_ship_id(target)
+        ship = holdings[ship_id]
+        ship.remove_ship_piece(target_coord)
+
+        # remove sunken ship from opponent's holdings
+        if ship.get_hits_remaining() == 0:
+            del holdings[ship_id]
+            return True
+        return False
+
+    def undo_torpedo(self):
+        """Takes back the last torpedo fired: restores the square, the ship piece and ship it hit, the turn,
+           and the game state. Returns False if there is no torpedo to take back. Lets a search try a move
+           with fire_torpedo and back out of it without copying the game"""
+        undone = self.take_back_torpedo()
+        if self._journal is not None:
+            self._journal.record_undo(self._game_id, undone)
+        return undone
+
+    def take_back_torpedo(self):
+        """Helper method for undo_torpedo: Takes back the last torpedo fired. Returns False if there is none"""
+        if not self._history:
+            return False
+        player, row, col, previous_mark, previous_result = self._history.pop()
+
+        # set variables for opponent's board, holdings, and fleet
+        board = self._player2_board
+        holdings = self._player2_ships
+        fleet = self._player2_fleet
+        if player == 'second':
+            board = self._player1_board
+            holdings = self._player1_ships
+            fleet = self._player1_fleet
+
+        # a ship square that had not been hit was hit by this torpedo: refloat the piece and its ship
+        if previous_mark == 'X':
+            ship_id = board.get_ship_id(self._geometry.get_coord(row * self._geometry.get_cols() + col))
+            ship = fleet[ship_id]
+            ship.restore_ship_piece((row, col))
+            holdings[ship_id] = ship
+
+        board.restore_square(row, col, previous_mark)
+        self._state = 'UNFINISHED'
+        self._turn = player
+        self._last_shot_result = previous_result
+        return True
+
+    def get_num_moves(self):
+        """Returns the number of torpedoes fired that can be taken back with undo_torpedo"""
+        return len(self._history)
 
     def check_for_win(self, player):
         """Helper function for fire_torpedo: Checks to see if all opponent's ships have been sunk"""
@@ -340,8 +1041,7 @@ class ShipGame:
 
     def valid_coord(self, coordinate):
         """Helper function for place_ship and fire_torpedo: Validates if coordinate is on board"""
-        coord_map = self._map_key.get_map()
-        if coordinate not in coord_map:
+        if self._geometry.get_index(coordinate) is None:
             return False
         return True
 
@@ -354,12 +1054,121 @@ class ShipGame:
 
         return len(player)
 
+    def get_board_size(self):
+        """Returns the size of each player's board as (rows, cols)"""
+        return self._geometry.get_rows(), self._geometry.get_cols()
+
+    def get_last_shot_result(self):
+        """Returns the result of the last torpedo fired: 'MISS', 'HIT', or 'SUNK' [hit that sank a ship].
+           Returns None if no torpedo has been fired"""
+        return self._last_shot_result
+
     def get_current_state(self):
         """Returns the current state of the game. Game states include: 'FIRST_WON', 'SECOND_WON', 'UNFINISHED'"""
         return self._state
 
-    def view_player_board(self, player):
-        """Returns the board of a specified player in grid form"""
+    def save_snapshot(self):
+        """Returns the whole game as a compact binary snapshot: board size, turn, state, every ship placed,
+           and the squares fired upon on each board. Load it with restore_game. Layout [little-endian]:
+           header (version, flags, state, rows, cols), then per player: ship count, (head square, size,
+           orientation) per ship in ship id order, and the fired squares as a bitmask [boards of up to
+           _SNAPSHOT_MASK_LIMIT squares] or as a count followed by square numbers"""
+        rows = self._geometry.get_rows()
+        cols = self._geometry.get_cols()
+        as_mask = rows * cols <= _SNAPSHOT_MASK_LIMIT
+
+        flags = _LAST_SHOT_CODES.index(self._last_shot_result) << 3
+        if self._bitboard:
+            flags |= 1
+        if self._turn == 'second':
+            flags |= 2
+        if not as_mask:
+            flags |= 4
+        parts = [_SNAPSHOT_HEADER.pack(_SNAPSHOT_VERSION, flags, _STATE_CODES.index(self._state), rows, cols)]
+
+        for board, fleet in ((self._player1_board, self._player1_fleet), (self._player2_board, self._player2_fleet)):
+            parts.append(_COUNT.pack(len(fleet)))
+            for ship in fleet:
+                orientation = _ORIENTATION_CODES.get(ship.get_ship_orientation(), _OTHER_ORIENTATION)
+                head = self._geometry.get_index(ship.get_ship_location())
+                parts.append(_SNAPSHOT_SHIP.pack(head, ship.get_ship_size(), orientation))
+
+            fired = board.get_fired_squares()
+            if as_mask:
+                mask = 0
+                for index in fired:
+                    mask |= 1 << index
+                parts.append(mask.to_bytes((rows * cols + 7) // 8, 'little'))
+            else:
+                parts.append(struct.pack('<I%dI' % len(fired), len(fired), *fired))
+
+        return b''.join(parts)
+
+    def load_snapshot(self, data):
+        """Rebuilds a game saved by save_snapshot into this newly created ShipGame [one made with the same
+           board size and board type; restore_game does this for you]"""
+        version, flags, state, rows, cols = _SNAPSHOT_HEADER.unpack_from(data)
+        offset = _SNAPSHOT_HEADER.size
+        area = rows * cols
+
+        turn = 'first'
+        if flags & 2:
+            turn = 'second'
+
+        fleets = []
+        fired_squares = []
+        for player in range(2):
+            num_ships = _COUNT.unpack_from(data, offset)[0]
+            offset += _COUNT.size
+            fleets.append([(head, size, _ORIENTATIONS[orientation]) for head, size, orientation in
+                           _SNAPSHOT_SHIP.iter_unpack(data[offset:offset + num_ships * _SNAPSHOT_SHIP.size])])
+            offset += num_ships * _SNAPSHOT_SHIP.size
+
+            if flags & 4:
+                num_fired = _COUNT.unpack_from(data, offset)[0]
+                fired_squares.append(struct.unpack_from('<%dI' % num_fired, data, offset + _COUNT.size))
+                offset += _COUNT.size * (num_fired + 1)
+            else:
+                size = (area + 7) // 8
+                fired_squares.append(squares_in_mask(int.from_bytes(data[offset:offset + size], 'little')))
+                offset += size
+
+        self.restore_position(turn, _STATE_CODES[state], _LAST_SHOT_CODES[flags >> 3], fleets, fired_squares)
+
+    def restore_position(self, turn, state, last_shot_result, fleets, fired):
+        """Sets up this newly created ShipGame from the parts of a game: fleets holds one list per player of
+           (head square, size, orientation) per ship in ship id order, and fired holds one list per player of
+           the square numbers fired upon on that player's board. Ships are placed without the place_ship
+           checks, and ship pieces on fired squares count as hit. Used by load_snapshot and by
+           ShipGameJournal replay"""
+        geometry = self._geometry
+        self._turn = turn
+        self._state = state
+        self._last_shot_result = last_shot_result
+
+        players = ((self._player1_board, self._player1_ships, self._player1_fleet),
+                   (self._player2_board, self._player2_ships, self._player2_fleet))
+        for (board, holdings, fleet), ships, squares in zip(players, fleets, fired):
+            # add ships to board in ship id order
+            for head, size, orientation in ships:
+                ship = Ship(size, geometry.get_coord(head), orientation, geometry)
+                holdings[board.add_ship_to_board(ship)] = ship
+                fleet.append(ship)
+
+            # mark fired squares
+            board.restore_fired_squares(squares)
+
+            # remove hit ship pieces and sunken ships
+            positions = set(geometry.get_positions(squares))
+            for ship_id, ship in enumerate(fleet):
+                ship.remove_ship_pieces(positions)
+                if ship.get_hits_remaining() == 0:
+                    del holdings[ship_id]
+
+    def view_player_board(self, player, as_text=False, fog_of_war=False, ansi=False):
+        """Displays the board of a specified player in grid form. Returns the text instead of printing it if
+           as_text is True. fog_of_war=True shows the board as the opponent sees it; ansi=True adds terminal
+           colors [see render_board]"""
 
         # set up variables based on player
         message = 'Player 1 Board: Grid View'
@@ -369,6 +1178,8 @@ class ShipGame:
             board = self._player2_board
 
         # display board
-        print(message)
-        board.print_game_board()
+        text = message + '\n' + board.render_game_board(fog_of_war, ansi)
+        if as_text:
+            return text
+        print(text, end='')
         return 'Board Printed'
@@ -0,0 +1,163 @@
+# Author: Angela Montez
+# Github username: almontez
+# Date: 10/18/2026
+# Description: Computer opponent for ShipGame that fires at the square with the highest probability density.
+#              The density of a square is the number of legal ship placements [placements Board.validate_fit
+#              would accept, given what the torpedoes have revealed] that cover it, weighted by how many
+#              ships of that length are still afloat and boosted for placements through unresolved hits.
+#
+#              The density is kept up to date after every torpedo by touching only the placements that pass
+#              through the square that was fired upon, instead of being recounted from scratch each turn.
+
+from ShipGame import INDEX_COORD, COORD_INDEX, RAY_MASKS
+
+
+def _build_placements():
+    """Lists every way a ship of length 2 - 10 fits on an empty board, using the RAY_MASKS table.
+       Returns (placements, covering): placements is a tuple of (length, squares) and covering[square] is a
+       tuple of the ids of every placement that covers that square"""
+    placements = []
+    covering = [[] for square in range(100)]
+
+    for orientation in ('R', 'C'):
+        for length in range(2, 11):
+            for mask in RAY_MASKS[orientation][length]:
+                if mask is None:
+                    continue
+                squares = tuple(square for square in range(100) if mask >> square & 1)
+                for square in squares:
+                    covering[square].append(len(placements))
+                placements.append((length, squares))
+
+    return tuple(placements), tuple(tuple(ids) for ids in covering)
+
+
+# every legal placement on an empty board, and the placements covering each square
+PLACEMENTS, COVERING = _build_placements()
+
+# length -> ids of every placement of that length
+BY_LENGTH = {length: tuple(placement_id for placement_id, placement in enumerate(PLACEMENTS)
+                           if placement[0] == length) for length in range(2, 11)}
+
+# extra weight given to a placement for each unresolved hit it passes through
+HIT_BONUS = 20
+
+# subtracted from a square's density once it has been fired upon, so it is never chosen again
+_FIRED = 10 ** 9
+
+
+class ProbabilityTargeting:
+    """Firing strategy: fires at the square with the highest placement-probability density.
+       Usable as a ShipGameTournament firing strategy [built with (rng, fleet)] or on its own through
+       play_turn"""
+
+    def __init__(self, rng, fleet):
+        """Builds the starting density for a fleet [a list of ship sizes] on an empty board"""
+        self._remaining = {}                        # length -> number of ships of that length still afloat
+        for ship_size in fleet:
+            self._remaining[ship_size] = self._remaining.get(ship_size, 0) + 1
+
+        self._blocked = bytearray(len(PLACEMENTS))  # 1 = placement can no longer hold a ship
+        self._hit_count = bytearray(len(PLACEMENTS))    # unresolved hits covered by each placement
+        self._hits = set()                          # squares hit but not yet known to belong to a sunk ship
+        self._density = [0] * 100
+
+        for placement_id, (length, squares) in enumerate(PLACEMENTS):
+            if length not in self._remaining:
+                self._blocked[placement_id] = 1
+                continue
+            for square in squares:
+                self._density[square] += self._remaining[length]
+
+        # squares in random order, so ties in density are broken randomly
+        self._order = list(range(100))
+        rng.shuffle(self._order)
+
+    def get_density(self, target):
+        """Returns the current density of a square [Ex: 'B7']. Squares already fired upon are negative"""
+        return self._density[COORD_INDEX[target]]
+
+    def choose_target(self):
+        """Returns the square with the highest density"""
+        return INDEX_COORD[max(self._order, key=self._density.__getitem__)]
+
+    def record_result(self, target, result):
+        """Updates the density after a torpedo: result is 'MISS', 'HIT', or 'SUNK'"""
+        square = COORD_INDEX[target]
+        if self._density[square] < 0:
+            return      # fired on this square before; nothing new was learned
+        self._density[square] -= _FIRED
+
+        if result == 'MISS':
+            self.block_square(square)
+            return
+
+        # every placement through a hit becomes more likely
+        self._hits.add(square)
+        density = self._density
+        for placement_id in COVERING[square]:
+            if self._blocked[placement_id]:
+                continue
+            length, squares = PLACEMENTS[placement_id]
+            self._hit_count[placement_id] += 1
+            bonus = self._remaining[length] * HIT_BONUS
+            for covered in squares:
+                density[covered] += bonus
+
+        if result == 'SUNK':
+            self.resolve_sunk_ship(square)
+
+    def block_square(self, square):
+        """Removes every placement through a square that cannot hold an unknown ship"""
+        density = self._density
+        for placement_id in COVERING[square]:
+            if self._blocked[placement_id]:
+                continue
+            self._blocked[placement_id] = 1
+            length, squares = PLACEMENTS[placement_id]
+            weight = self._remaining[length] * (1 + HIT_BONUS * self._hit_count[placement_id])
+            for covered in squares:
+                density[covered] -= weight
+
+    def resolve_sunk_ship(self, square):
+        """Works out which hit squares made up the ship sunk at square, removes them from play, and takes
+           one ship of that length out of the remaining fleet. Picks the longest run of hits through square
+           that matches a ship still afloat"""
+        sunk_length = 0
+        sunk_squares = (square,)
+        for placement_id in COVERING[square]:
+            length, squares = PLACEMENTS[placement_id]
+            if self._blocked[placement_id] or length <= sunk_length:
+                continue
+            if all(covered in self._hits for covered in squares):
+                sunk_length = length
+                sunk_squares = squares
+
+        for covered in sunk_squares:
+            self._hits.discard(covered)
+            self.block_square(covered)
+
+        if not sunk_length:
+            return
+
+        # one fewer ship of this length: scale down the weight of each placement that could hold one
+        self._remaining[sunk_length] -= 1
+        density = self._density
+        for placement_id in BY_LENGTH[sunk_length]:
+            if self._blocked[placement_id]:
+                continue
+            squares = PLACEMENTS[placement_id][1]
+            weight = 1 + HIT_BONUS * self._hit_count[placement_id]
+            for covered in squares:
+                density[covered] -= weight
+            if not self._remaining[sunk_length]:
+                self._blocked[placement_id] = 1
+
+    def play_turn(self, game, player):
+        """Fires this strategy's chosen torpedo for player in a ShipGame and records the result.
+           Returns the square fired upon, or None if the game rejected the move"""
+        target = self.choose_target()
+        if not game.fire_torpedo(player, target):
+            return None
+        self.record_result(target, game.get_last_shot_result())
+        return target
@@ -0,0 +1,82 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for the probability-density ShipGame opponent
+
+import random
+import unittest
+from ShipGame import ShipGame, Board, COORD_INDEX, INDEX_COORD
+from ShipGameAI import ProbabilityTargeting
+
+
+class TestProbabilityTargeting(unittest.TestCase):
+
+    def recount(self, fleet, misses):
+        """Density counted from scratch: placements validate_fit accepts once missed squares are blocked"""
+        board = Board()
+        for target in misses:
+            board.add_ship_to_board(_OneSquareShip(target))
+        density = {}
+        for coord in INDEX_COORD:
+            density[coord] = 0
+        for length in fleet:
+            for coord in INDEX_COORD:
+                row, col = divmod(COORD_INDEX[coord], 10)
+                if board.validate_fit(length, coord, 'R'):
+                    for pos in range(length):
+                        density[INDEX_COORD[row * 10 + col + pos]] += 1
+                if board.validate_fit(length, coord, 'C'):
+                    for pos in range(length):
+                        density[INDEX_COORD[(row + pos) * 10 + col]] += 1
+        return density
+
+    def test_starting_density(self):
+        ai = ProbabilityTargeting(random.Random(0), (5, 3, 3))
+        expected = self.recount((5, 3, 3), [])
+        for coord in INDEX_COORD:
+            self.assertEqual(ai.get_density(coord), expected[coord])
+        self.assertIn(ai.choose_target(), ('E5', 'E6', 'F5', 'F6'))
+
+    def test_incremental_misses(self):
+        ai = ProbabilityTargeting(random.Random(0), (4, 2))
+        misses = ['A1', 'C3', 'C5', 'J10', 'E5', 'E7']
+        for target in misses:
+            ai.record_result(target, 'MISS')
+
+        expected = self.recount((4, 2), misses)
+        for coord in INDEX_COORD:
+            if coord in misses:
+                self.assertLess(ai.get_density(coord), 0)
+            else:
+                self.assertEqual(ai.get_density(coord), expected[coord])
+
+    def test_targets_around_hit(self):
+        ai = ProbabilityTargeting(random.Random(0), (3,))
+        ai.record_result('E5', 'HIT')
+        self.assertIn(ai.choose_target(), ('D5', 'F5', 'E4', 'E6'))
+
+    def test_sinks_fleet(self):
+        for seed in range(20):
+            game = ShipGame()
+            game.place_ship('second', 5, 'B2', 'C')
+            game.place_ship('second', 3, 'H5', 'R')
+            game.place_ship('second', 2, 'A9', 'R')
+            ai = ProbabilityTargeting(random.Random(seed), (5, 3, 2))
+
+            shots = 0
+            while game.get_current_state() == 'UNFINISHED':
+                self.assertIsNotNone(ai.play_turn(game, 'first'))
+                game.fire_torpedo('second', 'A1')
+                shots += 1
+            self.assertEqual(game.get_current_state(), 'FIRST_WON')
+            self.assertLessEqual(shots, 100)
+
+
+class _OneSquareShip:
+    """Stand-in ship covering a single square, used to mark missed squares as unavailable"""
+
+    def __init__(self, target):
+        self._square = divmod(COORD_INDEX[target], 10)
+
+    def get_ship(self):
+        return [self._square]
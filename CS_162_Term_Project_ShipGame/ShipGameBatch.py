@@ -0,0 +1,217 @@
+# Author: Angela Montez
+# Github username: almontez
+# Date: 10/18/2026
+# Description: Vectorized engine that plays many games of ShipGame at once. Every game's boards are held in
+#              NumPy arrays of shape (N, 10, 10), so a single call places one ship or fires one torpedo in
+#              every game. Accepts and rejects moves by the same rules as ShipGame [see ShipGame.py] and
+#              produces the same hits, sinkings, and game states.
+#
+#              Requires NumPy.
+
+import numpy as np
+
+from ShipGame import COORD_INDEX
+
+# codes used in the state array
+UNFINISHED = 0
+FIRST_WON = 1
+SECOND_WON = 2
+STATE_NAMES = ('UNFINISHED', 'FIRST_WON', 'SECOND_WON')
+
+# ships each game has room for at first. A ship may be placed over the sunken pieces of others, so a game can
+# place more ships than its board has squares; the room doubles when it runs out
+SHIP_CAPACITY = 100
+
+_NO_SHIP = -1
+_OFFSETS = np.arange(10)
+
+
+def player_codes(players, num_games):
+    """Translates 'first'/'second' [a single string or one per game] to an array of player codes:
+       0 = first, 1 = second, -1 = anything else"""
+    players = np.broadcast_to(np.asarray(players), (num_games,))
+    codes = np.full(num_games, -1, dtype=np.int8)
+    codes[players == 'first'] = 0
+    codes[players == 'second'] = 1
+    return codes
+
+
+def coords_to_rows_cols(coordinates):
+    """Translates row/column headers [Ex: 'B7'] to arrays of rows and columns. Coordinates that are not on
+       the board come back as row = col = -1, which the engine rejects like ShipGame.valid_coord does"""
+    indexes = np.array([COORD_INDEX.get(coord, -1) for coord in coordinates], dtype=np.int16)
+    rows, cols = np.divmod(indexes, 10)
+    rows[indexes < 0] = -1
+    cols[indexes < 0] = -1
+    return rows, cols
+
+
+class BatchShipGame:
+    """Plays num_games independent games of ShipGame side by side. Boards are (N, 10, 10) arrays indexed
+       by [game, row, col]; every per-move input is an array with one entry per game"""
+
+    def __init__(self, num_games):
+        """Initialize all games to the state of a new ShipGame"""
+        self._num_games = num_games
+        self._games = np.arange(num_games)
+
+        # ship id on each square [-1 = open water], one array per player
+        self._ship_ids = [np.full((num_games, 10, 10), _NO_SHIP, dtype=np.int16) for player in range(2)]
+
+        # squares that have been fired upon, one array per player
+        self._fired = [np.zeros((num_games, 10, 10), dtype=bool) for player in range(2)]
+
+        # hits needed to sink each ship, indexed by [game, ship id]
+        self._hits_remaining = [np.zeros((num_games, SHIP_CAPACITY), dtype=np.int8) for player in range(2)]
+
+        self._ship_count = [np.zeros(num_games, dtype=np.int16) for player in range(2)]     # ships placed
+        self._ships_remaining = [np.zeros(num_games, dtype=np.int8) for player in range(2)]  # ships afloat
+
+        self._turn = np.zeros(num_games, dtype=np.int8)                 # 0 = first, 1 = second
+        self._state = np.full(num_games, UNFINISHED, dtype=np.int8)
+
+    def get_num_games(self):
+        """Returns the number of games being played"""
+        return self._num_games
+
+    def place_ships(self, players, ship_sizes, rows, cols, orientations, active=None):
+        """Places one ship in every game [or every game where active is True]. Players, sizes, head
+           rows/cols, and orientations ('R' or 'C') are given per game. Returns a bool array: True where the
+           ship was added, False where ShipGame.place_ship would have returned False"""
+        num = self._num_games
+        side = player_codes(players, num)
+        side[side < 0] = 0              # like ShipGame.place_ship, anything but 'second' is the first player
+        sizes = np.broadcast_to(np.asarray(ship_sizes), (num,)).astype(np.int16)
+        rows = np.broadcast_to(np.asarray(rows), (num,)).astype(np.int16)
+        cols = np.broadcast_to(np.asarray(cols), (num,)).astype(np.int16)
+        orientations = np.char.upper(np.broadcast_to(np.asarray(orientations, dtype=str), (num,)))
+
+        # step taken between ship pieces; Ship.build_ship stacks every piece on the head for other orientations
+        row_step = (orientations == 'C').astype(np.int16)
+        col_step = (orientations == 'R').astype(np.int16)
+
+        accepted = (sizes >= 2) & (sizes <= 10) & (rows >= 0) & (rows < 10) & (cols >= 0) & (cols < 10)
+        if active is not None:
+            accepted &= np.asarray(active, dtype=bool)
+
+        # determine if ship fits on board at starting position [same test as Board.validate_fit]
+        start = np.where(orientations == 'R', cols, rows)
+        accepted &= 10 - start >= sizes
+
+        # squares covered by each ship; pieces past the ship's length are masked out
+        is_piece = _OFFSETS[None, :] < sizes[:, None]
+        piece_rows = np.clip(rows[:, None] + _OFFSETS[None, :] * row_step[:, None], 0, 9)
+        piece_cols = np.clip(cols[:, None] + _OFFSETS[None, :] * col_step[:, None], 0, 9)
+        game_index = np.broadcast_to(self._games[:, None], piece_rows.shape)
+
+        for player in range(2):
+            placing = accepted & (side == player)
+            if not placing.any():
+                continue
+            ship_ids = self._ship_ids[player]
+            fired = self._fired[player]
+
+            # determine if new ship will overlap with existing ships; as with Board.validate_fit, only a ship
+            # piece that has not been fired upon is in the way
+            occupied = (ship_ids[game_index, piece_rows, piece_cols] != _NO_SHIP) & is_piece
+            occupied &= ~fired[game_index, piece_rows, piece_cols]
+            placing &= ~occupied.any(axis=1)
+            accepted[side == player] = placing[side == player]
+
+            # make room for more ships once a game has used it all up
+            new_ids = self._ship_count[player]
+            if placing.any() and new_ids[placing].max() >= self._hits_remaining[player].shape[1]:
+                self._hits_remaining[player] = np.concatenate(
+                    [self._hits_remaining[player], np.zeros_like(self._hits_remaining[player])], axis=1)
+
+            # add ship pieces to board and ship to player's holdings; a piece over a square that has been
+            # fired upon is a new piece that has not been hit, as Board writes 'X' over the 'H'
+            write = is_piece & placing[:, None]
+            ship_ids[game_index[write], piece_rows[write], piece_cols[write]] = \
+                np.broadcast_to(new_ids[:, None], write.shape)[write]
+            fired[game_index[write], piece_rows[write], piece_cols[write]] = False
+            games = self._games[placing]
+            self._hits_remaining[player][games, new_ids[placing]] = sizes[placing]
+            self._ship_count[player][placing] += 1
+            self._ships_remaining[player][placing] += 1
+
+        return accepted
+
+    def fire_torpedoes(self, players, rows, cols, active=None):
+        """Fires one torpedo in every game [or every game where active is True]. Returns three bool arrays:
+           accepted [ShipGame.fire_torpedo's return value], hit [a ship piece was struck], and sunk [the
+           hit sank its ship]. Updates turns and game states the same way ShipGame does"""
+        num = self._num_games
+        side = player_codes(players, num)
+        rows = np.broadcast_to(np.asarray(rows), (num,)).astype(np.int16)
+        cols = np.broadcast_to(np.asarray(cols), (num,)).astype(np.int16)
+
+        # game unfinished, correct player turn, coordinate on board
+        accepted = (self._state == UNFINISHED) & (side == self._turn)
+        accepted &= (rows >= 0) & (rows < 10) & (cols >= 0) & (cols < 10)
+        if active is not None:
+            accepted &= np.asarray(active, dtype=bool)
+
+        hit = np.zeros(num, dtype=bool)
+        sunk = np.zeros(num, dtype=bool)
+
+        for player in range(2):
+            firing = self._games[accepted & (side == player)]
+            if firing.size == 0:
+                continue
+            opponent = 1 - player
+            target_rows = rows[firing]
+            target_cols = cols[firing]
+
+            # torpedo target: a hit needs a ship piece that has not been fired upon
+            ship_id = self._ship_ids[opponent][firing, target_rows, target_cols]
+            is_hit = (ship_id != _NO_SHIP) & ~self._fired[opponent][firing, target_rows, target_cols]
+            self._fired[opponent][firing, target_rows, target_cols] = True
+
+            # remove hit ship part; only a sinking can end the game
+            hit_games = firing[is_hit]
+            hit_ids = ship_id[is_hit]
+            self._hits_remaining[opponent][hit_games, hit_ids] -= 1
+            is_sunk = self._hits_remaining[opponent][hit_games, hit_ids] == 0
+            sunk_games = hit_games[is_sunk]
+            self._ships_remaining[opponent][sunk_games] -= 1
+
+            won = sunk_games[self._ships_remaining[opponent][sunk_games] == 0]
+            self._state[won] = FIRST_WON + player
+
+            hit[hit_games] = True
+            sunk[sunk_games] = True
+
+        # update game turn
+        self._turn[accepted] = 1 - self._turn[accepted]
+        return accepted, hit, sunk
+
+    def get_current_states(self):
+        """Returns an array of state codes [UNFINISHED, FIRST_WON, SECOND_WON], one per game"""
+        return self._state.copy()
+
+    def get_current_state_names(self):
+        """Returns the state of every game as ShipGame.get_current_state would spell it"""
+        return [STATE_NAMES[state] for state in self._state]
+
+    def get_turns(self):
+        """Returns an array of the player whose turn it is in each game: 0 = first, 1 = second"""
+        return self._turn.copy()
+
+    def get_num_ships_remaining(self, player):
+        """Returns an array of the number of ships a player ['first' or 'second'] has remaining in each game"""
+        if player.lower() == 'second':
+            return self._ships_remaining[1].copy()
+        return self._ships_remaining[0].copy()
+
+    def get_ship_ids(self, player):
+        """Returns a copy of a player's (N, 10, 10) ship id array [-1 = open water]"""
+        if player.lower() == 'second':
+            return self._ship_ids[1].copy()
+        return self._ship_ids[0].copy()
+
+    def get_fired(self, player):
+        """Returns a copy of the (N, 10, 10) array of squares on a player's board that have been fired upon"""
+        if player.lower() == 'second':
+            return self._fired[1].copy()
+        return self._fired[0].copy()
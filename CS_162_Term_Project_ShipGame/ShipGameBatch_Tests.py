@@ -0,0 +1,125 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for the vectorized ShipGame engine
+
+import random
+import unittest
+from ShipGame import ShipGame, COORD_INDEX
+from ShipGameBatch import BatchShipGame, coords_to_rows_cols, FIRST_WON, UNFINISHED
+
+
+class TestBatchShipGame(unittest.TestCase):
+
+    def test_coords_to_rows_cols(self):
+        rows, cols = coords_to_rows_cols(['A1', 'G9', 'K1'])
+        self.assertEqual(rows.tolist(), [0, 6, -1])
+        self.assertEqual(cols.tolist(), [0, 8, -1])
+
+    def test_place_ships(self):
+        batch = BatchShipGame(4)
+        rows, cols = coords_to_rows_cols(['G9', 'A9', 'B2', 'Z1'])
+        accepted = batch.place_ships('first', 4, rows, cols, ['C', 'R', 'C', 'C'])
+        self.assertEqual(accepted.tolist(), [True, False, True, False])
+
+        # overlap with the ship placed above
+        rows, cols = coords_to_rows_cols(['H7', 'A9', 'C1', 'A1'])
+        accepted = batch.place_ships('first', [3, 2, 2, 1], rows, cols, 'R')
+        self.assertEqual(accepted.tolist(), [False, True, False, False])
+        self.assertEqual(batch.get_num_ships_remaining('first').tolist(), [1, 1, 1, 0])
+
+    def test_fire_torpedoes(self):
+        batch = BatchShipGame(2)
+        batch.place_ships('first', 2, 0, 0, 'R')
+        batch.place_ships('second', 2, 5, 5, 'C')
+
+        accepted, hit, sunk = batch.fire_torpedoes(['first', 'second'], 5, 5)
+        self.assertEqual(accepted.tolist(), [True, False])
+        self.assertEqual(hit.tolist(), [True, False])
+
+        batch.fire_torpedoes('second', 9, 9, active=[True, False])
+        accepted, hit, sunk = batch.fire_torpedoes('first', [6, 5], 5)
+        self.assertEqual(accepted.tolist(), [True, True])
+        self.assertEqual(hit.tolist(), [True, True])
+        self.assertEqual(sunk.tolist(), [True, False])
+        self.assertEqual(batch.get_current_states().tolist(), [FIRST_WON, UNFINISHED])
+
+    def test_matches_ship_game(self):
+        rng = random.Random(162)
+        labels = list(COORD_INDEX) + ['K1']
+        games = [ShipGame() for game in range(200)]
+        batch = BatchShipGame(200)
+
+        for step in range(6):
+            players = [rng.choice(['first', 'second']) for game in games]
+            sizes = [rng.randint(1, 5) for game in games]
+            locations = [rng.choice(labels) for game in games]
+            orientations = [rng.choice('RC') for game in games]
+            rows, cols = coords_to_rows_cols(locations)
+            accepted = batch.place_ships(players, sizes, rows, cols, orientations)
+            for idx, game in enumerate(games):
+                result = game.place_ship(players[idx], sizes[idx], locations[idx], orientations[idx])
+                self.assertEqual(result, accepted[idx])
+
+        for step in range(300):
+            players = [rng.choice(['first', 'second']) for game in games]
+            targets = [rng.choice(labels) for game in games]
+            rows, cols = coords_to_rows_cols(targets)
+            accepted, hit, sunk = batch.fire_torpedoes(players, rows, cols)
+            for idx, game in enumerate(games):
+                self.assertEqual(game.fire_torpedo(players[idx], targets[idx]), accepted[idx])
+
+        states = batch.get_current_state_names()
+        for idx, game in enumerate(games):
+            self.assertEqual(game.get_current_state(), states[idx])
+            self.assertEqual(game.get_num_ships_remaining('second'), batch.get_num_ships_remaining('second')[idx])
+
+    def test_placements_after_firing(self):
+        rng = random.Random(4)
+        labels = list(COORD_INDEX)
+        games = [ShipGame() for game in range(200)]
+        batch = BatchShipGame(200)
+
+        for step in range(150):
+            players = [rng.choice(['first', 'second']) for game in games]
+            locations = [rng.choice(labels) for game in games]
+            rows, cols = coords_to_rows_cols(locations)
+            if step < 4 or rng.random() < 0.3:
+                sizes = [rng.randint(2, 5) for game in games]
+                orientations = [rng.choice('RC') for game in games]
+                accepted = batch.place_ships(players, sizes, rows, cols, orientations)
+                for idx, game in enumerate(games):
+                    self.assertEqual(game.place_ship(players[idx], sizes[idx], locations[idx], orientations[idx]),
+                                     accepted[idx], (step, idx))
+            else:
+                accepted, hit, sunk = batch.fire_torpedoes(players, rows, cols)
+                for idx, game in enumerate(games):
+                    self.assertEqual(game.fire_torpedo(players[idx], locations[idx]), accepted[idx], (step, idx))
+                    if accepted[idx]:
+                        self.assertEqual(game.get_last_shot_result(),
+                                         'SUNK' if sunk[idx] else 'HIT' if hit[idx] else 'MISS', (step, idx))
+
+            states = batch.get_current_state_names()
+            for idx, game in enumerate(games):
+                self.assertEqual((game.get_current_state(), game.get_num_ships_remaining('first'),
+                                  game.get_num_ships_remaining('second')),
+                                 (states[idx], batch.get_num_ships_remaining('first')[idx],
+                                  batch.get_num_ships_remaining('second')[idx]), (step, idx))
+
+    def test_more_ships_than_squares(self):
+        batch = BatchShipGame(1)
+        game = ShipGame()
+        batch.place_ships('second', 2, 9, 0, 'R')
+        game.place_ship('second', 2, 'J1', 'R')
+        for ship in range(110):
+            # place a destroyer on A1, sink it, and place the next one over its wreck
+            self.assertTrue(batch.place_ships('second', 2, 0, 0, 'R')[0])
+            self.assertTrue(game.place_ship('second', 2, 'A1', 'R'))
+            for col in (0, 1):
+                self.assertTrue(batch.fire_torpedoes('first', 0, col)[0][0])
+                self.assertTrue(batch.fire_torpedoes('second', 9, 9)[0][0])
+                game.fire_torpedo('first', 'A%d' % (col + 1))
+                game.fire_torpedo('second', 'J10')
+            self.assertEqual(game.get_num_ships_remaining('second'), batch.get_num_ships_remaining('second')[0])
+        self.assertEqual(batch.get_current_state_names(), ['UNFINISHED'])
+        self.assertEqual(batch.get_num_ships_remaining('second').tolist(), [1])
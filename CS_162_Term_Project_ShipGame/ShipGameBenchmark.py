@@ -0,0 +1,389 @@
+# Author: Angela Montez
+# Github username: almontez
+# Date: 10/18/2026
+# Description: Benchmark suite for the ShipGame hot paths. Each benchmark times one operation [building a game,
+#              placing a ship, a torpedo that misses, hits, or sinks, checking for a win, a whole random game,
+#              rendering a board] and reports operations per second and the memory blocks each operation
+#              leaves allocated. Results can be saved as a JSON baseline and later runs compared against it;
+#              any benchmark that got slower or allocates more than the tolerance allows is flagged.
+#              One benchmark can also be run once under cProfile or tracemalloc to see where the time or
+#              memory goes.
+#
+#              Run 'python ShipGameBenchmark.py --save baseline.json' to record a baseline,
+#              'python ShipGameBenchmark.py --compare baseline.json' to check for regressions [exits 1 if any],
+#              and 'python ShipGameBenchmark.py --profile fire_hit' [or --tracemalloc] to profile one run.
+
+import argparse
+import cProfile
+import gc
+import io
+import json
+import platform
+import pstats
+import random
+import sys
+import time
+import tracemalloc
+
+from ShipGame import ShipGame, INDEX_COORD, random_fleet
+
+# fleet placed in the whole-game benchmarks: carrier, battleship, cruiser, submarine, destroyer
+FLEET = (5, 4, 3, 3, 2)
+
+# slowdown [or growth in blocks per operation] allowed before a benchmark is flagged as a regression
+TOLERANCE = 0.10
+
+
+def new_game(bitboard, first_ships=(), second_ships=()):
+    """Returns a game with the given (size, location, orientation) ships placed for each player"""
+    game = ShipGame(bitboard)
+    for ship_size, ship_location, ship_orientation in first_ships:
+        game.place_ship('first', ship_size, ship_location, ship_orientation)
+    for ship_size, ship_location, ship_orientation in second_ships:
+        game.place_ship('second', ship_size, ship_location, ship_orientation)
+    return game
+
+
+# Each setup function takes (number, bitboard) and builds everything the timed loop needs, then returns run: a
+# function of no arguments that performs the operation number times. run returns what the last operation worked
+# on, so the tests can check that a benchmark measures what its name says.
+
+def setup_construct(number, bitboard):
+    """ShipGame() with nothing placed"""
+    games = [None] * number
+
+    def run():
+        for index in range(number):
+            games[index] = ShipGame(bitboard)
+        return games[-1]
+    return run
+
+
+def setup_place_ship(number, bitboard):
+    """place_ship of a 5 ship onto a board that already holds one ship"""
+    games = [new_game(bitboard, [(2, 'J1', 'R')]) for index in range(number)]
+
+    def run():
+        for game in games:
+            game.place_ship('first', 5, 'A1', 'R')
+        return game
+    return run
+
+
+def setup_place_fleet(number, bitboard):
+    """place_fleet of the five ship fleet onto an empty board"""
+    games = [ShipGame(bitboard) for index in range(number)]
+    fleet = [(5, 'A1', 'R'), (4, 'C1', 'R'), (3, 'E1', 'C'), (3, 'E3', 'C'), (2, 'J9', 'R')]
+
+    def run():
+        for game in games:
+            game.place_fleet('first', fleet)
+        return game
+    return run
+
+
+def setup_fire(number, bitboard, target):
+    """fire_torpedo by 'first' at target, one fresh game per operation. 'second' has a 2 ship at A1 that the
+       first torpedo of each game already hit, and a 3 ship at J1"""
+    games = []
+    for index in range(number):
+        game = new_game(bitboard, [(2, 'A1', 'R')], [(2, 'A1', 'R'), (3, 'J1', 'R')])
+        game.fire_torpedo('first', 'A1')
+        game.fire_torpedo('second', 'A1')
+        games.append(game)
+
+    def run():
+        for game in games:
+            game.fire_torpedo('first', target)
+        return game
+    return run
+
+
+def setup_fire_miss(number, bitboard):
+    """fire_torpedo that misses"""
+    return setup_fire(number, bitboard, 'E5')
+
+
+def setup_fire_hit(number, bitboard):
+    """fire_torpedo that hits a ship without sinking it"""
+    return setup_fire(number, bitboard, 'J1')
+
+
+def setup_fire_sunk(number, bitboard):
+    """fire_torpedo that sinks a ship [but not the last one, so the game goes on]"""
+    return setup_fire(number, bitboard, 'A2')
+
+
+def setup_check_for_win(number, bitboard):
+    """check_for_win on a game in progress"""
+    game = new_game(bitboard, [(2, 'A1', 'R'), (3, 'C1', 'R')], [(2, 'A1', 'R'), (3, 'C1', 'R')])
+
+    def run():
+        for index in range(number):
+            game.check_for_win('first')
+        return game
+    return run
+
+
+def setup_random_game(number, bitboard):
+    """A whole game: both fleets placed at random, then torpedoes at random squares until one player wins.
+       Fleets and firing orders are drawn in setup so only the game itself is timed"""
+    rng = random.Random(162)
+    plans = []
+    for index in range(number):
+        first_targets = list(INDEX_COORD)
+        second_targets = list(INDEX_COORD)
+        rng.shuffle(first_targets)
+        rng.shuffle(second_targets)
+        plans.append((random_fleet(FLEET, rng), random_fleet(FLEET, rng), first_targets, second_targets))
+
+    def run():
+        for first_fleet, second_fleet, first_targets, second_targets in plans:
+            game = ShipGame(bitboard)
+            game.place_fleet('first', first_fleet)
+            game.place_fleet('second', second_fleet)
+            for first_target, second_target in zip(first_targets, second_targets):
+                game.fire_torpedo('first', first_target)
+                if game.get_current_state() != 'UNFINISHED':
+                    break
+                game.fire_torpedo('second', second_target)
+                if game.get_current_state() != 'UNFINISHED':
+                    break
+        return game
+    return run
+
+
+def setup_render(number, bitboard):
+    """view_player_board as text on a game in progress"""
+    game = new_game(bitboard, [(5, 'A1', 'R'), (3, 'D4', 'C')], [(2, 'J9', 'R')])
+    for first_target, second_target in zip(('B2', 'J9', 'C3'), ('A1', 'D4', 'H8')):
+        game.fire_torpedo('first', first_target)
+        game.fire_torpedo('second', second_target)
+
+    def run():
+        for index in range(number):
+            text = game.view_player_board('first', as_text=True)
+        return text
+    return run
+
+
+class Benchmark:
+    """A named operation to time: setup [see setup_construct] and how many operations one run performs"""
+
+    def __init__(self, name, setup, number):
+        """Initialize Benchmark fields"""
+        self._name = name
+        self._setup = setup
+        self._number = number
+
+    def get_name(self):
+        """Returns the name of the benchmark"""
+        return self._name
+
+    def get_number(self, scale=1.0):
+        """Returns the number of operations in one run, scaled [at least 1]"""
+        return max(1, int(self._number * scale))
+
+    def get_description(self):
+        """Returns what the benchmark times"""
+        return self._setup.__doc__
+
+    def prepare(self, bitboard=False, scale=1.0):
+        """Builds one run. Returns run [see setup_construct]"""
+        return self._setup(self.get_number(scale), bitboard)
+
+
+BENCHMARKS = (Benchmark('construct', setup_construct, 2000),
+              Benchmark('place_ship', setup_place_ship, 2000),
+              Benchmark('place_fleet', setup_place_fleet, 1000),
+              Benchmark('fire_miss', setup_fire_miss, 2000),
+              Benchmark('fire_hit', setup_fire_hit, 2000),
+              Benchmark('fire_sunk', setup_fire_sunk, 2000),
+              Benchmark('check_for_win', setup_check_for_win, 20000),
+              Benchmark('random_game', setup_random_game, 50),
+              Benchmark('render', setup_render, 500))
+
+
+def get_benchmark(name):
+    """Returns the benchmark called name. Raises KeyError if there is none"""
+    for benchmark in BENCHMARKS:
+        if benchmark.get_name() == name:
+            return benchmark
+    raise KeyError(name)
+
+
+def time_run(run):
+    """Times one run with the garbage collector off [as timeit does]. Returns (seconds, blocks) where blocks is
+       the number of memory blocks the run left allocated"""
+    gc.collect()
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        blocks = sys.getallocatedblocks()
+        start_time = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start_time
+        blocks = sys.getallocatedblocks() - blocks
+    finally:
+        if was_enabled:
+            gc.enable()
+    return seconds, blocks
+
+
+def peak_memory(run):
+    """Runs run once under tracemalloc. Returns the most memory it had allocated at once, in bytes.
+       If tracemalloc is already tracing, it is left running for the caller"""
+    gc.collect()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        start_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run()
+        peak = tracemalloc.get_traced_memory()[1] - start_size
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return peak
+
+
+def measure(benchmark, bitboard=False, repeat=5, scale=1.0):
+    """Times benchmark over repeat runs, each on freshly built games. Returns {'ops_per_sec': best of the runs,
+       'blocks_per_op': fewest blocks left allocated per operation, 'peak_bytes_per_op': tracemalloc peak of
+       one more run per operation}"""
+    number = benchmark.get_number(scale)
+    best_seconds = None
+    fewest_blocks = None
+    for attempt in range(repeat):
+        run = benchmark.prepare(bitboard, scale)
+        seconds, blocks = time_run(run)
+        del run
+        if best_seconds is None or seconds < best_seconds:
+            best_seconds = seconds
+        if fewest_blocks is None or blocks < fewest_blocks:
+            fewest_blocks = blocks
+
+    peak = peak_memory(benchmark.prepare(bitboard, scale))
+    return {'ops_per_sec': number / best_seconds if best_seconds else float('inf'),
+            'blocks_per_op': fewest_blocks / number,
+            'peak_bytes_per_op': peak / number}
+
+
+def run_suite(names=None, bitboard=False, repeat=5, scale=1.0):
+    """Measures every benchmark [or just those named]. Returns {'python', 'bitboard', 'results': {name:
+       measure(...)}}, the form save_baseline writes"""
+    results = {}
+    for benchmark in BENCHMARKS:
+        if names is None or benchmark.get_name() in names:
+            results[benchmark.get_name()] = measure(benchmark, bitboard, repeat, scale)
+    return {'python': platform.python_version(), 'bitboard': bitboard, 'results': results}
+
+
+def save_baseline(report, path):
+    """Writes a run_suite report to path as JSON"""
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    """Reads a report written by save_baseline"""
+    with open(path) as file:
+        return json.load(file)
+
+
+def find_regressions(report, baseline, tolerance=TOLERANCE):
+    """Compares a run_suite report with a baseline. Returns one (name, metric, baseline value, new value) per
+       benchmark that runs more than tolerance slower, or leaves more than tolerance more blocks allocated per
+       operation [and at least one more], than the baseline. Benchmarks missing from either are skipped.
+       Raises ValueError if the two were measured on different board types"""
+    if report['bitboard'] != baseline['bitboard']:
+        raise ValueError('report and baseline were measured on different board types')
+
+    regressions = []
+    for name, result in report['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        if result['ops_per_sec'] < old['ops_per_sec'] * (1 - tolerance):
+            regressions.append((name, 'ops_per_sec', old['ops_per_sec'], result['ops_per_sec']))
+        if result['blocks_per_op'] > max(old['blocks_per_op'] * (1 + tolerance), old['blocks_per_op'] + 1):
+            regressions.append((name, 'blocks_per_op', old['blocks_per_op'], result['blocks_per_op']))
+    return regressions
+
+
+def profile(name, tool='cprofile', bitboard=False, scale=1.0, limit=25):
+    """Runs one benchmark once under cProfile [tool='cprofile'; functions by cumulative time] or tracemalloc
+       [tool='tracemalloc'; lines by memory still allocated when the run ends]. Setup is not profiled.
+       Returns the top limit entries as text. If tracemalloc is already tracing, it is left running"""
+    run = get_benchmark(name).prepare(bitboard, scale)
+    stream = io.StringIO()
+
+    if tool == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.runcall(run)
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+    elif tool == 'tracemalloc':
+        gc.collect()
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            result = run()          # held until the snapshot so what the run built is counted
+            after = tracemalloc.take_snapshot()
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+        for statistic in after.compare_to(before, 'lineno')[:limit]:
+            print(statistic, file=stream)
+    else:
+        raise ValueError('tool must be cprofile or tracemalloc')
+    return stream.getvalue()
+
+
+def format_report(report, regressions=()):
+    """Returns a report as a table, one line per benchmark, marking the regressions"""
+    flagged = {}
+    for name, metric, old, new in regressions:
+        flagged.setdefault(name, []).append('%s %.4g -> %.4g' % (metric, old, new))
+
+    lines = ['%-14s %14s %14s %18s' % ('benchmark', 'ops/sec', 'blocks/op', 'peak bytes/op')]
+    for name, result in report['results'].items():
+        line = '%-14s %14.0f %14.2f %18.1f' % (name, result['ops_per_sec'], result['blocks_per_op'],
+                                               result['peak_bytes_per_op'])
+        if name in flagged:
+            line += '   REGRESSION: ' + ', '.join(flagged[name])
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='ShipGame benchmark suite')
+    parser.add_argument('names', nargs='*', help='benchmarks to run [default: all]')
+    parser.add_argument('--bitboard', action='store_true', help='play on BitBoard boards')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per benchmark; the best is reported')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplies the operations in each run')
+    parser.add_argument('--save', metavar='PATH', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='flag regressions against a JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--profile', metavar='NAME', help='run one benchmark once under cProfile')
+    parser.add_argument('--tracemalloc', metavar='NAME', help='run one benchmark once under tracemalloc')
+    arguments = parser.parse_args()
+
+    if arguments.profile or arguments.tracemalloc:
+        if arguments.profile:
+            print(profile(arguments.profile, 'cprofile', arguments.bitboard, arguments.scale), end='')
+        if arguments.tracemalloc:
+            print(profile(arguments.tracemalloc, 'tracemalloc', arguments.bitboard, arguments.scale), end='')
+        sys.exit(0)
+
+    suite = run_suite(arguments.names or None, arguments.bitboard, arguments.repeat, arguments.scale)
+    found = []
+    if arguments.compare:
+        found = find_regressions(suite, load_baseline(arguments.compare), arguments.tolerance)
+    print(format_report(suite, found), end='')
+    if arguments.save:
+        save_baseline(suite, arguments.save)
+    if found:
+        sys.exit(1)
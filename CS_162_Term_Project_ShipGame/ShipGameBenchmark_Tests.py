@@ -0,0 +1,76 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for the ShipGame benchmark suite
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+from ShipGameBenchmark import BENCHMARKS, get_benchmark, run_suite, save_baseline, load_baseline, \
+    find_regressions, profile, format_report, peak_memory
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_benchmarks_measure_what_they_say(self):
+        for bitboard in (False, True):
+            def last(name):
+                return get_benchmark(name).prepare(bitboard, scale=0.01)()
+
+            self.assertEqual(last('construct').get_num_ships_remaining('first'), 0)
+            self.assertEqual(last('place_ship').get_num_ships_remaining('first'), 2)
+            self.assertEqual(last('place_fleet').get_num_ships_remaining('first'), 5)
+            self.assertEqual(last('fire_miss').get_last_shot_result(), 'MISS')
+            self.assertEqual(last('fire_hit').get_last_shot_result(), 'HIT')
+            self.assertEqual(last('fire_sunk').get_last_shot_result(), 'SUNK')
+            self.assertEqual(last('fire_sunk').get_current_state(), 'UNFINISHED')
+            self.assertFalse(last('check_for_win').check_for_win('first'))
+            self.assertIn(last('random_game').get_current_state(), ('FIRST_WON', 'SECOND_WON'))
+            self.assertTrue(last('render').startswith('Player 1 Board'))
+
+    def test_run_suite(self):
+        report = run_suite(['fire_hit', 'render'], repeat=2, scale=0.01)
+        self.assertEqual(sorted(report['results']), ['fire_hit', 'render'])
+        self.assertGreater(report['results']['fire_hit']['ops_per_sec'], 0)
+        self.assertIn('fire_hit', format_report(report))
+        self.assertEqual(len(run_suite(repeat=1, scale=0.001)['results']), len(BENCHMARKS))
+
+    def test_baseline_and_regressions(self):
+        baseline = {'python': '3', 'bitboard': False,
+                    'results': {'fast': {'ops_per_sec': 1000.0, 'blocks_per_op': 10.0, 'peak_bytes_per_op': 9.0},
+                                'lean': {'ops_per_sec': 1000.0, 'blocks_per_op': 0.0, 'peak_bytes_per_op': 9.0}}}
+        report = {'python': '3', 'bitboard': False,
+                  'results': {'fast': {'ops_per_sec': 850.0, 'blocks_per_op': 10.5, 'peak_bytes_per_op': 9.0},
+                              'lean': {'ops_per_sec': 950.0, 'blocks_per_op': 2.0, 'peak_bytes_per_op': 9.0},
+                              'new': {'ops_per_sec': 1.0, 'blocks_per_op': 0.0, 'peak_bytes_per_op': 0.0}}}
+        self.assertEqual(find_regressions(report, baseline),
+                         [('fast', 'ops_per_sec', 1000.0, 850.0), ('lean', 'blocks_per_op', 0.0, 2.0)])
+        self.assertEqual(find_regressions(report, baseline, tolerance=0.2), [('lean', 'blocks_per_op', 0.0, 2.0)])
+        self.assertIn('REGRESSION: ops_per_sec', format_report(report, find_regressions(report, baseline)))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_baseline(baseline, path)
+            self.assertEqual(load_baseline(path), baseline)
+
+        baseline['bitboard'] = True
+        with self.assertRaises(ValueError):
+            find_regressions(report, baseline)
+
+    def test_profile(self):
+        self.assertIn('launch_torpedo', profile('fire_sunk', scale=0.01))
+        self.assertIn('ShipGame.py', profile('construct', 'tracemalloc', scale=0.01))
+        with self.assertRaises(KeyError):
+            profile('no such benchmark')
+
+    def test_leaves_tracing_running(self):
+        tracemalloc.start()
+        try:
+            self.assertGreater(peak_memory(lambda: [0] * 1000), 0)
+            self.assertIn('ShipGame.py', profile('construct', 'tracemalloc', scale=0.01))
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(peak_memory(lambda: [0] * 1000), 0)
+        self.assertFalse(tracemalloc.is_tracing())
@@ -0,0 +1,93 @@
+# Author: Angela Montez
+# Github username: almontez
+# Date: 10/18/2026
+# Description: Counters and latency histograms for ShipGame. Attach an Instruments to one or more games with
+#              ShipGame.set_instruments and it counts every place_ship and fire_torpedo call, counts the
+#              rejected ones by reason ['bad coordinate', 'wrong turn', 'overlap', 'game over',...], and sorts
+#              how long each call took into histogram buckets. Read the totals with snapshot, or give a
+#              callback that is handed a snapshot every push_every calls [to feed a metrics exporter].
+#              Games without instruments only pay for one check per call.
+
+from bisect import bisect_left
+
+# upper bounds in seconds of the latency histogram buckets: 1, 2, 5 steps from 1 microsecond to 1 second.
+# One more bucket counts the calls slower than the last bound
+LATENCY_BOUNDS = (1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 2e-4, 5e-4, 1e-3, 2e-3, 5e-3, 1e-2, 2e-2, 5e-2,
+                  0.1, 0.2, 0.5, 1.0)
+
+
+class Instruments:
+    """Call counts, rejection reasons, and latency histograms, kept per method name"""
+
+    def __init__(self, callback=None, push_every=1000, bounds=LATENCY_BOUNDS):
+        """Initialize Instruments fields. If callback is given it is called with snapshot() after every
+           push_every calls recorded [see push]"""
+        self._bounds = tuple(bounds)
+        self._callback = callback
+        self._push_every = push_every
+        self._since_push = 0                    # calls recorded since the callback was last called
+        self._methods = {}                      # method name -> [calls, total seconds, max seconds, rejections
+                                                #                 by reason, histogram counts]
+
+    def record(self, method, seconds, reason=None):
+        """Counts one call of method that took seconds, rejected for reason [None if it was accepted]. Called
+           by ShipGame"""
+        stats = self._methods.get(method)
+        if stats is None:
+            stats = self._methods[method] = [0, 0.0, 0.0, {}, [0] * (len(self._bounds) + 1)]
+        stats[0] += 1
+        stats[1] += seconds
+        if seconds > stats[2]:
+            stats[2] = seconds
+        if reason is not None:
+            rejections = stats[3]
+            rejections[reason] = rejections.get(reason, 0) + 1
+        stats[4][bisect_left(self._bounds, seconds)] += 1
+
+        if self._callback is not None:
+            self._since_push += 1
+            if self._since_push >= self._push_every:
+                self.push()
+
+    def push(self):
+        """Hands the callback a snapshot now, whatever the count since the last one"""
+        self._since_push = 0
+        if self._callback is not None:
+            self._callback(self.snapshot())
+
+    def snapshot(self):
+        """Returns a copy of the totals: {method: {'calls', 'accepted', 'rejected': {reason: count},
+           'total_seconds', 'max_seconds', 'latency': {'bounds': [...], 'counts': [...]}}}. counts has one
+           more entry than bounds, for calls slower than the last bound"""
+        snapshot = {}
+        for method, (calls, total_seconds, max_seconds, rejections, counts) in self._methods.items():
+            snapshot[method] = {'calls': calls, 'accepted': calls - sum(rejections.values()),
+                                'rejected': dict(rejections), 'total_seconds': total_seconds,
+                                'max_seconds': max_seconds,
+                                'latency': {'bounds': list(self._bounds), 'counts': list(counts)}}
+        return snapshot
+
+    def reset(self):
+        """Starts every count over from zero"""
+        self._methods = {}
+        self._since_push = 0
+
+
+def latency_percentile(latency, fraction):
+    """Returns the upper bound of the histogram bucket holding the given fraction of calls [Ex: 0.99 for the
+       99th percentile] from a snapshot's 'latency' entry. Returns None if no calls were counted, and infinity
+       if the percentile falls past the last bound"""
+    counts = latency['counts']
+    total = sum(counts)
+    if total == 0:
+        return None
+
+    wanted = fraction * total
+    seen = 0
+    for bucket, count in enumerate(counts):
+        seen += count
+        if seen >= wanted and count:
+            if bucket == len(latency['bounds']):
+                return float('inf')
+            return latency['bounds'][bucket]
+    return float('inf')
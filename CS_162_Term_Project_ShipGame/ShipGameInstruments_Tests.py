@@ -0,0 +1,93 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for the ShipGame counters and latency histograms
+
+import random
+import unittest
+from ShipGame import ShipGame, INDEX_COORD
+from ShipGameInstruments import Instruments, latency_percentile, LATENCY_BOUNDS
+
+
+class TestInstruments(unittest.TestCase):
+
+    def test_rejection_reasons(self):
+        for bitboard in (False, True):
+            instruments = Instruments()
+            game = ShipGame(bitboard)
+            game.set_instruments(instruments)
+            game.place_ship('first', 1, 'A1', 'R')         # bad size
+            game.place_ship('first', 2, 'K1', 'R')         # bad coordinate
+            game.place_ship('first', 3, 'A9', 'R')         # off board
+            game.place_ship('first', 2, 'A1', 'R')
+            game.place_ship('first', 2, 'A2', 'C')         # overlap
+            game.place_ship('second', 2, 'A2', 'C')
+            game.fire_torpedo('second', 'A1')              # wrong turn
+            game.fire_torpedo('first', 'Z9')               # bad coordinate
+            game.fire_torpedo('first', 'A2')
+            game.fire_torpedo('second', 'J10')
+            game.fire_torpedo('first', 'B2')
+            game.fire_torpedo('second', 'J10')             # game over
+
+            snapshot = instruments.snapshot()
+            self.assertEqual(snapshot['place_ship']['calls'], 6)
+            self.assertEqual(snapshot['place_ship']['accepted'], 2)
+            self.assertEqual(snapshot['place_ship']['rejected'],
+                             {'bad size': 1, 'bad coordinate': 1, 'off board': 1, 'overlap': 1})
+            self.assertEqual(snapshot['fire_torpedo']['calls'], 6)
+            self.assertEqual(snapshot['fire_torpedo']['rejected'],
+                             {'wrong turn': 1, 'bad coordinate': 1, 'game over': 1})
+            self.assertEqual(sum(snapshot['fire_torpedo']['latency']['counts']), 6)
+
+    def test_reasons_match_results(self):
+        rng = random.Random(15)
+        game = ShipGame()
+        for attempt in range(300):
+            player = rng.choice(('first', 'second'))
+            spec = (rng.randint(0, 11), rng.choice(INDEX_COORD + ('K1', 'A11')), rng.choice('RC'))
+            reason = game.place_rejection(player, *spec)
+            self.assertEqual(game.place_ship(player, *spec), reason is None)
+        self.assertEqual(game.place_rejection('first', 2, 'J1', 'X'), 'off board')
+        while game.get_current_state() == 'UNFINISHED':
+            player = rng.choice(('first', 'second'))
+            target = rng.choice(INDEX_COORD + ('K1',))
+            reason = game.fire_rejection(player, target)
+            self.assertEqual(game.fire_torpedo(player, target), reason is None)
+        self.assertEqual(game.fire_rejection('first', 'A1'), 'game over')
+
+    def test_histogram_and_percentile(self):
+        instruments = Instruments()
+        for seconds in (0.5e-6, 3e-6, 3e-6, 40e-6, 2.0):
+            instruments.record('fire_torpedo', seconds)
+        latency = instruments.snapshot()['fire_torpedo']['latency']
+        self.assertEqual(len(latency['counts']), len(LATENCY_BOUNDS) + 1)
+        self.assertEqual(latency['counts'][0], 1)
+        self.assertEqual(latency['counts'][-1], 1)
+        self.assertEqual(latency_percentile(latency, 0.5), 5e-6)
+        self.assertEqual(latency_percentile(latency, 0.8), 50e-6)
+        self.assertEqual(latency_percentile(latency, 1.0), float('inf'))
+        self.assertIsNone(latency_percentile({'bounds': [1.0], 'counts': [0, 0]}, 0.5))
+        self.assertEqual(instruments.snapshot()['fire_torpedo']['max_seconds'], 2.0)
+
+        instruments.reset()
+        self.assertEqual(instruments.snapshot(), {})
+
+    def test_callback_and_sharing(self):
+        pushed = []
+        instruments = Instruments(pushed.append, push_every=3)
+        games = [ShipGame(), ShipGame()]
+        for game in games:
+            game.set_instruments(instruments)
+            game.place_ship('second', 2, 'A1', 'R')
+            game.fire_torpedo('first', 'J1')
+            game.fire_torpedo('first', 'J1')
+        self.assertEqual(len(pushed), 2)
+        self.assertEqual(pushed[-1]['fire_torpedo']['rejected'], {'wrong turn': 2})
+
+        # snapshots are copies, and a game that drops its instruments stops counting
+        pushed[-1]['fire_torpedo']['rejected'].clear()
+        games[0].set_instruments(None)
+        games[0].fire_torpedo('second', 'A1')
+        instruments.push()
+        self.assertEqual(pushed[-1]['fire_torpedo']['rejected'], {'wrong turn': 2})
+        self.assertEqual(pushed[-1]['fire_torpedo']['calls'], 4)
@@ -0,0 +1,437 @@
+# Author: Angela Montez
+# Github username: almontez
+# Date: 10/18/2026
+# Description: Append-only journal of ShipGame moves and a replay engine that rebuilds games from it.
+#              A MoveJournal is attached to one or more games with ShipGame.set_journal and writes a fixed-size
+#              binary record for every place_ship, fire_torpedo, and undo_torpedo call. A journal file is a
+#              16 byte header followed by 12 byte records, so a file cut short by a crash loses at most the
+#              record being written, and a log of any length can be memory-mapped and read as a NumPy array.
+#
+#              Replay does not re-issue the calls. It works out from the whole array at once which squares
+#              were fired upon, which ships were hit and sunk, and how each game stood after its last move,
+#              then sets up each game from those parts [see ShipGame.restore_position]. Nothing is created per
+#              record; only the ShipGame and Ship objects handed back are.
+#
+#              Requires NumPy.
+
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from ShipGame import ShipGame, get_geometry
+
+# file layout [little-endian]. Version 2 added undo records; a version 1 journal is read the same way and is
+# marked version 2 when a MoveJournal opens it for appending
+_MAGIC = b'SGJR'
+_VERSION = 2
+_READABLE_VERSIONS = (1, 2)
+_HEADER = struct.Struct('<4sBBHH6x')        # magic, version, flags [1 = bitboard], rows, cols
+_RECORD = struct.Struct('<IIHBB')           # game id, square, ship size, kind, flags
+
+# one record as NumPy sees it
+RECORD_DTYPE = np.dtype([('game', '<u4'), ('square', '<u4'), ('size', '<u2'), ('kind', 'u1'), ('flags', 'u1')])
+
+# record kinds
+PLACE = 1
+FIRE = 2
+UNDO = 3
+
+# record flags: player code in bits 0-1, orientation code in bits 2-4, accepted in bit 7
+ACCEPTED = 0x80
+PLAYER_CODES = {'first': 0, 'second': 1}    # any other player is saved as 2
+ORIENTATION_CODES = {'R': 0, 'C': 1, 'r': 2, 'c': 3}    # any other orientation is saved as 4
+ORIENTATIONS = ('R', 'C', 'r', 'c', 'X')
+
+# codes used in the arrays analyze_records returns
+PLAYER_NAMES = ('first', 'second')
+STATE_NAMES = ('UNFINISHED', 'FIRST_WON', 'SECOND_WON')
+LAST_SHOT_NAMES = (None, 'MISS', 'HIT', 'SUNK')
+
+# square saved for a coordinate that is not on the board
+NO_SQUARE = 0xFFFFFFFF
+
+# bytes buffered before MoveJournal writes to the file
+_BUFFER_SIZE = 1 << 16
+
+
+def read_header(data):
+    """Returns (rows, cols, bitboard) from the header of a journal. Raises ValueError if data does not start
+       with a journal header"""
+    if len(data) < _HEADER.size:
+        raise ValueError('journal is missing its header')
+    magic, version, flags, rows, cols = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError('not a ShipGame journal')
+    if version not in _READABLE_VERSIONS:
+        raise ValueError('unknown journal version %d' % version)
+    return rows, cols, bool(flags & 1)
+
+
+def read_records(data):
+    """Returns the records of a journal [bytes, mmap, or any other buffer] as a NumPy array of RECORD_DTYPE.
+       The array is a view of data, not a copy. A partly written record at the end is left out"""
+    read_header(data)
+    count = (len(data) - _HEADER.size) // _RECORD.size
+    return np.frombuffer(data, dtype=RECORD_DTYPE, count=count, offset=_HEADER.size)
+
+
+class MoveJournal:
+    """Writes ShipGame moves to a journal file. Every game attached to one journal must have the board size
+       and board type given here. Records are buffered; call flush [or close] to write them out"""
+
+    def __init__(self, path, rows=10, cols=10, bitboard=False):
+        """Opens the journal at path for appending, creating it if it does not exist. An existing journal
+           must have the same board size and board type. A record cut short by a crash is dropped"""
+        self._geometry = get_geometry(rows, cols)
+        self._buffer = bytearray()
+
+        header = _HEADER.pack(_MAGIC, _VERSION, int(bool(bitboard)), rows, cols)
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'rb') as file:
+                if read_header(file.read(_HEADER.size)) != (rows, cols, bool(bitboard)):
+                    raise ValueError('journal was written for another board')
+            # drop a partly written record so new records line up, and mark the file with the version whose
+            # records are about to be added
+            size = os.path.getsize(path)
+            os.truncate(path, size - (size - _HEADER.size) % _RECORD.size)
+            with open(path, 'r+b') as file:
+                file.write(header)
+        else:
+            self._buffer += header
+
+        self._file = open(path, 'ab')
+
+    def record_place(self, game_id, player, ship_size, ship_location, ship_orientation, accepted):
+        """Adds a record of a place_ship call. Called from within place_ship method of ShipGame class"""
+        square = self._geometry.get_index(ship_location)
+        if square is None:
+            square = NO_SQUARE
+        if not isinstance(ship_size, int) or not 0 <= ship_size <= 0xFFFF:
+            ship_size = 0       # only rejected calls have sizes that do not fit in a record
+        flags = PLAYER_CODES.get(player, 2) | ORIENTATION_CODES.get(ship_orientation, 4) << 2
+        if accepted:
+            flags |= ACCEPTED
+        self._buffer += _RECORD.pack(game_id, square, ship_size, PLACE, flags)
+        if len(self._buffer) >= _BUFFER_SIZE:
+            self.flush()
+
+    def record_fire(self, game_id, player, target, accepted):
+        """Adds a record of a fire_torpedo call. Called from within fire_torpedo method of ShipGame class"""
+        square = self._geometry.get_index(target)
+        if square is None:
+            square = NO_SQUARE
+        flags = PLAYER_CODES.get(player, 2)
+        if accepted:
+            flags |= ACCEPTED
+        self._buffer += _RECORD.pack(game_id, square, 0, FIRE, flags)
+        if len(self._buffer) >= _BUFFER_SIZE:
+            self.flush()
+
+    def record_undo(self, game_id, accepted):
+        """Adds a record of an undo_torpedo call. Called from within undo_torpedo method of ShipGame class"""
+        flags = 0
+        if accepted:
+            flags |= ACCEPTED
+        self._buffer += _RECORD.pack(game_id, NO_SQUARE, 0, UNDO, flags)
+        if len(self._buffer) >= _BUFFER_SIZE:
+            self.flush()
+
+    def flush(self, sync=False):
+        """Writes buffered records to the file. sync=True also waits for them to reach the disk"""
+        self._file.write(self._buffer)
+        self._buffer.clear()
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Writes buffered records and closes the file"""
+        self.flush()
+        self._file.close()
+
+
+class JournalReader:
+    """Memory-maps a journal file for replay. The records are read straight from the mapped file"""
+
+    def __init__(self, path):
+        """Opens and maps the journal at path"""
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._rows, self._cols, self._bitboard = read_header(self._map)
+        self._records = read_records(self._map)
+
+    def get_board_size(self):
+        """Returns the size of the boards in the journal as (rows, cols)"""
+        return self._rows, self._cols
+
+    def is_bitboard(self):
+        """Returns True if the games in the journal keep their boards as bitmasks"""
+        return self._bitboard
+
+    def get_records(self):
+        """Returns the records as a NumPy array of RECORD_DTYPE [a view of the mapped file]"""
+        return self._records
+
+    def replay_games(self, stop=None):
+        """Rebuilds every game as it stood after the first stop records. Returns {game id: ShipGame}"""
+        return replay_games(self._records[:stop], self._rows, self._cols, self._bitboard)
+
+    def replay_game(self, game_id=0, stop=None):
+        """Rebuilds one game as it stood after the first stop records [see replay_game]"""
+        return replay_game(self._records[:stop], game_id, self._rows, self._cols, self._bitboard)
+
+    def close(self):
+        """Unmaps the file. Arrays returned by get_records must no longer be in use"""
+        self._records = None
+        self._map.close()
+
+
+def replay_game(records, game_id=0, rows=10, cols=10, bitboard=False):
+    """Rebuilds one game from records [an array of RECORD_DTYPE]. Returns a new ShipGame if the game has no
+       records. To stop partway through a game, pass records[:stop]"""
+    games = replay_games(records[records['game'] == game_id], rows, cols, bitboard)
+    if game_id in games:
+        return games[game_id]
+    return ShipGame(bitboard, rows, cols)
+
+
+def analyze_records(records, rows=10, cols=10):
+    """Works out how every game in records [an array of RECORD_DTYPE] stood after its last record, one
+       NumPy operation over the whole array at a time. Only accepted moves change a game, so rejected
+       records are skipped, and a torpedo taken back by an undo record is left out with it. Returns a dict of
+       arrays with one entry per game, in game id order: 'game_ids', 'states' [0 = UNFINISHED, 1 = FIRST_WON,
+       2 = SECOND_WON], 'turns' [0 = first, 1 = second], 'last_shot_results' [0 = none, 1 = MISS, 2 = HIT,
+       3 = SUNK], 'ships_remaining' and 'torpedoes' [(games, 2): first player, second player], 'placed_late'
+       [a ship went onto a square already fired upon, or was placed while a torpedo later taken back was
+       standing], and 'out_of_order' [the accepted moves break the rules: a torpedo out of turn, after the
+       game was won, or off the board, or an undo with nothing to take back]. The other entries cannot be
+       trusted for a game marked placed_late or out_of_order [see replay_games]. Also holds the ships and
+       fired squares replay_games needs"""
+    area = rows * cols
+    never = len(records)                        # position used for a ship that is never hit or sunk
+    game_ids, games = np.unique(records['game'], return_inverse=True)
+    games = games.astype(np.int64)
+    num_games = len(game_ids)
+    accepted = records['flags'] >= ACCEPTED
+    positions = np.arange(len(records))
+    out_of_order = np.zeros(num_games, dtype=bool)
+    placed_late = np.zeros(num_games, dtype=bool)
+
+    # moves on squares that are not on the board, or torpedoes fired by neither player, are never accepted
+    on_board = records['square'] < area
+    bad_fire = accepted & (records['kind'] == FIRE) & (~on_board | ((records['flags'] & 3) > 1))
+    bad_place = accepted & (records['kind'] == PLACE) & ~on_board
+    out_of_order[games[bad_fire | bad_place]] = True
+    accepted &= ~(bad_fire | bad_place)
+
+    # torpedoes taken back by undo records, which leave the game as if they had never been fired
+    placing = accepted & (records['kind'] == PLACE)
+    firing = accepted & (records['kind'] == FIRE)
+    undone, undos, unmatched = match_undos(games, firing, accepted & (records['kind'] == UNDO))
+    out_of_order[games[unmatched]] = True
+    firing[undone] = False
+
+    # a ship placed between a torpedo and its undo may lie under the square the undo puts back
+    place_keys = np.sort(games[placing] * (never + 1) + positions[placing])
+    between = np.searchsorted(place_keys, games[undos] * (never + 1) + undos) > \
+        np.searchsorted(place_keys, games[undone] * (never + 1) + undone)
+    placed_late[games[undos[between]]] = True
+
+    # accepted placements in log order: board 1 for 'second', board 0 for anyone else
+    place_pos = positions[placing]
+    place_game = games[placing]
+    place_flags = records['flags'][placing]
+    place_board = ((place_flags & 3) == 1).astype(np.int64)
+    heads = records['square'][placing].astype(np.int64)
+    sizes = records['size'][placing].astype(np.int64)
+    orientations = (place_flags >> 2) & 7
+
+    # accepted torpedoes in log order, by the board they landed on
+    fire_pos = positions[firing]
+    fire_game = games[firing]
+    fire_board = 1 - (records['flags'][firing] & 3).astype(np.int64)
+    fire_keys = (fire_game * 2 + fire_board) * area + records['square'][firing]
+
+    # first torpedo to land on each (game, board, square); a stable sort keeps log order within a square
+    order = np.argsort(fire_keys, kind='stable')
+    fired_keys, first = np.unique(fire_keys[order], return_index=True)
+    first_fire = fire_pos[order][first]
+
+    # every ship piece, and when it was hit; pieces past the head step one square for R, one row for C and
+    # not at all for other orientations [see Ship.build_ship]
+    piece_ship = np.repeat(np.arange(len(sizes)), sizes)
+    starts = np.cumsum(sizes) - sizes
+    steps = np.where(orientations % 2 == 0, 1, cols)
+    steps[orientations == 4] = 0
+    piece_keys = ((place_game * 2 + place_board) * area + heads)[piece_ship]
+    piece_keys += (np.arange(len(piece_ship)) - starts[piece_ship]) * steps[piece_ship]
+    hit_pos = np.full(len(piece_keys), never)
+    was_fired = np.zeros(len(piece_keys), dtype=bool)
+    if len(fired_keys):
+        found = np.minimum(np.searchsorted(fired_keys, piece_keys), len(fired_keys) - 1)
+        was_fired = fired_keys[found] == piece_keys
+        hit_pos[was_fired] = first_fire[found[was_fired]]
+
+    # games where a ship went onto a square already fired upon
+    placed_late[place_game[piece_ship[was_fired & (hit_pos < place_pos[piece_ship])]]] = True
+
+    # a ship sinks with its last piece; a ship stacked on its head [other orientations] never sinks
+    sunk_pos = np.full(len(sizes), never)
+    if len(sizes):
+        sunk_pos = np.maximum.reduceat(hit_pos, starts)
+        sunk_pos[orientations == 4] = never
+
+    # last torpedo of each game: its result, and whether it sank the opponent's last ship afloat
+    last_fire = np.full(num_games, -1)
+    np.maximum.at(last_fire, fire_game, np.arange(len(fire_pos)))
+    has_fired = last_fire >= 0
+    last_pos = np.full(num_games, never)
+    last_pos[has_fired] = fire_pos[last_fire[has_fired]]
+    last_board = np.zeros(num_games, dtype=np.int64)
+    last_board[has_fired] = fire_board[last_fire[has_fired]]
+
+    last_hit = np.zeros(num_games, dtype=bool)
+    last_hit[place_game[piece_ship[was_fired & (hit_pos == last_pos[place_game[piece_ship]])]]] = True
+    last_sunk = np.zeros(num_games, dtype=bool)
+    last_sunk[place_game[(sunk_pos < never) & (sunk_pos == last_pos[place_game])]] = True
+
+    afloat_then = (place_board == last_board[place_game]) & (place_pos < last_pos[place_game]) & \
+                  (sunk_pos > last_pos[place_game])
+    won = last_sunk & (np.bincount(place_game[afloat_then], minlength=num_games) == 0)
+
+    # torpedoes alternate between the players, first player first, and stop once a game is won
+    by_game = np.argsort(fire_game, kind='stable')
+    rank = np.arange(len(by_game)) - np.searchsorted(fire_game[by_game], fire_game[by_game])
+    out_of_order[fire_game[by_game][(1 - fire_board[by_game]) != rank % 2]] = True
+    after_win = fire_pos > find_wins(place_game * 2 + place_board, place_pos, sunk_pos, num_games, never)[fire_game]
+    out_of_order[fire_game[after_win & ~placed_late[fire_game]]] = True
+
+    states = np.where(won, 2 - last_board, 0)
+    last_shot_results = np.select([last_sunk, last_hit, has_fired], [3, 2, 1], 0)
+    ships_remaining = np.bincount(place_game * 2 + place_board, weights=sunk_pos == never,
+                                  minlength=num_games * 2).astype(np.int64).reshape(num_games, 2)
+    torpedoes = np.bincount(fire_game * 2 + 1 - fire_board, minlength=num_games * 2).reshape(num_games, 2)
+
+    # ships grouped by game and board in placement order; fired squares are grouped the same way since
+    # their keys sort by game, then board
+    ship_order = np.argsort(place_game * 2 + place_board, kind='stable')
+    return {'game_ids': game_ids, 'states': states, 'turns': last_board, 'last_shot_results': last_shot_results,
+            'ships_remaining': ships_remaining, 'torpedoes': torpedoes, 'placed_late': placed_late,
+            'out_of_order': out_of_order,
+            'ships': (heads[ship_order], sizes[ship_order], orientations[ship_order]),
+            'ship_bounds': np.searchsorted((place_game * 2 + place_board)[ship_order],
+                                           np.arange(num_games * 2 + 1)),
+            'fired_squares': fired_keys % area,
+            'fired_bounds': np.searchsorted(fired_keys, np.arange(num_games * 2 + 1) * area)}
+
+
+def match_undos(games, firing, undoing):
+    """Helper method for analyze_records: Pairs each undo record [undoing marks them] with the torpedo
+       [firing marks them] it takes back: the latest torpedo of its game that has not already been taken
+       back. Returns the positions of the torpedoes taken back and of their undos, in matching order, and
+       the positions of undos that had no torpedo to take back"""
+    events = np.flatnonzero(firing | undoing)
+    event_games = games[events]
+    steps = np.where(firing[events], 1, -1)
+
+    # torpedoes standing after each event, counted within its game
+    order = np.argsort(event_games, kind='stable')
+    totals = np.cumsum(steps[order])
+    depth = np.empty(len(events), dtype=np.int64)
+    depth[order] = totals - (totals - steps[order])[np.searchsorted(event_games[order], event_games[order])]
+
+    # a torpedo sits at the count it raised and its undo at the count it lowered, so at each count of a game
+    # torpedoes and undos take turns in log order: each undo follows the torpedo it takes back
+    level = depth + (steps < 0)
+    ordered = np.lexsort((events, level, event_games))
+    is_undo = steps[ordered] < 0
+    matched = is_undo & (level[ordered] > 0)
+    return events[ordered][np.flatnonzero(matched) - 1], events[ordered][matched], \
+        events[ordered][is_undo & ~matched]
+
+
+def find_wins(boards, place_pos, sunk_pos, num_games, never):
+    """Helper method for analyze_records: Returns the position of the torpedo that won each game [never if
+       the game was not won], given the board [game * 2 + player] of each ship and when it was placed and
+       sunk. A game is won when a torpedo sinks the last ship afloat on a board"""
+    sinking = sunk_pos < never
+    event_boards = np.concatenate([boards, boards[sinking]])
+    event_pos = np.concatenate([place_pos, sunk_pos[sinking]])
+    steps = np.concatenate([np.ones(len(boards), dtype=np.int64), np.full(sinking.sum(), -1)])
+
+    # ships afloat on each board after each event
+    order = np.lexsort((event_pos, event_boards))
+    totals = np.cumsum(steps[order])
+    group_start = np.searchsorted(event_boards[order], event_boards[order])
+    afloat = totals - (totals - steps[order])[group_start]
+
+    win_pos = np.full(num_games, never)
+    wins = (steps[order] < 0) & (afloat == 0)
+    np.minimum.at(win_pos, event_boards[order][wins] // 2, event_pos[order][wins])
+    return win_pos
+
+
+def replay_games(records, rows=10, cols=10, bitboard=False):
+    """Rebuilds every game in records [an array of RECORD_DTYPE] as it stood after its last record.
+       Returns {game id: ShipGame}. Works out each game with analyze_records, then sets it up in one step
+       [see ShipGame.restore_position], so no moves are re-issued. Games rebuilt this way have no undo
+       history.
+
+       Ships are expected to be placed before torpedoes are fired at their squares, as in a normal game.
+       A game with a ship placed on a square already fired upon is rebuilt by re-issuing its moves instead
+       [see reissue_moves], since its squares no longer say which pieces have been hit. So is a game whose
+       records break the rules [see analyze_records], which lets the game itself turn down those moves"""
+    summary = analyze_records(records, rows, cols)
+    ship_bounds = summary['ship_bounds'].tolist()
+    fired_bounds = summary['fired_bounds'].tolist()
+    heads, sizes, orientations = summary['ships']
+    ships = list(zip(heads.tolist(), sizes.tolist(), [ORIENTATIONS[code] for code in orientations.tolist()]))
+    fired_squares = summary['fired_squares'].tolist()
+    states = summary['states'].tolist()
+    turns = summary['turns'].tolist()
+    last_shot_results = summary['last_shot_results'].tolist()
+    reissue = (summary['placed_late'] | summary['out_of_order']).tolist()
+
+    results = {}
+    for game, game_id in enumerate(summary['game_ids'].tolist()):
+        if reissue[game]:
+            results.update(reissue_moves(records[records['game'] == game_id], rows, cols, bitboard))
+            continue
+
+        first, second, end = 2 * game, 2 * game + 1, 2 * game + 2
+        fleets = (ships[ship_bounds[first]:ship_bounds[second]], ships[ship_bounds[second]:ship_bounds[end]])
+        fired = (fired_squares[fired_bounds[first]:fired_bounds[second]],
+                 fired_squares[fired_bounds[second]:fired_bounds[end]])
+
+        rebuilt = ShipGame(bitboard, rows, cols)
+        rebuilt.restore_position(PLAYER_NAMES[turns[game]], STATE_NAMES[states[game]],
+                                 LAST_SHOT_NAMES[last_shot_results[game]], fleets, fired)
+        results[game_id] = rebuilt
+    return results
+
+
+def reissue_moves(records, rows=10, cols=10, bitboard=False):
+    """Rebuilds every game in records by calling place_ship, fire_torpedo, and undo_torpedo again for each
+       accepted move. Returns {game id: ShipGame}. Much slower than replay_games, but keeps each game's undo
+       history"""
+    geometry = get_geometry(rows, cols)
+    results = {}
+    for game_id, square, size, kind, flags in records.tolist():
+        if game_id not in results:
+            results[game_id] = ShipGame(bitboard, rows, cols)
+        if flags < ACCEPTED:
+            continue
+        player = 'second'
+        if (flags & 3) != 1:
+            player = 'first'
+        if (flags & 3) > 1:
+            player = None       # neither player: place_ship takes them for the first, fire_torpedo turns them down
+        if kind == PLACE:
+            results[game_id].place_ship(player, size, geometry.get_coord(square), ORIENTATIONS[flags >> 2 & 7])
+        elif kind == FIRE:
+            results[game_id].fire_torpedo(player, geometry.get_coord(square))
+        elif kind == UNDO:
+            results[game_id].undo_torpedo()
+    return results
@@ -0,0 +1,250 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for the ShipGame move journal and replay engine
+
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from ShipGame import ShipGame, INDEX_COORD
+from ShipGameJournal import MoveJournal, JournalReader, read_records, analyze_records, reissue_moves, \
+    replay_games, PLACE, FIRE, UNDO, ACCEPTED, NO_SQUARE, RECORD_DTYPE
+
+
+class TestMoveJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'moves.journal')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def play_games(self, journal, num_games, rng, bitboard=False):
+        """Plays num_games random games to the end through the public API, fleets placed first"""
+        games = {}
+        for game_id in range(num_games):
+            game = ShipGame(bitboard)
+            game.set_journal(journal, game_id)
+            for player in ('first', 'second'):
+                for ship_size in (5, 4, 3, 3, 2):
+                    while not game.place_ship(player, ship_size, rng.choice(INDEX_COORD), rng.choice('RC')):
+                        pass
+            games[game_id] = game
+
+        # interleave the games, with the odd wrong turn and torpedo taken back thrown in
+        player = {game_id: 'first' for game_id in games}
+        while any(game.get_current_state() == 'UNFINISHED' for game in games.values()):
+            for game_id, game in games.items():
+                if rng.random() < 0.1:
+                    game.fire_torpedo('second' if player[game_id] == 'first' else 'first', 'A1')
+                if game.fire_torpedo(player[game_id], rng.choice(INDEX_COORD)):
+                    player[game_id] = 'second' if player[game_id] == 'first' else 'first'
+                if rng.random() < 0.05 and game.get_current_state() == 'UNFINISHED' and game.undo_torpedo():
+                    player[game_id] = 'second' if player[game_id] == 'first' else 'first'
+        return games
+
+    def test_records_every_call(self):
+        journal = MoveJournal(self.path)
+        game = ShipGame()
+        game.set_journal(journal, 7)
+        game.place_ship('first', 3, 'B2', 'C')
+        game.place_ship('second', 11, 'A1', 'R')
+        game.fire_torpedo('second', 'A1')
+        game.fire_torpedo('first', 'K1')
+        game.fire_torpedo('first', 'J10')
+        journal.close()
+
+        with open(self.path, 'rb') as file:
+            records = read_records(file.read())
+        self.assertEqual(records['game'].tolist(), [7] * 5)
+        self.assertEqual(records['kind'].tolist(), [PLACE, PLACE, FIRE, FIRE, FIRE])
+        self.assertEqual(records['square'].tolist(), [11, 0, 0, NO_SQUARE, 99])
+        self.assertEqual(records['size'].tolist(), [3, 11, 0, 0, 0])
+        self.assertEqual((records['flags'] & ACCEPTED > 0).tolist(), [True, False, False, False, True])
+        self.assertEqual(len(records), 5)
+
+    def test_replay_matches_reissue(self):
+        for bitboard in (False, True):
+            journal = MoveJournal(self.path, bitboard=bitboard)
+            games = self.play_games(journal, 20, random.Random(162), bitboard)
+            journal.close()
+
+            reader = JournalReader(self.path)
+            replayed = reader.replay_games()
+            self.assertEqual(sorted(replayed), sorted(games))
+            for game_id, game in games.items():
+                self.assertEqual(replayed[game_id].save_snapshot(), game.save_snapshot())
+                self.assertEqual(replayed[game_id].view_player_board('first', as_text=True),
+                                 game.view_player_board('first', as_text=True))
+
+            # any point in the log
+            records = reader.get_records()
+            for stop in random.Random(bitboard).sample(range(len(records)), 10):
+                reissued = reissue_moves(records[:stop], bitboard=bitboard)
+                replayed = reader.replay_games(stop)
+                for game_id, game in reissued.items():
+                    self.assertEqual(replayed[game_id].save_snapshot(), game.save_snapshot())
+                    self.assertEqual(replayed[game_id].get_last_shot_result(), game.get_last_shot_result())
+                self.assertEqual(reader.replay_game(3, stop).save_snapshot(),
+                                 reissued.get(3, ShipGame(bitboard)).save_snapshot())
+            del records
+            reader.close()
+            os.remove(self.path)
+
+    def test_analyze_records(self):
+        journal = MoveJournal(self.path)
+        games = self.play_games(journal, 10, random.Random(5))
+        journal.close()
+
+        reader = JournalReader(self.path)
+        summary = analyze_records(reader.get_records())
+        for game_id, game in games.items():
+            self.assertEqual(('UNFINISHED', 'FIRST_WON', 'SECOND_WON')[summary['states'][game_id]],
+                             game.get_current_state())
+            self.assertEqual(summary['ships_remaining'][game_id].tolist(),
+                             [game.get_num_ships_remaining('first'), game.get_num_ships_remaining('second')])
+        self.assertFalse(summary['placed_late'].any())
+        del summary
+        reader.close()
+
+    def test_ship_placed_on_fired_square(self):
+        journal = MoveJournal(self.path)
+        game = ShipGame()
+        game.set_journal(journal)
+        game.place_ship('second', 2, 'J9', 'R')
+        game.fire_torpedo('first', 'A1')
+        game.fire_torpedo('second', 'A1')
+        game.place_ship('first', 2, 'A1', 'R')      # over a square already fired upon
+        game.fire_torpedo('first', 'J10')
+        game.fire_torpedo('second', 'A1')
+        journal.close()
+
+        with open(self.path, 'rb') as file:
+            records = read_records(file.read())
+        self.assertTrue(analyze_records(records)['placed_late'][0])
+        self.assertEqual(replay_games(records)[0].save_snapshot(), game.save_snapshot())
+        self.assertEqual(replay_games(records)[0].get_num_moves(), game.get_num_moves())
+
+    def test_undo_torpedo(self):
+        journal = MoveJournal(self.path)
+        game = ShipGame()
+        game.set_journal(journal)
+        game.place_ship('first', 2, 'A1', 'R')
+        game.place_ship('second', 2, 'A1', 'R')
+        game.fire_torpedo('first', 'A1')
+        game.undo_torpedo()
+        game.fire_torpedo('first', 'B1')
+        game.fire_torpedo('second', 'A1')
+        game.undo_torpedo()
+        game.undo_torpedo()
+        game.undo_torpedo()                         # nothing left to take back
+        game.fire_torpedo('first', 'A2')
+        journal.close()
+
+        with open(self.path, 'rb') as file:
+            records = read_records(file.read())
+        self.assertEqual(records['kind'].tolist()[-5:], [FIRE, UNDO, UNDO, UNDO, FIRE])
+        self.assertEqual((records['flags'][-3:-1] & ACCEPTED > 0).tolist(), [True, False])
+        summary = analyze_records(records)
+        self.assertFalse(summary['out_of_order'][0] or summary['placed_late'][0])
+        self.assertEqual(summary['torpedoes'][0].tolist(), [1, 0])
+
+        replayed = replay_games(records)[0]
+        self.assertEqual(replayed.view_player_board('second', as_text=True),
+                         game.view_player_board('second', as_text=True))
+        self.assertEqual(replayed.save_snapshot(), game.save_snapshot())
+        self.assertEqual(reissue_moves(records)[0].save_snapshot(), game.save_snapshot())
+
+        # a ship placed while a torpedo stands, then the torpedo taken back, is replayed by re-issuing
+        game = ShipGame()
+        game.set_journal(MoveJournal(self.path))
+        game.place_ship('second', 2, 'J1', 'R')
+        game.fire_torpedo('first', 'A1')
+        game.place_ship('second', 2, 'A1', 'R')
+        game.undo_torpedo()
+        game._journal.close()
+        with open(self.path, 'rb') as file:
+            records = read_records(file.read())
+        records = records[records['game'] == 0][-4:]
+        self.assertTrue(analyze_records(records)['placed_late'][0])
+        self.assertEqual(replay_games(records)[0].view_player_board('second', as_text=True),
+                         game.view_player_board('second', as_text=True))
+
+    def test_moves_out_of_order(self):
+        def record(square, kind, flags, size=0):
+            return 0, square, size, kind, flags | ACCEPTED
+
+        # moves marked accepted that the game would have turned down: the second player firing first, a
+        # torpedo from neither player, a torpedo off the board, an undo with nothing to take back, and a
+        # torpedo after the game was won
+        bad_logs = [[record(0, PLACE, 1, 2), record(0, FIRE, 1)],
+                    [record(0, PLACE, 1, 2), record(0, FIRE, 2)],
+                    [record(0, PLACE, 1, 2), record(NO_SQUARE, FIRE, 0)],
+                    [record(NO_SQUARE, UNDO, 0)],
+                    [record(0, PLACE, 1, 2), record(0, PLACE, 0, 2), record(0, FIRE, 0), record(5, FIRE, 1),
+                     record(1, FIRE, 0), record(0, FIRE, 1)]]
+        for log in bad_logs:
+            records = np.array(log, dtype=RECORD_DTYPE)
+            self.assertTrue(analyze_records(records)['out_of_order'][0], log)
+            self.assertEqual(replay_games(records)[0].save_snapshot(), reissue_moves(records)[0].save_snapshot())
+
+        # the same moves played live: the torpedo after the win is turned down
+        live = ShipGame()
+        live.place_ship('second', 2, 'A1', 'R')
+        live.place_ship('first', 2, 'A1', 'R')
+        for player, target in (('first', 'A1'), ('second', 'A6'), ('first', 'A2')):
+            live.fire_torpedo(player, target)
+        self.assertFalse(live.fire_torpedo('second', 'A1'))
+        game = replay_games(np.array(bad_logs[-1], dtype=RECORD_DTYPE))[0]
+        self.assertEqual(game.get_current_state(), 'FIRST_WON')
+        self.assertEqual(game.save_snapshot(), live.save_snapshot())
+
+    def test_version_1_journal(self):
+        journal = MoveJournal(self.path)
+        game = ShipGame()
+        game.set_journal(journal)
+        game.place_ship('first', 2, 'A1', 'R')
+        journal.close()
+        with open(self.path, 'r+b') as file:
+            file.seek(4)
+            file.write(b'\x01')
+
+        self.assertEqual(JournalReader(self.path).replay_game().save_snapshot(), game.save_snapshot())
+        journal = MoveJournal(self.path)
+        game.set_journal(journal)
+        game.fire_torpedo('first', 'A1')
+        game.undo_torpedo()
+        journal.close()
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        self.assertEqual(data[4], 2)
+        self.assertEqual(read_records(data)['kind'].tolist(), [PLACE, FIRE, UNDO])
+
+    def test_reopen_after_crash(self):
+        journal = MoveJournal(self.path)
+        game = ShipGame()
+        game.set_journal(journal)
+        game.place_ship('first', 2, 'A1', 'R')
+        journal.close()
+
+        # half of a record written when the process died
+        with open(self.path, 'ab') as file:
+            file.write(b'\x01\x02\x03')
+
+        journal = MoveJournal(self.path)
+        game.set_journal(journal)
+        game.place_ship('second', 2, 'A1', 'C')
+        journal.flush(sync=True)
+
+        reader = JournalReader(self.path)
+        self.assertEqual(reader.replay_game().save_snapshot(), game.save_snapshot())
+        reader.close()
+        journal.close()
+
+        with self.assertRaises(ValueError):
+            MoveJournal(self.path, rows=8)
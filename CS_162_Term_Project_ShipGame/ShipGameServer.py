@@ -0,0 +1,339 @@
+# Author: Angela Montez
+# Github username: almontez
+# Date: 10/18/2026
+# Description: asyncio server that hosts many ShipGame sessions over a line protocol on TCP or Unix sockets,
+#              and a load generator that plays games against it and reports move latency.
+#
+#              Protocol: one command per line, words separated by spaces. Every reply is one line starting
+#              with OK or ERR; VIEW follows its OK line with the board text.
+#                NEW [rows cols]                                  -> OK <session>
+#                PLACE <session> <player> <size> <coord> <orient> -> OK | ERR rejected
+#                FIRE <session> <player> <coord>                  -> OK <MISS|HIT|SUNK> <state> | ERR turn
+#                                                                    | ERR rejected
+#                STATE <session>                                  -> OK <state>
+#                VIEW <session> <player> [FOG]                    -> OK <number of lines>, then the board
+#                CLOSE <session>                                  -> OK
+#              Any connection may send commands for any session, so one connection can drive many games.
+#              Sessions no command has touched for idle_timeout seconds are closed.
+#
+#              Run 'python ShipGameServer.py serve' to start a server, and 'python ShipGameServer.py load' to
+#              play games against one [or against a server started in the same process if no address is given].
+
+import argparse
+import asyncio
+import random
+import time
+
+from ShipGame import ShipGame, INDEX_COORD
+
+# longest command line accepted
+MAX_LINE = 1024
+
+# most rows or columns a NEW command may ask for [each board size also holds a shared BoardGeometry]
+MAX_BOARD_SIDE = 100
+
+# bytes of replies queued for a slow client before the server stops reading its commands
+WRITE_HIGH_WATER = 64 * 1024
+
+
+class Session:
+    """One hosted game and when a command last touched it"""
+
+    def __init__(self, game, now):
+        """Initialize Session fields"""
+        self._game = game
+        self._last_active = now
+
+    def get_game(self):
+        """Returns the session's ShipGame"""
+        return self._game
+
+    def get_last_active(self):
+        """Returns the event loop time of the last command for this session"""
+        return self._last_active
+
+    def touch(self, now):
+        """Records that a command for this session arrived at now"""
+        self._last_active = now
+
+
+class GameServer:
+    """Hosts ShipGame sessions for any number of connections. Commands are handled one at a time per
+       connection, and a connection's commands are not read while its replies are backed up"""
+
+    def __init__(self, max_sessions=10000, idle_timeout=300.0, bitboard=False):
+        """Initialize GameServer fields. New sessions are refused once max_sessions are open"""
+        self._sessions = {}                 # session id -> Session
+        self._next_id = 1
+        self._max_sessions = max_sessions
+        self._idle_timeout = idle_timeout
+        self._bitboard = bitboard
+        self._servers = []                  # asyncio servers started by start and start_unix
+        self._evictor = None                # task that closes idle sessions
+
+    def get_num_sessions(self):
+        """Returns the number of open sessions"""
+        return len(self._sessions)
+
+    def handle_command(self, line, now):
+        """Carries out one command line at event loop time now and returns the reply [without the newline]"""
+        words = line.split()
+        if not words:
+            return 'ERR empty command'
+        command = words[0].upper()
+
+        if command == 'NEW':
+            return self.new_session(words[1:], now)
+
+        if len(words) < 2 or words[1] not in self._sessions:
+            return 'ERR no such session'
+        session = self._sessions[words[1]]
+        session.touch(now)
+        game = session.get_game()
+
+        if command == 'PLACE' and len(words) == 6 and words[3].isdigit():
+            if game.place_ship(words[2], int(words[3]), words[4], words[5]):
+                return 'OK'
+            return 'ERR rejected'
+
+        if command == 'FIRE' and len(words) == 4:
+            if game.get_current_state() == 'UNFINISHED' and not game.valid_move(words[2]):
+                return 'ERR turn'
+            if game.fire_torpedo(words[2], words[3]):
+                return 'OK %s %s' % (game.get_last_shot_result(), game.get_current_state())
+            return 'ERR rejected'
+
+        if command == 'STATE' and len(words) == 2:
+            return 'OK ' + game.get_current_state()
+
+        if command == 'VIEW' and len(words) in (3, 4) and words[2] in ('first', 'second'):
+            fog_of_war = len(words) == 4 and words[3].upper() == 'FOG'
+            text = game.view_player_board(words[2], as_text=True, fog_of_war=fog_of_war).rstrip('\n')
+            return 'OK %d\n%s' % (text.count('\n') + 1, text)
+
+        if command == 'CLOSE' and len(words) == 2:
+            del self._sessions[words[1]]
+            return 'OK'
+
+        return 'ERR bad command'
+
+    def new_session(self, args, now):
+        """Helper method for handle_command: opens a session with a new ShipGame [10x10 unless args give
+           rows and cols]"""
+        if len(self._sessions) >= self._max_sessions:
+            return 'ERR busy'
+        rows = cols = 10
+        if args:
+            if len(args) != 2 or not args[0].isdigit() or not args[1].isdigit():
+                return 'ERR bad command'
+            rows, cols = int(args[0]), int(args[1])
+            if not 1 <= rows <= MAX_BOARD_SIDE or not 1 <= cols <= MAX_BOARD_SIDE:
+                return 'ERR bad command'
+
+        session_id = str(self._next_id)
+        self._next_id += 1
+        self._sessions[session_id] = Session(ShipGame(self._bitboard, rows, cols), now)
+        return 'OK ' + session_id
+
+    def evict_idle(self, now):
+        """Closes every session not touched for idle_timeout seconds before now. Returns how many closed"""
+        cutoff = now - self._idle_timeout
+        idle = [session_id for session_id, session in self._sessions.items()
+                if session.get_last_active() < cutoff]
+        for session_id in idle:
+            del self._sessions[session_id]
+        return len(idle)
+
+    async def run_evictor(self):
+        """Closes idle sessions every half idle_timeout until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self._idle_timeout / 2)
+            self.evict_idle(loop.time())
+
+    async def handle_connection(self, reader, writer):
+        """Reads commands from one connection and writes a reply to each, until the client disconnects"""
+        loop = asyncio.get_running_loop()
+        writer.transport.set_write_buffer_limits(high=WRITE_HIGH_WATER)
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.LimitOverrunError:
+                    writer.write(b'ERR line too long\n')
+                    break
+                except asyncio.IncompleteReadError:
+                    break           # client disconnected
+
+                reply = self.handle_command(line.decode('ascii', 'replace'), loop.time())
+                writer.write(reply.encode('ascii') + b'\n')
+
+                # backpressure: returns at once unless the client has let WRITE_HIGH_WATER bytes pile up
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Starts listening on TCP. Returns the asyncio server [port=0 picks a free port; see its sockets]"""
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+        self.start_evictor()
+        self._servers.append(server)
+        return server
+
+    async def start_unix(self, path):
+        """Starts listening on a Unix socket at path. Returns the asyncio server"""
+        server = await asyncio.start_unix_server(self.handle_connection, path, limit=MAX_LINE)
+        self.start_evictor()
+        self._servers.append(server)
+        return server
+
+    def start_evictor(self):
+        """Helper method for start and start_unix: starts the idle session task once"""
+        if self._evictor is None:
+            self._evictor = asyncio.get_running_loop().create_task(self.run_evictor())
+
+    async def stop(self):
+        """Stops listening and stops closing idle sessions. Open sessions are kept"""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        if self._evictor is not None:
+            self._evictor.cancel()
+            self._evictor = None
+
+
+def percentile(values, fraction):
+    """Returns the value below which the given fraction of a sorted list falls [nearest rank]"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def send(reader, writer, line):
+    """Sends one command and returns its reply line [without the newline]"""
+    writer.write(line.encode('ascii') + b'\n')
+    await writer.drain()
+    return (await reader.readline()).decode('ascii').rstrip('\n')
+
+
+async def play_remote_game(reader, writer, rng, latencies, fleet=(5, 4, 3, 3, 2)):
+    """Plays one game with random placement and random firing over a connection. Appends the round trip
+       time of every FIRE command to latencies. Returns the number of torpedoes fired"""
+    session_id = (await send(reader, writer, 'NEW')).split()[1]
+    for player in ('first', 'second'):
+        for ship_size in fleet:
+            while True:
+                reply = await send(reader, writer, 'PLACE %s %s %d %s %s' % (
+                    session_id, player, ship_size, rng.choice(INDEX_COORD), rng.choice('RC')))
+                if reply == 'OK':
+                    break
+
+    targets = {'first': list(INDEX_COORD), 'second': list(INDEX_COORD)}
+    for squares in targets.values():
+        rng.shuffle(squares)
+    player = 'first'
+    shots = 0
+    while True:
+        start = time.perf_counter()
+        reply = await send(reader, writer, 'FIRE %s %s %s' % (session_id, player, targets[player].pop()))
+        latencies.append(time.perf_counter() - start)
+        shots += 1
+        if not reply.endswith('UNFINISHED'):
+            break
+        player = 'second' if player == 'first' else 'first'
+
+    await send(reader, writer, 'CLOSE ' + session_id)
+    return shots
+
+
+async def run_load(connect, num_sessions=1000, concurrency=100, seed=0):
+    """Plays num_sessions games with concurrency games in flight at once, each on its own connection made by
+       connect() [a coroutine function returning (reader, writer)]. Returns a report: {'sessions', 'moves',
+       'seconds', 'cpu_seconds', 'p50_ms', 'p99_ms', 'sessions_per_second', 'sessions_per_cpu_second'}.
+       cpu_seconds is the CPU time of this process, so it covers the server too when it runs here"""
+    latencies = []
+    moves = 0
+    remaining = num_sessions
+
+    async def worker(worker_number):
+        nonlocal moves, remaining
+        rng = random.Random('%s-%s' % (seed, worker_number))
+        reader, writer = await connect()
+        try:
+            while remaining > 0:
+                remaining -= 1
+                shots = await play_remote_game(reader, writer, rng, latencies)
+                moves += shots
+        finally:
+            writer.close()
+
+    start_time = time.perf_counter()
+    start_cpu = time.process_time()
+    await asyncio.gather(*(worker(number) for number in range(min(concurrency, num_sessions))))
+    seconds = time.perf_counter() - start_time
+    cpu_seconds = time.process_time() - start_cpu
+
+    latencies.sort()
+    p50 = percentile(latencies, 0.50)
+    p99 = percentile(latencies, 0.99)
+    return {'sessions': num_sessions, 'moves': moves, 'seconds': seconds, 'cpu_seconds': cpu_seconds,
+            'p50_ms': p50 * 1000 if p50 is not None else None, 'p99_ms': p99 * 1000 if p99 is not None else None,
+            'sessions_per_second': num_sessions / seconds if seconds else None,
+            'sessions_per_cpu_second': num_sessions / cpu_seconds if cpu_seconds else None}
+
+
+async def serve_forever(args):
+    """Runs a server until interrupted"""
+    server = GameServer(args.max_sessions, args.idle_timeout)
+    if args.unix:
+        listener = await server.start_unix(args.unix)
+    else:
+        listener = await server.start(args.host, args.port)
+    print('listening on', ', '.join(str(sock.getsockname()) for sock in listener.sockets))
+    await listener.serve_forever()
+
+
+async def load_test(args):
+    """Runs the load generator against a server, starting one in this process if no address is given"""
+    server = None
+    if args.unix:
+        async def connect():
+            return await asyncio.open_unix_connection(args.unix)
+    else:
+        port = args.port
+        if not port:
+            server = GameServer(max(args.max_sessions, args.concurrency))
+            port = (await server.start(args.host, 0)).sockets[0].getsockname()[1]
+
+        async def connect():
+            return await asyncio.open_connection(args.host, port)
+
+    report = await run_load(connect, args.sessions, args.concurrency, args.seed)
+    if server is not None:
+        await server.stop()
+    for name, value in report.items():
+        print(name, value)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='ShipGame session server and load generator')
+    parser.add_argument('mode', choices=('serve', 'load'))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--unix', help='Unix socket path instead of TCP')
+    parser.add_argument('--max-sessions', type=int, default=10000)
+    parser.add_argument('--idle-timeout', type=float, default=300.0)
+    parser.add_argument('--sessions', type=int, default=1000, help='games to play [load]')
+    parser.add_argument('--concurrency', type=int, default=100, help='games in flight at once [load]')
+    parser.add_argument('--seed', default=0)
+    arguments = parser.parse_args()
+
+    if arguments.mode == 'serve':
+        if not arguments.unix and not arguments.port:
+            arguments.port = 8162
+        asyncio.run(serve_forever(arguments))
+    else:
+        asyncio.run(load_test(arguments))
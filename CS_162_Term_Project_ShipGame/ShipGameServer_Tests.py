@@ -0,0 +1,100 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for the ShipGame session server and load generator
+
+import asyncio
+import os
+import tempfile
+import unittest
+from ShipGameServer import GameServer, run_load, send, percentile, MAX_LINE
+
+
+class TestGameServer(unittest.TestCase):
+
+    def test_place_and_fire(self):
+        server = GameServer()
+        self.assertEqual(server.handle_command('NEW', 0), 'OK 1')
+        self.assertEqual(server.handle_command('PLACE 1 first 2 A1 R', 0), 'OK')
+        self.assertEqual(server.handle_command('PLACE 1 first 2 A2 C', 0), 'ERR rejected')
+        self.assertEqual(server.handle_command('PLACE 1 second 2 J9 R\n', 0), 'OK')
+
+        self.assertEqual(server.handle_command('FIRE 1 second A1', 0), 'ERR turn')
+        self.assertEqual(server.handle_command('FIRE 1 first Z1', 0), 'ERR rejected')
+        self.assertEqual(server.handle_command('FIRE 1 first J9', 0), 'OK HIT UNFINISHED')
+        self.assertEqual(server.handle_command('FIRE 1 second B1', 0), 'OK MISS UNFINISHED')
+        self.assertEqual(server.handle_command('FIRE 1 first J10', 0), 'OK SUNK FIRST_WON')
+        self.assertEqual(server.handle_command('FIRE 1 second A1', 0), 'ERR rejected')
+        self.assertEqual(server.handle_command('state 1', 0), 'OK FIRST_WON')
+
+    def test_view(self):
+        server = GameServer()
+        server.handle_command('NEW 3 4', 0)
+        server.handle_command('PLACE 1 second 2 B1 R', 0)
+        header, *lines = server.handle_command('VIEW 1 second', 0).split('\n')
+        self.assertEqual(header, 'OK %d' % len(lines))
+        self.assertEqual(lines[0], 'Player 2 Board: Grid View')
+        self.assertEqual(lines[5].split(), ['B', 'X', 'X', 'O', 'O'])
+        lines = server.handle_command('VIEW 1 second FOG', 0).split('\n')[1:]
+        self.assertEqual(lines[5].split(), ['B', 'O', 'O', 'O', 'O'])
+
+    def test_bad_commands(self):
+        server = GameServer(max_sessions=1)
+        self.assertEqual(server.handle_command('', 0), 'ERR empty command')
+        self.assertEqual(server.handle_command('NEW 0 5', 0), 'ERR bad command')
+        self.assertEqual(server.handle_command('NEW 5 101', 0), 'ERR bad command')
+        self.assertEqual(server.handle_command('FIRE 9 first A1', 0), 'ERR no such session')
+        self.assertEqual(server.handle_command('NEW', 0), 'OK 1')
+        self.assertEqual(server.handle_command('NEW', 0), 'ERR busy')
+        self.assertEqual(server.handle_command('PLACE 1 first two A1 R', 0), 'ERR bad command')
+        self.assertEqual(server.handle_command('JUMP 1', 0), 'ERR bad command')
+        self.assertEqual(server.handle_command('CLOSE 1', 0), 'OK')
+        self.assertEqual(server.handle_command('STATE 1', 0), 'ERR no such session')
+        self.assertEqual(server.get_num_sessions(), 0)
+
+    def test_evict_idle(self):
+        server = GameServer(idle_timeout=10)
+        server.handle_command('NEW', 0)
+        server.handle_command('NEW', 0)
+        server.handle_command('STATE 2', 8)
+        self.assertEqual(server.evict_idle(15), 1)
+        self.assertEqual(server.handle_command('STATE 1', 15), 'ERR no such session')
+        self.assertEqual(server.handle_command('STATE 2', 15), 'OK UNFINISHED')
+
+    def test_percentile(self):
+        self.assertEqual(percentile(list(range(100)), 0.5), 50)
+        self.assertEqual(percentile(list(range(100)), 0.99), 99)
+        self.assertIsNone(percentile([], 0.5))
+
+
+class TestGameServerSockets(unittest.IsolatedAsyncioTestCase):
+
+    async def test_load_over_tcp(self):
+        server = GameServer()
+        port = (await server.start()).sockets[0].getsockname()[1]
+
+        async def connect():
+            return await asyncio.open_connection('127.0.0.1', port)
+
+        report = await run_load(connect, num_sessions=6, concurrency=3)
+        await server.stop()
+        self.assertEqual(report['sessions'], 6)
+        self.assertGreaterEqual(report['moves'], 6 * 17)      # the fleet has 17 squares to hit
+        self.assertLessEqual(report['p50_ms'], report['p99_ms'])
+        self.assertEqual(server.get_num_sessions(), 0)
+
+    async def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'shipgame.sock')
+            server = GameServer()
+            await server.start_unix(path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            self.assertEqual(await send(reader, writer, 'NEW'), 'OK 1')
+            self.assertEqual(await send(reader, writer, 'STATE 1'), 'OK UNFINISHED')
+
+            # a line longer than the limit ends the connection
+            writer.write(b'X' * (MAX_LINE * 2) + b'\n')
+            self.assertEqual(await reader.readline(), b'ERR line too long\n')
+            self.assertEqual(await reader.readline(), b'')
+            writer.close()
+            await server.stop()
@@ -0,0 +1,261 @@
+# Author: Angela Montez
+# Github username: almontez
+# Date: 10/18/2026
+# Description: Round-robin tournament runner for ShipGame strategies. A competitor pairs a placement strategy
+#              [how it lays out its fleet] with a firing strategy [where it aims its torpedoes]. Every
+#              competitor plays every other competitor, once as 'first' and once as 'second' per game pair.
+#              Games are split into chunks and spread over a process pool. Each game seeds its own random
+#              generator from (tournament seed, pairing, game number), so the results are the same no matter
+#              how many workers run them.
+
+import random
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from ShipGame import ShipGame, COORD_INDEX, INDEX_COORD
+
+# fleet used when none is given: carrier, battleship, cruiser, submarine, destroyer
+DEFAULT_FLEET = (5, 4, 3, 3, 2)
+
+# torpedoes each player may fire before the game is called a draw
+MAX_SHOTS = 1000
+
+
+class RandomPlacement:
+    """Placement strategy: puts each ship at a random location and orientation that fits"""
+
+    def place_fleet(self, game, player, fleet, rng):
+        """Places every ship in fleet [a list of ship sizes] on the player's board"""
+        for ship_size in fleet:
+            while not game.place_ship(player, ship_size, rng.choice(INDEX_COORD), rng.choice('RC')):
+                pass
+
+
+class EdgePlacement:
+    """Placement strategy: hugs the edges of the board, falling back to random locations"""
+
+    def place_fleet(self, game, player, fleet, rng):
+        """Places every ship in fleet [a list of ship sizes] on the player's board"""
+        edges = [coord for index, coord in enumerate(INDEX_COORD)
+                 if index < 10 or index >= 90 or index % 10 in (0, 9)]
+        for ship_size in fleet:
+            placed = False
+            for attempt in range(20):
+                if game.place_ship(player, ship_size, rng.choice(edges), rng.choice('RC')):
+                    placed = True
+                    break
+            while not placed:
+                placed = game.place_ship(player, ship_size, rng.choice(INDEX_COORD), rng.choice('RC'))
+
+
+class RandomFiring:
+    """Firing strategy: fires at every square once, in random order"""
+
+    def __init__(self, rng, fleet):
+        """Shuffles the squares to fire at"""
+        self._targets = list(INDEX_COORD)
+        rng.shuffle(self._targets)
+
+    def choose_target(self):
+        """Returns the next square to fire at"""
+        return self._targets.pop()
+
+    def record_result(self, target, result):
+        """Told the result of each torpedo: 'MISS', 'HIT', or 'SUNK'"""
+        pass
+
+
+class HuntTargetFiring:
+    """Firing strategy: fires at random [hunt] until it hits, then fires at the neighbours of its hits
+       [target] until the ship sinks"""
+
+    def __init__(self, rng, fleet):
+        """Shuffles the squares to hunt through"""
+        self._hunt = list(range(100))
+        rng.shuffle(self._hunt)
+        self._fired = set()
+        self._queue = []            # neighbours of hits that have not been fired upon
+
+    def choose_target(self):
+        """Returns the next square to fire at"""
+        while self._queue:
+            index = self._queue.pop()
+            if index not in self._fired:
+                self._fired.add(index)
+                return INDEX_COORD[index]
+        while True:
+            index = self._hunt.pop()
+            if index not in self._fired:
+                self._fired.add(index)
+                return INDEX_COORD[index]
+
+    def record_result(self, target, result):
+        """Told the result of each torpedo: 'MISS', 'HIT', or 'SUNK'"""
+        if result == 'MISS':
+            return
+        if result == 'SUNK':
+            self._queue = []
+            return
+        row, col = divmod(COORD_INDEX[target], 10)
+        for next_row, next_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= next_row < 10 and 0 <= next_col < 10:
+                self._queue.append(next_row * 10 + next_col)
+
+
+class Competitor:
+    """A named pairing of a placement strategy class and a firing strategy class. Classes [not instances]
+       are stored so a competitor can be sent to worker processes; they must be defined at module level"""
+
+    def __init__(self, name, placement_class, firing_class):
+        """Initialize Competitor fields"""
+        self._name = name
+        self._placement_class = placement_class
+        self._firing_class = firing_class
+
+    def get_name(self):
+        """Returns the name of the competitor"""
+        return self._name
+
+    def get_placement_class(self):
+        """Returns the placement strategy class"""
+        return self._placement_class
+
+    def get_firing_class(self):
+        """Returns the firing strategy class. Built once per game with that game's random generator and the
+           fleet being played [see ShipGameAI.ProbabilityTargeting for one outside this module]"""
+        return self._firing_class
+
+
+def play_game(first, second, fleet, rng):
+    """Plays one game between two competitors. Returns (winner, shots) where winner is 'first', 'second',
+       or None for a draw, and shots is the number of torpedoes the winner fired"""
+    game = ShipGame()
+    first.get_placement_class()().place_fleet(game, 'first', fleet, rng)
+    second.get_placement_class()().place_fleet(game, 'second', fleet, rng)
+    firing = {'first': first.get_firing_class()(rng, fleet), 'second': second.get_firing_class()(rng, fleet)}
+    shots = {'first': 0, 'second': 0}
+
+    player = 'first'
+    while game.get_current_state() == 'UNFINISHED':
+        if shots[player] == MAX_SHOTS:
+            return None, 0
+        target = firing[player].choose_target()
+        game.fire_torpedo(player, target)
+        firing[player].record_result(target, game.get_last_shot_result())
+        shots[player] += 1
+        player = 'second' if player == 'first' else 'first'
+
+    if game.get_current_state() == 'FIRST_WON':
+        return 'first', shots['first']
+    return 'second', shots['second']
+
+
+def game_rng(seed, pairing, game_number):
+    """Returns the random generator for one game. Seeding from a string is stable across processes"""
+    return random.Random('%s-%s-%s' % (seed, pairing, game_number))
+
+
+def play_chunk(competitors, fleet, seed, chunk):
+    """Worker: plays one chunk of games. chunk is (pairing, first index, second index, start, stop).
+       Returns (chunk, [(winner index or None, shots), ...]) so results can be put back in order"""
+    pairing, first_idx, second_idx, start, stop = chunk
+    first = competitors[first_idx]
+    second = competitors[second_idx]
+
+    results = []
+    for game_number in range(start, stop):
+        winner, shots = play_game(first, second, fleet, game_rng(seed, pairing, game_number))
+        if winner == 'first':
+            results.append((first_idx, shots))
+        elif winner == 'second':
+            results.append((second_idx, shots))
+        else:
+            results.append((None, 0))
+    return chunk, results
+
+
+class Tournament:
+    """Plays competitors round-robin and reports win rates and mean shots to win"""
+
+    def __init__(self, competitors, games_per_pairing=100, fleet=DEFAULT_FLEET, seed=0):
+        """Initialize Tournament fields. Each ordered pair of competitors plays games_per_pairing games,
+           so every pair meets 2 * games_per_pairing times"""
+        self._competitors = list(competitors)
+        self._games_per_pairing = games_per_pairing
+        self._fleet = tuple(fleet)
+        self._seed = seed
+
+    def make_chunks(self, chunk_size):
+        """Splits the tournament into work units of at most chunk_size games"""
+        chunks = []
+        pairing = 0
+        for first_idx in range(len(self._competitors)):
+            for second_idx in range(len(self._competitors)):
+                if first_idx == second_idx:
+                    continue
+                for start in range(0, self._games_per_pairing, chunk_size):
+                    stop = min(start + chunk_size, self._games_per_pairing)
+                    chunks.append((pairing, first_idx, second_idx, start, stop))
+                pairing += 1
+        return chunks
+
+    def run(self, workers=None, chunk_size=50):
+        """Plays every game and returns a report: {name: {'games', 'wins', 'draws', 'win_rate',
+           'mean_shots_to_win'}}. workers=1 plays in this process; otherwise games run in a process pool
+           [None = one worker per core]"""
+        chunks = self.make_chunks(chunk_size)
+        worker = partial(play_chunk, self._competitors, self._fleet, self._seed)
+
+        if workers == 1:
+            results = [worker(chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(worker, chunks))
+
+        return self.make_report(sorted(results))
+
+    def make_report(self, results):
+        """Totals chunk results into the report returned by run"""
+        totals = [{'games': 0, 'wins': 0, 'draws': 0, 'shots': 0} for competitor in self._competitors]
+
+        for (pairing, first_idx, second_idx, start, stop), games in results:
+            for winner, shots in games:
+                totals[first_idx]['games'] += 1
+                totals[second_idx]['games'] += 1
+                if winner is None:
+                    totals[first_idx]['draws'] += 1
+                    totals[second_idx]['draws'] += 1
+                else:
+                    totals[winner]['wins'] += 1
+                    totals[winner]['shots'] += shots
+
+        report = {}
+        for competitor, total in zip(self._competitors, totals):
+            win_rate = 0.0
+            mean_shots = None
+            if total['games']:
+                win_rate = total['wins'] / total['games']
+            if total['wins']:
+                mean_shots = total['shots'] / total['wins']
+            report[competitor.get_name()] = {'games': total['games'], 'wins': total['wins'],
+                                             'draws': total['draws'], 'win_rate': win_rate,
+                                             'mean_shots_to_win': mean_shots}
+        return report
+
+
+if __name__ == '__main__':
+    import time
+    from ShipGameAI import ProbabilityTargeting
+
+    field = [Competitor('random', RandomPlacement, RandomFiring),
+             Competitor('hunt-target', RandomPlacement, HuntTargetFiring),
+             Competitor('edge hunt-target', EdgePlacement, HuntTargetFiring),
+             Competitor('probability', RandomPlacement, ProbabilityTargeting)]
+
+    start_time = time.perf_counter()
+    standings = Tournament(field, games_per_pairing=500).run()
+    elapsed = time.perf_counter() - start_time
+
+    for name, line in standings.items():
+        print(name, line)
+    print('%.2f seconds' % elapsed)
@@ -0,0 +1,43 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for the ShipGame tournament runner
+
+import random
+import unittest
+from ShipGame import ShipGame
+from ShipGameTournament import (Competitor, Tournament, RandomPlacement, RandomFiring, HuntTargetFiring,
+                                play_game)
+
+
+class TestTournament(unittest.TestCase):
+
+    def setUp(self):
+        self.field = [Competitor('random', RandomPlacement, RandomFiring),
+                      Competitor('hunt-target', RandomPlacement, HuntTargetFiring)]
+
+    def test_random_placement(self):
+        game = ShipGame()
+        RandomPlacement().place_fleet(game, 'second', (5, 4, 3), random.Random(1))
+        self.assertEqual(game.get_num_ships_remaining('second'), 3)
+        self.assertEqual(game.get_num_ships_remaining('first'), 0)
+
+    def test_play_game(self):
+        winner, shots = play_game(self.field[0], self.field[1], (3, 2), random.Random(7))
+        self.assertIn(winner, ('first', 'second'))
+        self.assertTrue(5 <= shots <= 100)
+
+    def test_chunks(self):
+        tournament = Tournament(self.field, games_per_pairing=25)
+        self.assertEqual(tournament.make_chunks(10), [(0, 0, 1, 0, 10), (0, 0, 1, 10, 20), (0, 0, 1, 20, 25),
+                                                      (1, 1, 0, 0, 10), (1, 1, 0, 10, 20), (1, 1, 0, 20, 25)])
+
+    def test_report(self):
+        report = Tournament(self.field, games_per_pairing=20, seed=3).run(workers=1, chunk_size=7)
+        self.assertEqual(report['random']['games'], 40)
+        self.assertEqual(report['random']['wins'] + report['hunt-target']['wins'], 40)
+        self.assertGreater(report['hunt-target']['win_rate'], report['random']['win_rate'])
+
+    def test_same_results_for_any_worker_count(self):
+        tournament = Tournament(self.field, games_per_pairing=12, seed=11)
+        self.assertEqual(tournament.run(workers=1, chunk_size=5), tournament.run(workers=2, chunk_size=3))
@@ -0,0 +1,420 @@
+# Author: Angela Montez
+# GitHub username: almontez
+# Date: 10/18/2026
+# Description: Unit Tests for ShipGame
+
+import random
+import unittest
+from ShipGame import (COORD_INDEX, INDEX_COORD, RAY_MASKS, MapKey, Board, BitBoard, Ship, ShipGame, get_geometry,
+                      row_label, restore_game, random_fleet)
+
+
+class TestLookupTables(unittest.TestCase):
+
+    def test_coordinates(self):
+        self.assertEqual(COORD_INDEX['A1'], 0)
+        self.assertEqual(COORD_INDEX['J10'], 99)
+        self.assertEqual(INDEX_COORD[57], 'F8')
+        self.assertEqual(MapKey().get_map()['G9'], (6, 8))
+        self.assertIs(MapKey().get_map(), MapKey().get_map())
+
+    def test_ray_masks(self):
+        self.assertEqual(RAY_MASKS['R'][3][COORD_INDEX['E3']], 0b111 << 42)
+        self.assertEqual(RAY_MASKS['C'][2][COORD_INDEX['A1']], 1 | 1 << 10)
+        self.assertEqual(RAY_MASKS['R'][3][COORD_INDEX['A9']], None)
+        self.assertEqual(RAY_MASKS['C'][4][COORD_INDEX['G9']], sum(1 << (68 + 10 * row) for row in range(4)))
+
+
+class TestBoardGeometry(unittest.TestCase):
+
+    def test_row_labels(self):
+        self.assertEqual(row_label(0), 'A')
+        self.assertEqual(row_label(25), 'Z')
+        self.assertEqual(row_label(26), 'AA')
+        self.assertEqual(row_label(701), 'ZZ')
+        self.assertEqual(row_label(702), 'AAA')
+
+    def test_coordinates(self):
+        geometry = get_geometry(1000, 1000)
+        self.assertIs(geometry, get_geometry(1000, 1000))
+        self.assertEqual(geometry.get_index('A1'), 0)
+        self.assertEqual(geometry.get_index('ALL1000'), 999999)
+        self.assertEqual(geometry.get_coord(999999), 'ALL1000')
+        self.assertEqual(geometry.get_position('AA3'), (26, 2))
+        for coordinate in ('ALM1', 'A1001', 'A0', 'A01', 'a1', '1A', '', None):
+            self.assertEqual(geometry.get_index(coordinate), None)
+
+        small = get_geometry(3, 4)
+        self.assertEqual(small.get_index('C4'), 11)
+        self.assertEqual(small.get_index('D1'), None)
+
+    def test_geometry_cache_is_bounded(self):
+        for size in range(1, 201):
+            get_geometry(size, 1)
+        self.assertLessEqual(get_geometry.cache_info().currsize, get_geometry.cache_info().maxsize)
+        self.assertIs(get_geometry(200, 1), get_geometry(200, 1))
+
+    def test_large_game(self):
+        game = ShipGame(rows=1000, cols=1000)
+        self.assertEqual(game.get_board_size(), (1000, 1000))
+        self.assertTrue(game.place_ship('first', 1000, 'A1', 'R'))
+        self.assertTrue(game.place_ship('second', 3, 'ALJ1000', 'C'))
+        self.assertFalse(game.place_ship('second', 4, 'ALJ1000', 'C'))
+        self.assertFalse(game.place_ship('second', 1001, 'A1', 'C'))
+
+        for row in ('ALJ', 'ALK'):
+            self.assertTrue(game.fire_torpedo('first', row + '1000'))
+            self.assertTrue(game.fire_torpedo('second', row + '1'))
+        self.assertTrue(game.fire_torpedo('first', 'ALL1000'))
+        self.assertEqual(game.get_current_state(), 'FIRST_WON')
+
+    def test_rectangular_bitboard_game(self):
+        game = ShipGame(bitboard=True, rows=3, cols=12)
+        self.assertTrue(game.place_ship('first', 12, 'A1', 'R'))
+        self.assertFalse(game.place_ship('second', 4, 'A1', 'C'))
+        self.assertTrue(game.place_ship('second', 3, 'A12', 'C'))
+        self.assertFalse(game.fire_torpedo('first', 'D1'))
+
+        for target in ('A12', 'B12'):
+            self.assertTrue(game.fire_torpedo('first', target))
+            self.assertTrue(game.fire_torpedo('second', 'C1'))
+        self.assertTrue(game.fire_torpedo('first', 'C12'))
+        self.assertEqual(game.get_current_state(), 'FIRST_WON')
+
+
+class TestBitBoard(unittest.TestCase):
+
+    def test_validate_fit(self):
+        board = BitBoard()
+        self.assertTrue(board.validate_fit(4, 'G9', 'C'))
+        self.assertFalse(board.validate_fit(5, 'G9', 'C'))
+        self.assertFalse(board.validate_fit(3, 'A9', 'R'))
+
+        board.add_ship_to_board(Ship(4, 'G9', 'C'))
+        self.assertFalse(board.validate_fit(3, 'H7', 'R'))
+        self.assertTrue(board.validate_fit(2, 'H7', 'R'))
+
+    def test_record_attack(self):
+        board = BitBoard()
+        board.add_ship_to_board(Ship(3, 'E3', 'R'))
+
+        self.assertTrue(board.record_attack('E4'))
+        self.assertFalse(board.record_attack('E4'))
+        self.assertFalse(board.record_attack('A1'))
+        self.assertEqual(board.get_square(4, 2), 'X')
+        self.assertEqual(board.get_square(4, 3), 'H')
+        self.assertEqual(board.get_square(0, 0), 'H')
+        self.assertEqual(board.get_square(9, 9), 'O')
+
+    def test_matches_board(self):
+        board = Board()
+        bitboard = BitBoard()
+        for ship in (Ship(5, 'B2', 'C'), Ship(2, 'I8', 'R')):
+            board.add_ship_to_board(ship)
+            bitboard.add_ship_to_board(ship)
+
+        for location in ('A2', 'A1', 'I7', 'J9'):
+            for orientation in ('R', 'C'):
+                self.assertEqual(board.validate_fit(2, location, orientation),
+                                 bitboard.validate_fit(2, location, orientation))
+        for target in ('B2', 'B2', 'I9', 'J10', 'C2'):
+            self.assertEqual(board.record_attack(target), bitboard.record_attack(target))
+
+    def test_ship_over_miss(self):
+        board = Board()
+        bitboard = BitBoard()
+        for each in (board, bitboard):
+            self.assertFalse(each.record_attack('E4'))
+            each.add_ship_to_board(Ship(3, 'E3', 'R'))
+        self.assertEqual(bitboard.get_square(4, 3), 'X')
+        self.assertEqual(bitboard.get_square(4, 3), board.get_square(4, 3))
+        self.assertEqual(bitboard.get_fired_squares(), board.get_fired_squares())
+        self.assertTrue(bitboard.record_attack('E4'))
+
+    def test_ship_over_hit(self):
+        for bitboard in (False, True):
+            game = ShipGame(bitboard)
+            self.assertTrue(game.place_ship('second', 2, 'F9', 'C'))
+            self.assertTrue(game.place_ship('second', 2, 'A1', 'R'))
+            self.assertTrue(game.fire_torpedo('first', 'F9'))
+            self.assertEqual(game.get_last_shot_result(), 'HIT')
+
+            # a new ship may go over the hit piece; the square is then a piece of the new ship
+            self.assertTrue(game.place_ship('second', 2, 'F9', 'R'))
+            self.assertFalse(game.place_ship('second', 2, 'F10', 'C'))
+            self.assertTrue(game.fire_torpedo('second', 'A1'))
+            self.assertTrue(game.fire_torpedo('first', 'F9'))
+            self.assertEqual(game.get_last_shot_result(), 'HIT')
+            self.assertTrue(game.fire_torpedo('second', 'A2'))
+            self.assertTrue(game.fire_torpedo('first', 'F10'))
+            self.assertEqual(game.get_last_shot_result(), 'SUNK')
+            self.assertEqual(game.get_num_ships_remaining('second'), 2)
+
+    def test_late_placements_match_board(self):
+        rng = random.Random(1)
+        for game_number in range(60):
+            games = (ShipGame(), ShipGame(bitboard=True))
+            for step in range(150):
+                player = rng.choice(('first', 'second'))
+                coordinate = INDEX_COORD[rng.randrange(100)]
+                if rng.random() < 0.3:
+                    move = ('place_ship', player, rng.randint(2, 5), coordinate, rng.choice('RC'))
+                else:
+                    move = ('fire_torpedo', player, coordinate)
+                results = [(getattr(game, move[0])(*move[1:]), game.get_last_shot_result(),
+                            game.get_current_state(), game.get_num_ships_remaining('first'),
+                            game.get_num_ships_remaining('second')) for game in games]
+                self.assertEqual(results[0], results[1], (game_number, step, move))
+            for player in ('first', 'second'):
+                self.assertEqual(games[0].view_player_board(player, True), games[1].view_player_board(player, True))
+
+
+class TestShip(unittest.TestCase):
+
+    def test_ship_pieces(self):
+        ship = Ship(3, 'E3', 'R')
+        self.assertEqual(ship.get_ship(), [(4, 2), (4, 3), (4, 4)])
+        self.assertEqual(ship.get_hits_remaining(), 3)
+
+        ship.remove_ship_piece((4, 3))
+        ship.remove_ship_piece((4, 3))
+        self.assertEqual(ship.get_ship(), [(4, 2), (4, 4)])
+        self.assertEqual(ship.get_hits_remaining(), 2)
+
+    def test_ship_ids(self):
+        for board in (Board(), BitBoard()):
+            self.assertEqual(board.add_ship_to_board(Ship(3, 'E3', 'R')), 0)
+            self.assertEqual(board.add_ship_to_board(Ship(2, 'A1', 'C')), 1)
+            self.assertEqual(board.get_ship_id('E5'), 0)
+            self.assertEqual(board.get_ship_id('B1'), 1)
+            self.assertEqual(board.get_ship_id('B2'), None)
+
+
+class TestShipGame(unittest.TestCase):
+
+    def play_game(self, game):
+        self.assertTrue(game.place_ship('first', 5, 'B2', 'C'))
+        self.assertTrue(game.place_ship('first', 2, 'I8', 'R'))
+        self.assertTrue(game.place_ship('second', 3, 'H2', 'C'))
+        self.assertTrue(game.place_ship('second', 2, 'A1', 'C'))
+        self.assertFalse(game.place_ship('first', 8, 'I2', 'R'))
+        self.assertFalse(game.place_ship('second', 2, 'I2', 'R'))
+
+        self.assertFalse(game.fire_torpedo('second', 'B2'))
+        for first_target, second_target in (('A1', 'B2'), ('B1', 'C2'), ('H2', 'J10'), ('I2', 'J9')):
+            self.assertTrue(game.fire_torpedo('first', first_target))
+            self.assertTrue(game.fire_torpedo('second', second_target))
+        self.assertEqual(game.get_num_ships_remaining('second'), 1)
+        self.assertEqual(game.get_current_state(), 'UNFINISHED')
+
+        self.assertTrue(game.fire_torpedo('first', 'J2'))
+        self.assertEqual(game.get_num_ships_remaining('second'), 0)
+        self.assertEqual(game.get_num_ships_remaining('first'), 2)
+        self.assertEqual(game.get_current_state(), 'FIRST_WON')
+        self.assertFalse(game.fire_torpedo('second', 'D2'))
+
+    def test_last_shot_result(self):
+        game = ShipGame()
+        game.place_ship('second', 2, 'A1', 'R')
+        self.assertEqual(game.get_last_shot_result(), None)
+
+        game.fire_torpedo('first', 'B1')
+        self.assertEqual(game.get_last_shot_result(), 'MISS')
+        game.fire_torpedo('second', 'B1')
+        game.fire_torpedo('first', 'A1')
+        self.assertEqual(game.get_last_shot_result(), 'HIT')
+        game.fire_torpedo('second', 'B1')
+        game.fire_torpedo('first', 'A2')
+        self.assertEqual(game.get_last_shot_result(), 'SUNK')
+
+    def test_dict_board_game(self):
+        self.play_game(ShipGame())
+
+    def test_bitboard_game(self):
+        self.play_game(ShipGame(bitboard=True))
+
+
+class TestPlaceFleet(unittest.TestCase):
+
+    def test_all_or_nothing(self):
+        for bitboard in (False, True):
+            game = ShipGame(bitboard)
+            game.place_ship('first', 2, 'J1', 'R')
+            start = game.save_snapshot()
+
+            self.assertFalse(game.place_fleet('first', [(3, 'A1', 'R'), (2, 'A3', 'C')]))   # overlap in fleet
+            self.assertFalse(game.place_fleet('first', [(3, 'A1', 'R'), (2, 'I2', 'C')]))   # overlap on board
+            self.assertFalse(game.place_fleet('first', [(3, 'A1', 'R'), (2, 'K1', 'C')]))   # off the board
+            self.assertFalse(game.place_fleet('first', [(3, 'A9', 'R')]))
+            self.assertFalse(game.place_fleet('first', [(3, 'A1', 'R'), (1, 'C1', 'C')]))
+            self.assertEqual(game.save_snapshot(), start)
+
+            self.assertTrue(game.place_fleet('first', [(3, 'A1', 'R'), (2, 'A4', 'C'), (4, 'C1', 'c')]))
+            self.assertEqual(game.get_num_ships_remaining('first'), 4)
+            self.assertTrue(game.place_fleet('second', []))
+
+    def test_matches_place_ship(self):
+        rng = random.Random(13)
+        labels = list(INDEX_COORD) + ['K1']
+        for trial in range(300):
+            bitboard = trial % 2 == 1
+            bulk = ShipGame(bitboard)
+            single = ShipGame(bitboard)
+            specs = [(rng.randint(1, 5), rng.choice(labels), rng.choice('RCrcX'))
+                     for ship in range(rng.randint(1, 4))]
+
+            expected = True
+            for spec in specs:
+                expected = single.place_ship('second', *spec) and expected
+            self.assertEqual(bulk.place_fleet('second', specs), expected)
+            if expected:
+                self.assertEqual(bulk.save_snapshot(), single.save_snapshot())
+            else:
+                self.assertEqual(bulk.get_num_ships_remaining('second'), 0)
+
+    def test_random_fleet(self):
+        rng = random.Random(7)
+        for trial in range(50):
+            game = ShipGame()
+            fleet = random_fleet((5, 4, 3, 3, 2), rng)
+            self.assertEqual([ship[0] for ship in fleet], [5, 4, 3, 3, 2])
+            self.assertTrue(game.place_fleet('first', fleet))
+
+        with self.assertRaises(ValueError):
+            random_fleet([11], rng)
+        with self.assertRaises(ValueError):
+            random_fleet([2, 2, 2], rng, get_geometry(2, 2), max_attempts=100)
+
+    def test_random_fleet_is_uniform(self):
+        # every legal way to put two ships of length 2 on a 2x3 board [ships told apart by their place in the list]
+        geometry = get_geometry(2, 3)
+        placements = [geometry.get_ship_squares(head, 2, orientation) for orientation in 'RC' for head in range(6)]
+        placements = [squares for squares in placements if squares is not None]
+        legal = [(first, second) for first in placements for second in placements if set(first).isdisjoint(second)]
+        self.assertEqual(len(legal), 22)
+
+        rng = random.Random(1)
+        counts = {}
+        for draw in range(6600):
+            fleet = tuple(random_fleet([2, 2], rng, get_geometry(2, 3)))
+            counts[fleet] = counts.get(fleet, 0) + 1
+        self.assertEqual(len(counts), 22)
+        self.assertLess(max(counts.values()) - min(counts.values()), 150)     # 300 expected of each
+
+
+class TestRendering(unittest.TestCase):
+
+    def make_game(self, **kwargs):
+        game = ShipGame(**kwargs)
+        game.place_ship('first', 3, 'B2', 'R')
+        game.fire_torpedo('first', 'A1')
+        game.fire_torpedo('second', 'B3')
+        game.fire_torpedo('first', 'A1')
+        game.fire_torpedo('second', 'C3')
+        return game
+
+    def test_view_as_text(self):
+        for game in (self.make_game(), self.make_game(bitboard=True)):
+            lines = game.view_player_board('first', as_text=True).split('\n')
+            self.assertEqual(lines[0], 'Player 1 Board: Grid View')
+            self.assertEqual(lines[1], '       ' + ''.join(str(col) + '      ' for col in range(1, 11)))
+            self.assertEqual(lines[5].split(), ['B', 'O', 'X', 'H', 'X', 'O', 'O', 'O', 'O', 'O', 'O'])
+            self.assertEqual(lines[7].split(), ['C', 'O', 'O', 'H', 'O', 'O', 'O', 'O', 'O', 'O', 'O'])
+            self.assertEqual(len(lines), 24)
+
+    def test_fog_of_war(self):
+        for game in (self.make_game(), self.make_game(bitboard=True)):
+            lines = game.view_player_board('first', as_text=True, fog_of_war=True).split('\n')
+            self.assertEqual(lines[5].split(), ['B', 'O', 'O', 'H', 'O', 'O', 'O', 'O', 'O', 'O', 'O'])
+            self.assertEqual(lines[7].split(), ['C', 'O', 'O', 'M', 'O', 'O', 'O', 'O', 'O', 'O', 'O'])
+
+    def test_ansi(self):
+        text = self.make_game().view_player_board('first', as_text=True, ansi=True)
+        self.assertIn('\033[31;1mH\033[0m', text)
+        self.assertIn('\033[33mH\033[0m', text)
+
+    def test_single_write(self):
+        class Recorder:
+            def __init__(self):
+                self.writes = []
+
+            def write(self, text):
+                self.writes.append(text)
+
+        board = Board()
+        board.add_ship_to_board(Ship(2, 'J9', 'R'))
+        recorder = Recorder()
+        board.write_game_board(recorder)
+        self.assertEqual(recorder.writes, [board.render_game_board()])
+        self.assertIn('J      O      O      O      O      O      O      O      O      X      X      ', recorder.writes[0])
+
+
+class TestUndo(unittest.TestCase):
+
+    def test_undo_torpedo(self):
+        for game in (ShipGame(), ShipGame(bitboard=True)):
+            self.assertFalse(game.undo_torpedo())
+            game.place_ship('first', 2, 'J9', 'R')
+            game.place_ship('second', 2, 'A1', 'R')
+            start = game.save_snapshot()
+
+            for first_target, second_target in (('A1', 'B1'), ('B1', 'J9')):
+                game.fire_torpedo('first', first_target)
+                game.fire_torpedo('second', second_target)
+            middle = game.save_snapshot()
+
+            game.fire_torpedo('first', 'A2')
+            self.assertEqual(game.get_current_state(), 'FIRST_WON')
+            self.assertEqual(game.get_num_moves(), 5)
+
+            # take back the winning torpedo
+            self.assertTrue(game.undo_torpedo())
+            self.assertEqual(game.get_current_state(), 'UNFINISHED')
+            self.assertEqual(game.get_num_ships_remaining('second'), 1)
+            self.assertEqual(game.save_snapshot(), middle)
+
+            # and try a different one
+            game.fire_torpedo('first', 'C1')
+            self.assertEqual(game.get_last_shot_result(), 'MISS')
+            while game.undo_torpedo():
+                pass
+            self.assertEqual(game.save_snapshot(), start)
+            self.assertTrue(game.fire_torpedo('first', 'A1'))
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def make_game(self, **kwargs):
+        game = ShipGame(**kwargs)
+        game.place_ship('first', 5, 'B2', 'C')
+        game.place_ship('first', 2, 'I8', 'R')
+        game.place_ship('second', 3, 'H2', 'C')
+        game.place_ship('second', 2, 'A1', 'c')
+        for first_target, second_target in (('A1', 'B2'), ('B1', 'A10'), ('H2', 'I8')):
+            game.fire_torpedo('first', first_target)
+            game.fire_torpedo('second', second_target)
+        return game
+
+    def test_round_trip(self):
+        for kwargs in ({}, {'bitboard': True}, {'rows': 1000, 'cols': 30}):
+            game = self.make_game(**kwargs)
+            restored = restore_game(game.save_snapshot())
+
+            self.assertEqual(restored.save_snapshot(), game.save_snapshot())
+            self.assertEqual(restored.get_board_size(), game.get_board_size())
+            self.assertEqual(restored.get_num_ships_remaining('first'), 2)
+            self.assertEqual(restored.get_num_ships_remaining('second'), 1)
+            self.assertEqual(restored.get_last_shot_result(), 'HIT')
+
+            # both games carry on the same way
+            self.assertFalse(restored.fire_torpedo('second', 'I9'))
+            for target in ('I2', 'J2'):
+                self.assertTrue(restored.fire_torpedo('first', target))
+                self.assertTrue(game.fire_torpedo('first', target))
+                restored.fire_torpedo('second', 'I9')
+                game.fire_torpedo('second', 'I9')
+            self.assertEqual(restored.get_current_state(), 'FIRST_WON')
+            self.assertEqual(game.get_current_state(), 'FIRST_WON')
+
+    def test_snapshot_size(self):
+        self.assertEqual(len(self.make_game().save_snapshot()), 7 + 2 * (4 + 2 * 7 + 13))